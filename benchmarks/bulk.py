@@ -0,0 +1,64 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Benchmark of ec2.subnet.bulk() against a loop of ec2.subnet() calls,
+for construction alone and for construction plus Template.add().
+
+Usage: python benchmarks/bulk.py [sizes...]
+
+"""
+
+import sys, time
+
+from stratiform import *
+import stratiform.ec2 as ec2
+
+VPC   = ec2.vpc("Vpc", cidr("10.0.0.0/8"))
+ZONES = [az('us-east-1a'), az('us-east-1b'), az('us-east-1c')]
+TAGS  = tags(Environment='bench')
+
+def columns(n):
+    names = ["Subnet%d"%i for i in xrange(n)]
+    zones = [ZONES[i % len(ZONES)] for i in xrange(n)]
+    cidrs = [cidr("10.%d.%d.0/24"%(i // 256 % 256, i % 256)) for i in xrange(n)]
+    return names, zones, cidrs
+
+def loop(names, zones, cidrs):
+    return [ec2.subnet(name, VPC, zone, block, TAGS)
+            for name, zone, block in zip(names, zones, cidrs)]
+
+def bulk(names, zones, cidrs):
+    return ec2.subnet.bulk(names, vpc_id=VPC, availability_zone=column(zones),
+                           cidr_block=column(cidrs), tags=TAGS)
+
+def measure(f, n, add):
+    args = columns(n)
+    start = time.time()
+    subnets = f(*args)
+    if add and f is loop:
+        template("Bench").add(*subnets)
+    elif add:
+        template("Bench").add(subnets)
+    return time.time() - start
+
+def main(sizes=(1000, 10000)):
+    print "%-8s %-10s %8s %10s %12s"%("method", "phase", "items", "seconds", "us per item")
+    for add, phase in [(False, 'construct'), (True, '+ add')]:
+        for n in sizes:
+            for name, f in [('loop', loop), ('bulk', bulk)]:
+                elapsed = measure(f, n, add)
+                print "%-8s %-10s %8d %10.3f %12.2f"%(name, phase, n, elapsed, elapsed / n * 1e6)
+
+if __name__ == "__main__":
+    main(*([[int(a) for a in sys.argv[1:]]] if sys.argv[1:] else []))
@@ -0,0 +1,57 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Benchmark of long fluent builder chains on ec2.NetworkAcl and
+ec2.SecurityGroup. With structurally shared siblings the cost per
+chained rule should stay flat as the chain grows.
+
+Usage: python benchmarks/chaining.py [sizes...]
+
+"""
+
+import sys, time
+
+from stratiform import *
+import stratiform.ec2 as ec2
+
+VPC = ec2.vpc("Vpc", cidr("10.0.0.0/16"))
+
+def acl_chain(n):
+    acl = ec2.network_acl("Acl", VPC)
+    for i in xrange(n):
+        acl = acl.allow_ingress("Rule%d"%i, i + 1, tcp, cidr_all, port(1024 + i % 60000))
+    return acl
+
+def security_group_chain(n):
+    sg = ec2.security_group("Group", VPC, "A security group")
+    for i in xrange(n):
+        sg = sg.ingress("Rule%d"%i, tcp, cidr_all, port(1024 + i % 60000))
+    return sg
+
+def measure(f, n):
+    start = time.time()
+    result = f(n)
+    elapsed = time.time() - start
+    assert len(result.siblings()) == n
+    return elapsed
+
+def main(sizes=(1000, 5000, 10000)):
+    print "%-16s %8s %10s %14s"%("chain", "rules", "seconds", "us per rule")
+    for name, f in [('NetworkAcl', acl_chain), ('SecurityGroup', security_group_chain)]:
+        for n in sizes:
+            elapsed = measure(f, n)
+            print "%-16s %8d %10.3f %14.2f"%(name, n, elapsed, elapsed / n * 1e6)
+
+if __name__ == "__main__":
+    main(*([[int(a) for a in sys.argv[1:]]] if sys.argv[1:] else []))
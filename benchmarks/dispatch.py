@@ -0,0 +1,108 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Micro-benchmark comparing the table-driven typed_dispatch against
+the original linear-scan, wrapt-based decorator.
+
+Usage: python benchmarks/dispatch.py [number]
+
+"""
+
+import sys, timeit
+
+import wrapt
+
+from stratiform import *
+from stratiform.base import AWSObject
+from stratiform.utils import class_name
+import stratiform.asg as asg
+import stratiform.ec2 as ec2
+
+@wrapt.decorator
+def linear_typed_dispatch(func, self, args, kwargs):
+    """The original typed_dispatch, kept as the baseline.
+    """
+    types = self.arg_types()
+    names = self.arg_names()
+    if len(types) != len(names):
+        msg = "%s must declare same number of types (%d given) and names (%d given) for dispatch"
+        raise TypeError(msg%(class_name(self), len(types), len(names)))
+    if len(args) > len(types):
+        msg = "%s.%s() takes at most %d arguments(s) (%d given)"
+        raise TypeError(msg%(class_name(func.im_self), func.__name__, len(types), len(args)))
+    for v in args:
+        found_key = None
+        for k, t in zip(names, types):
+            if isinstance(v, t):
+                if found_key != None:
+                    msg = "%s() got ambigious argument. Matches both '%s' and '%s'"
+                    raise TypeError(msg%(func.__name__, found_key, k))
+                if k in kwargs:
+                    msg = "%s() got multiple values for keyword argument '%s'"
+                    raise TypeError(msg%(func.__name__, k))
+                found_key = k
+                kwargs[k] = v
+        if found_key == None:
+            msg = "%s.%s() got argument of unexpected type '%s'"
+            raise TypeError(msg%(class_name(func.im_self), func.__name__, class_name(v)))
+    return func(**kwargs)
+
+VPC    = ec2.vpc("Vpc", cidr("10.0.0.0/16"))
+TAGS   = tags(Name="bench")
+CONFIG = asg.launch_configuration("Config", ec2.image_id("ami-12345678"))
+
+def security_group():
+    ec2.SecurityGroup("Group", VPC, "A security group", TAGS)
+
+def auto_scaling_group():
+    asg.AutoScalingGroup("Group", CONFIG, asg.elb_health_check,
+                         asg.MetricsCollection(granularity="1Minute"),
+                         deletion_policy.RETAIN)
+
+def measure(number):
+    results = {}
+    for name, f in [('ec2.SecurityGroup', security_group),
+                    ('asg.AutoScalingGroup', auto_scaling_group)]:
+        results[name] = min(timeit.repeat(f, number=number, repeat=3))
+    return results
+
+def swap_dispatch(decorator):
+    """Re-decorates the dispatching methods of AWSObject, returning the
+    previous methods.
+
+    """
+    old = {}
+    for name in ['__init__', '__call__']:
+        method = AWSObject.__dict__[name]
+        old[name] = method
+        setattr(AWSObject, name, decorator(method.__wrapped__))
+    return old
+
+def main(number=10000):
+    table = measure(number)
+    old = swap_dispatch(linear_typed_dispatch)
+    try:
+        linear = measure(number)
+    finally:
+        for name, method in old.items():
+            setattr(AWSObject, name, method)
+
+    print "%-22s %12s %12s %8s"%("constructor", "linear (us)", "table (us)", "speedup")
+    for name in sorted(table):
+        l = linear[name] / number * 1e6
+        t = table[name] / number * 1e6
+        print "%-22s %12.2f %12.2f %7.2fx"%(name, l, t, l / t)
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]])
@@ -0,0 +1,80 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Benchmark of the import time of the stratiform package and of each
+service module, each measured in a fresh interpreter.
+
+Wall-clock time is reported for every interpreter. Interpreters that
+support 'python -X importtime' (3.7+) also report its cumulative time
+for the measured module.
+
+Usage: python benchmarks/imports.py [repeat]
+
+"""
+
+import os, subprocess, sys
+
+MODULES = ['stratiform', 'stratiform.asg', 'stratiform.cloudformation',
+           'stratiform.ec2', 'stratiform.elb', 'stratiform.iam',
+           'stratiform.rds', 'stratiform.route53']
+
+STATEMENTS = [('import stratiform', 'stratiform'),
+              ('from stratiform import *', 'stratiform')] + \
+             [('import %s'%m, m) for m in MODULES[1:]]
+
+TIMER = "import time; s = time.time(); %s; print(time.time() - s)"
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def environment():
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([p for p in [ROOT, env.get('PYTHONPATH')] if p])
+    return env
+
+def has_importtime():
+    return sys.version_info >= (3, 7)
+
+def wall_time(statement):
+    out = subprocess.check_output([sys.executable, '-c', TIMER%statement], env=environment())
+    return float(out.strip())
+
+def import_time(statement, module):
+    """Returns the cumulative microseconds reported by -X importtime
+    for module.
+
+    """
+    p = subprocess.Popen([sys.executable, '-X', 'importtime', '-c', statement],
+                         env=environment(), stderr=subprocess.PIPE)
+    _, err = p.communicate()
+    for line in err.decode().splitlines():
+        fields = [f.strip() for f in line.split('|')]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1])
+    return None
+
+def main(repeat=20):
+    # Warm the bytecode caches
+    for statement, _ in STATEMENTS:
+        wall_time(statement)
+    print("%-40s %12s %12s"%("statement", "median ms", "importtime ms"))
+    for statement, module in STATEMENTS:
+        times = sorted(wall_time(statement) for _ in range(repeat))
+        cumulative = '-'
+        if has_importtime():
+            us = sorted(import_time(statement, module) for _ in range(repeat))
+            cumulative = "%.2f"%(us[len(us) // 2] / 1000.0)
+        print("%-40s %12.2f %12s"%(statement, times[len(times) // 2] * 1000, cumulative))
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,89 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Benchmark of Template.dump_incremental() against Template.to_json()
+for a template shaped like the vpc and sg examples (tagged subnets,
+network ACL entries, and security group rules), re-rendered after
+changing one resource and after changing 1% of them.
+
+Usage: python benchmarks/incremental.py [resources] [repeat]
+
+"""
+
+import itertools, os, shutil, sys, tempfile, time
+
+from stratiform import *
+import stratiform.ec2 as ec2
+
+ZONES = [az('us-west-2a'), az('us-west-2b'), az('us-west-2c')]
+
+def build(n):
+    t = template("Synthetic incremental render benchmark")
+    vpc = ec2.vpc("Vpc", cidr("10.0.0.0/8"), tags(Name='vpc', Network='public'))
+    acl = ec2.network_acl("Acl", vpc)
+    sg  = ec2.security_group("Group", vpc, "A security group")
+    t.add(vpc, acl, sg)
+    for i in xrange(n - 3):
+        block = cidr("10.%d.%d.0/24"%(i // 256 % 256, i % 256))
+        kind = i % 3
+        if kind == 0:
+            t.add(ec2.subnet("Subnet%d"%i, vpc, ZONES[i % 3], block,
+                             tags(Name='subnet-%d'%i, Network='private')))
+        elif kind == 1:
+            t.add(ec2.network_acl_entry("Entry%d"%i, acl, i, ec2.allow, protocol(6),
+                                        block, port(1024 + i % 64), egress=False))
+        else:
+            t.add(ec2.security_group_ingress("Ingress%d"%i, protocol(6), block,
+                                             port(1024 + i % 64), group_id=sg))
+    return t
+
+def change(t, count, round):
+    """Moves count subnets to a block different from the last round.
+    """
+    names = [name for name in t.resources if name.startswith('Subnet')][:count]
+    for i, name in enumerate(names):
+        block = cidr("172.%d.%d.0/24"%(16 + round % 16, i % 256))
+        t.resources[name] = t.resources[name](cidr_block=block)
+
+def timed(f, repeat):
+    times = []
+    for _ in xrange(repeat):
+        start = time.time()
+        f()
+        times.append(time.time() - start)
+    return sorted(times)[len(times) // 2]
+
+def main(n=5000, repeat=5):
+    tmp = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmp, 'template.json')
+        t = build(n)
+        print "%-28s %10s"%("render (%d resources)"%len(t.resources), "median ms")
+        print "%-28s %10.1f"%("to_json", timed(t.to_json, repeat) * 1000)
+        print "%-28s %10.1f"%("dump_incremental, no index", timed(
+            lambda: (os.path.exists(path + '.index') and os.remove(path + '.index'),
+                     t.dump_incremental(path)), repeat) * 1000)
+        rounds = itertools.count()
+        for count in [0, 1, max(1, n // 100)]:
+            def rerender():
+                change(t, count, next(rounds))
+                t.dump_incremental(path)
+            label = "dump_incremental, %d changed"%count
+            print "%-28s %10.1f"%(label, timed(rerender, repeat) * 1000)
+        assert open(path).read() == t.to_json()
+    finally:
+        shutil.rmtree(tmp)
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
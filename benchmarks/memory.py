@@ -0,0 +1,87 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Reports the memory used to build a synthetic template of many
+wrapper-heavy resources (subnets, network ACL entries, and security
+group ingress rules), measured in a forked child process.
+
+Usage: python benchmarks/memory.py [resources]
+
+"""
+
+import gc, os, resource, sys, traceback
+
+from stratiform import *
+import stratiform.ec2 as ec2
+
+ZONES = ['us-west-2a', 'us-west-2b', 'us-west-2c']
+
+def rss_kb():
+    """Returns the resident set size of this process in KiB.
+    """
+    try:
+        with open('/proc/self/status') as fp:
+            for line in fp:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except IOError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def build(n):
+    t = template("Synthetic memory benchmark")
+    vpc = ec2.vpc("Vpc", cidr("10.0.0.0/8"))
+    acl = ec2.network_acl("Acl", vpc)
+    sg  = ec2.security_group("Group", vpc, "A security group")
+    t.add(vpc, acl, sg)
+    for i in xrange(n):
+        block = cidr("10.%d.%d.0/24"%(i // 256 % 256, i % 256))
+        kind = i % 3
+        if kind == 0:
+            t.add(ec2.subnet("Subnet%d"%i, vpc, az(ZONES[i % 3]), block))
+        elif kind == 1:
+            t.add(ec2.network_acl_entry("Entry%d"%i, acl, i, ec2.allow, protocol(6),
+                                        block, port(1024 + i % 64), egress=False))
+        else:
+            t.add(ec2.security_group_ingress("Ingress%d"%i, protocol(6), block,
+                                             port(1024 + i % 64), group_id=sg))
+    return t
+
+def measure(n):
+    gc.collect()
+    before = rss_kb()
+    t = build(n)
+    gc.collect()
+    after = rss_kb()
+    return len(t.resources), after - before
+
+def main(n=50000):
+    r, w = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.close(r)
+            os.write(w, "%d %d"%measure(n))
+        except Exception:
+            traceback.print_exc()
+        finally:
+            os._exit(0)
+    os.close(w)
+    resources, kb = [int(x) for x in os.read(r, 64).split()]
+    os.waitpid(pid, 0)
+    print "%d resources: %.1f MiB (%.0f bytes per resource)"%(
+        resources, kb / 1024.0, kb * 1024.0 / resources)
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]])
@@ -0,0 +1,298 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Benchmark suite of the phases of building and rendering a template,
+for synthetic templates of resources from the ec2, asg, elb, iam, rds
+and route53 modules, drawn with a fixed seed.
+
+    construct   constructing the resources
+    chain       chaining NetworkAcl, SecurityGroup and RouteTable rules
+    add         adding the resources and chains to a Template
+    to_json     rendering the Template
+
+Each run of a phase is made in a forked child process, after the
+phases before it, so it starts cold, with empty caches, and its peak
+memory is its own. The time is from timeit.default_timer with the
+garbage collector disabled, as in timeit. The peak is the growth of
+the high water mark of the resident set size, which is reset before
+the phase on Linux.
+
+The results are written as JSON, and the results of an earlier run,
+e.g., of another commit, can be compared against:
+
+    python benchmarks/suite.py -o after.json --compare before.json
+
+Usage: python benchmarks/suite.py [-o results.json] [--compare results.json]
+                                  [--sizes 100,1000,10000,50000] [--repeat 3]
+
+"""
+
+import argparse, gc, json, os, platform, random, resource, subprocess, sys, timeit, traceback
+
+from stratiform import *
+import stratiform
+import stratiform.functions as fn
+import stratiform.asg as asg
+import stratiform.ec2 as ec2
+import stratiform.elb as elb
+import stratiform.iam as iam
+import stratiform.rds as rds
+import stratiform.route53 as route53
+
+SEED   = 20150601
+SIZES  = [100, 1000, 10000, 50000]
+PHASES = ['construct', 'chain', 'add', 'to_json']
+ZONES  = [az('us-west-2a'), az('us-west-2b'), az('us-west-2c')]
+TAGS   = tags(Environment='bench')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+POLICY = {'Version'   : '2012-10-17',
+          'Statement' : [{'Effect'    : 'Allow',
+                          'Principal' : {'Service' : ['ec2.amazonaws.com']},
+                          'Action'    : ['sts:AssumeRole']}]}
+
+class Context(object):
+    """The shared resources referenced by the synthetic resources.
+    """
+    def __init__(self):
+        self.vpc     = ec2.vpc("Vpc", cidr("10.0.0.0/8"), TAGS)
+        self.acl     = ec2.network_acl("Acl", self.vpc)
+        self.sg      = ec2.security_group("Group", self.vpc, "A security group")
+        self.subnet  = ec2.subnet("SharedSubnet", self.vpc, ZONES[0], cidr("10.255.0.0/24"))
+        self.role    = iam.role("Role", assume_role_policy_document=POLICY, path="/")
+        self.launch  = asg.launch_configuration("Launch", image_id="ami-12345678",
+                                                instance_type="t2.micro")
+
+    def resources(self):
+        return [self.vpc, self.acl, self.sg, self.subnet, self.role, self.launch]
+
+def block(i):
+    return cidr("10.%d.%d.0/24"%(i // 256 % 256, i % 256))
+
+def subnet(ctx, i, rng):
+    return ec2.subnet("Subnet%d"%i, ctx.vpc, rng.choice(ZONES), block(i), TAGS)
+
+def network_acl_entry(ctx, i, rng):
+    return ec2.network_acl_entry("Entry%d"%i, ctx.acl, i + 1, rng.choice([ec2.allow, ec2.deny]),
+                                 protocol(6), block(i), port(rng.randint(1, 65535)), egress=False)
+
+def security_group_ingress(ctx, i, rng):
+    return ec2.security_group_ingress("Ingress%d"%i, protocol(6), block(i),
+                                      port(rng.randint(1, 65535)), group_id=ctx.sg)
+
+def auto_scaling_group(ctx, i, rng):
+    size = rng.randint(1, 10)
+    return asg.auto_scaling_group("Asg%d"%i, ctx.launch, vpc_zone_identifier=[ref(ctx.subnet)],
+                                  min_size=size, max_size=size, desired_capacity=size)
+
+def load_balancer(ctx, i, rng):
+    listener = elb.Listener(instance_port="80", load_balancer_port="80", protocol="HTTP")
+    return elb.LoadBalancer("Elb%d"%i, listeners=[listener], subnets=[ref(ctx.subnet)],
+                            security_groups=[ref(ctx.sg)])
+
+def policy(ctx, i, rng):
+    return iam.policy("Policy%d"%i, policy_name="policy-%d"%i, policy_document=POLICY,
+                      roles=[ref(ctx.role)])
+
+def db_instance(ctx, i, rng):
+    return rds.db_instance("Db%d"%i, allocated_storage=str(rng.choice([20, 100, 500])),
+                           db_instance_class="db.t2.micro", engine="postgres",
+                           master_username="admin", master_user_password="password")
+
+def record_set(ctx, i, rng):
+    return route53.record_set("Record%d"%i, hosted_zone_name="example.com.",
+                              name="host-%d.example.com."%i, type='A', ttl=60,
+                              resource_records=[fn.get_att(ctx.subnet, 'PrivateIp')])
+
+# The factories of the synthetic resources, with their relative weights
+FACTORIES = [(subnet, 4), (network_acl_entry, 4), (security_group_ingress, 4),
+             (auto_scaling_group, 1), (load_balancer, 1), (policy, 1),
+             (db_instance, 1), (record_set, 2)]
+
+def construct(ctx, n):
+    rng = random.Random(SEED)
+    factories = [f for f, weight in FACTORIES for _ in xrange(weight)]
+    return [rng.choice(factories)(ctx, i, rng) for i in xrange(n)]
+
+def chain(ctx, n):
+    """Returns a NetworkAcl, SecurityGroup and RouteTable with n rules
+    among them.
+
+    """
+    rng = random.Random(SEED)
+    igw = ec2.internet_gateway("Gateway")
+    acl = ec2.network_acl("ChainAcl", ctx.vpc)
+    sg  = ec2.security_group("ChainGroup", ctx.vpc, "A chained security group")
+    rt  = ec2.route_table("ChainRouteTable", ctx.vpc)
+    for i in xrange(n):
+        kind = i % 3
+        if kind == 0:
+            acl = acl.allow_ingress("AclRule%d"%i, i + 1, tcp, block(i), port(rng.randint(1, 65535)))
+        elif kind == 1:
+            sg = sg.ingress("GroupRule%d"%i, tcp, block(i), port(rng.randint(1, 65535)))
+        else:
+            rt = rt.route("Route%d"%i, block(i), igw)
+    return [igw, acl, sg, rt]
+
+def add(ctx, resources, chains):
+    t = template("Synthetic benchmark")
+    t.add(*ctx.resources())
+    t.add(*resources)
+    t.add(*chains)
+    return t
+
+def run(phase, n):
+    """Runs the phases before phase, and returns the seconds taken by
+    phase and the growth of the peak resident set size in KiB.
+
+    """
+    ctx = Context()
+    steps = {'construct' : lambda state: construct(ctx, n),
+             'chain'     : lambda state: chain(ctx, n),
+             'add'       : lambda state: add(ctx, state['construct'], state['chain']),
+             'to_json'   : lambda state: state['add'].to_json()}
+    state = {}
+    for name in PHASES[:PHASES.index(phase)]:
+        state[name] = steps[name](state)
+    gc.collect()
+    before = reset_peak()
+    gc.disable()
+    try:
+        start = timeit.default_timer()
+        state[phase] = steps[phase](state)
+        elapsed = timeit.default_timer() - start
+    finally:
+        gc.enable()
+    return elapsed, peak_kb() - before
+
+def status_kb(field):
+    try:
+        with open('/proc/self/status') as fp:
+            for line in fp:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1])
+    except IOError:
+        pass
+    return None
+
+def reset_peak():
+    """Resets the peak resident set size, if supported, and returns the
+    current one in KiB.
+
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as fp:
+            fp.write('5')
+    except IOError:
+        pass
+    rss = status_kb('VmRSS')
+    return rss if rss is not None else peak_kb()
+
+def peak_kb():
+    peak = status_kb('VmHWM')
+    if peak is None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == 'darwin':
+            peak //= 1024
+    return peak
+
+def forked(phase, n):
+    r, w = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.close(r)
+            os.write(w, json.dumps(run(phase, n)))
+        except Exception:
+            traceback.print_exc()
+        finally:
+            os._exit(0)
+    os.close(w)
+    chunks = []
+    while True:
+        chunk = os.read(r, 4096)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    os.close(r)
+    os.waitpid(pid, 0)
+    if not chunks:
+        raise RuntimeError("%s with %d resources failed"%(phase, n))
+    return json.loads(''.join(chunks))
+
+def commit():
+    try:
+        with open(os.devnull, 'w') as null:
+            return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=ROOT, stderr=null).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def benchmark(sizes, repeat):
+    results = []
+    for n in sizes:
+        for phase in PHASES:
+            runs = [forked(phase, n) for _ in xrange(repeat)]
+            seconds = sorted(s for s, _ in runs)
+            results.append({'phase'   : phase,
+                            'size'    : n,
+                            'seconds' : seconds,
+                            'best'    : seconds[0],
+                            'median'  : seconds[len(seconds) // 2],
+                            'peak_kb' : max(kb for _, kb in runs)})
+            print_result(results[-1])
+    return {'version'  : stratiform.__version__,
+            'commit'   : commit(),
+            'python'   : platform.python_version(),
+            'platform' : platform.platform(),
+            'seed'     : SEED,
+            'repeat'   : repeat,
+            'results'  : results}
+
+def print_result(result, baseline=None):
+    line = "%-10s %8d %12.2f %12.2f %12d"%(result['phase'], result['size'], result['best'] * 1000,
+                                          result['median'] * 1000, result['peak_kb'])
+    if baseline is not None:
+        line += " %9.2fx %9.2fx"%(result['median'] / baseline['median'],
+                                  float(result['peak_kb']) / max(baseline['peak_kb'], 1))
+    print line
+
+def compare(data, path):
+    with open(path) as fp:
+        baseline = dict(((r['phase'], r['size']), r) for r in json.load(fp)['results'])
+    print
+    print "against %s"%path
+    print "%-10s %8s %12s %12s %12s %10s %10s"%("phase", "size", "best ms", "median ms", "peak KiB",
+                                                "time", "peak")
+    for result in data['results']:
+        print_result(result, baseline.get((result['phase'], result['size'])))
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Runs the benchmark suite.")
+    parser.add_argument('-o', '--output', help="write the results as JSON to this file")
+    parser.add_argument('--compare', help="compare against the results in this file")
+    parser.add_argument('--sizes', default=','.join(str(n) for n in SIZES),
+                        help="comma-separated numbers of resources")
+    parser.add_argument('--repeat', type=int, default=3, help="runs of each phase")
+    args = parser.parse_args(args)
+    print "%-10s %8s %12s %12s %12s"%("phase", "size", "best ms", "median ms", "peak KiB")
+    data = benchmark([int(n) for n in args.sizes.split(',')], args.repeat)
+    if args.output:
+        with open(args.output, 'w') as fp:
+            json.dump(data, fp, indent=2, sort_keys=True)
+    if args.compare:
+        compare(data, args.compare)
+
+if __name__ == "__main__":
+    main()
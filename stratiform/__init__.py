@@ -16,12 +16,47 @@
 __version_info__ = ('0', '1', '0-SNAPSHOT')
 __version__ = '.'.join(__version_info__)
 
-from stratiform.base import ref
-from stratiform.common import *
-
-from stratiform.templates import *
-from stratiform.parameters import *
-from stratiform.conditions import *
-from stratiform.mappings import *
-from stratiform.resources import *
-from stratiform.outputs import *
+import importlib, sys, types
+
+from stratiform._tables import EXPORTS
+
+# Submodules loaded on first attribute access. The core modules are
+# also exported by 'from stratiform import *'.
+_core_modules    = ['base', 'common', 'conditions', 'dispatchers', 'functions',
+                    'graph', 'mappings', 'outputs', 'parameters', 'resources',
+                    'templates', 'utils']
+_service_modules = ['asg', 'batch', 'cache', 'changes', 'cidrs',
+                    'cloudformation', 'coalesce', 'ec2', 'elb', 'iam',
+                    'incremental', 'loader', 'partition', 'rds',
+                    'registry', 'route53', 'rulecheck', 'rules',
+                    'tablegen']
+_submodules      = set(_core_modules + _service_modules)
+
+__all__ = sorted(EXPORTS.keys() + _core_modules)
+
+class LazyModule(types.ModuleType):
+    """The stratiform package. Submodules and the public API names are
+    imported on first access, as a module __getattr__ (PEP 562) would,
+    so 'import stratiform' alone stays cheap.
+
+    """
+    def __getattr__(self, name):
+        if name in _submodules:
+            return importlib.import_module('stratiform.' + name)
+        if name not in EXPORTS:
+            msg = "module 'stratiform' has no attribute '%s'"
+            raise AttributeError(msg%name)
+        value = getattr(importlib.import_module(EXPORTS[name]), name)
+        setattr(self, name, value)
+        return value
+
+    def __dir__(self):
+        return sorted(set(self.__dict__) | set(__all__) | _submodules)
+
+# Python 2 has no module __getattr__, so replace this module with a
+# LazyModule sharing its namespace. The original module is kept alive,
+# as its globals are cleared when it is collected.
+_module = LazyModule(__name__, __doc__)
+_module.__dict__.update(sys.modules[__name__].__dict__)
+_module._original = sys.modules[__name__]
+sys.modules[__name__] = _module
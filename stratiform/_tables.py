@@ -0,0 +1,881 @@
+# Generated by stratiform.tablegen; do not edit.
+
+CONSTRUCTORS = {'stratiform.asg': [('auto_scaling_group', 'AutoScalingGroup'),
+                    ('launch_configuration', 'LaunchConfiguration'),
+                    ('lifecycle_hook', 'LifecycleHook'),
+                    ('resource', 'Resource'),
+                    ('scaling_policy', 'ScalingPolicy'),
+                    ('scheduled_action', 'ScheduledAction')],
+ 'stratiform.cloudformation': [('resource', 'Resource'), ('stack', 'Stack')],
+ 'stratiform.ec2': [('customer_gateway', 'CustomerGateway'),
+                    ('dhcp_options', 'DHCPOptions'),
+                    ('eip', 'EIP'),
+                    ('eip_association', 'EIPAssociation'),
+                    ('instance', 'Instance'),
+                    ('internet_gateway', 'InternetGateway'),
+                    ('network_acl', 'NetworkAcl'),
+                    ('network_acl_entry', 'NetworkAclEntry'),
+                    ('network_interface', 'NetworkInterface'),
+                    ('network_interface_attachment',
+                     'NetworkInterfaceAttachment'),
+                    ('resource', 'Resource'),
+                    ('route', 'Route'),
+                    ('route_table', 'RouteTable'),
+                    ('security_group', 'SecurityGroup'),
+                    ('security_group_egress', 'SecurityGroupEgress'),
+                    ('security_group_ingress', 'SecurityGroupIngress'),
+                    ('subnet', 'Subnet'),
+                    ('subnet_network_acl_association',
+                     'SubnetNetworkAclAssociation'),
+                    ('subnet_route_table_association',
+                     'SubnetRouteTableAssociation'),
+                    ('volume', 'Volume'),
+                    ('volume_attachment', 'VolumeAttachment'),
+                    ('vpc', 'VPC'),
+                    ('vpc_gateway_attachment', 'VPCGatewayAttachment'),
+                    ('vpc_peering_connection', 'VPCPeeringConnection'),
+                    ('vpcdhcp_options_association',
+                     'VPCDHCPOptionsAssociation'),
+                    ('vpn_connection', 'VPNConnection'),
+                    ('vpn_connection_route', 'VPNConnectionRoute'),
+                    ('vpn_gateway', 'VPNGateway'),
+                    ('vpn_gateway_route_propagation',
+                     'VPNGatewayRoutePropagation')],
+ 'stratiform.elb': [('load_balancer', 'LoadBalancer'),
+                    ('resource', 'Resource')],
+ 'stratiform.iam': [('access_key', 'AccessKey'),
+                    ('group', 'Group'),
+                    ('instance_profile', 'InstanceProfile'),
+                    ('policy', 'Policy'),
+                    ('resource', 'Resource'),
+                    ('role', 'Role'),
+                    ('user', 'User'),
+                    ('user_to_group_addition', 'UserToGroupAddition')],
+ 'stratiform.rds': [('db_instance', 'DBInstance'),
+                    ('db_parameter_group', 'DBParameterGroup'),
+                    ('db_security_group', 'DBSecurityGroup'),
+                    ('db_security_group_ingress', 'DBSecurityGroupIngress'),
+                    ('db_subnet_group', 'DBSubnetGroup'),
+                    ('resource', 'Resource')],
+ 'stratiform.route53': [('health_check', 'HealthCheck'),
+                        ('hosted_zone', 'HostedZone'),
+                        ('record_set', 'RecordSet'),
+                        ('record_set_group', 'RecordSetGroup'),
+                        ('resource', 'Resource')]}
+
+EXPORTS = {'AccountId': 'stratiform.parameters',
+ 'NoValue': 'stratiform.parameters',
+ 'NotificationArns': 'stratiform.parameters',
+ 'Region': 'stratiform.parameters',
+ 'StackId': 'stratiform.parameters',
+ 'StackName': 'stratiform.parameters',
+ 'address': 'stratiform.common',
+ 'availability_zone': 'stratiform.common',
+ 'az': 'stratiform.common',
+ 'cidr': 'stratiform.common',
+ 'cidr_all': 'stratiform.common',
+ 'column': 'stratiform.base',
+ 'comma_delimited_list_parameter': 'stratiform.parameters',
+ 'condition': 'stratiform.conditions',
+ 'deletion_policy': 'stratiform.resources',
+ 'dns': 'stratiform.common',
+ 'domain_name': 'stratiform.common',
+ 'ephemeral': 'stratiform.common',
+ 'ephemeral_elb': 'stratiform.common',
+ 'ephemeral_linux': 'stratiform.common',
+ 'http': 'stratiform.common',
+ 'https': 'stratiform.common',
+ 'icmp': 'stratiform.common',
+ 'imap': 'stratiform.common',
+ 'ip_localhost': 'stratiform.common',
+ 'key_pair_parameter': 'stratiform.parameters',
+ 'ldap': 'stratiform.common',
+ 'list_number_parameter': 'stratiform.parameters',
+ 'list_security_group_parameter': 'stratiform.parameters',
+ 'list_subnet_parameter': 'stratiform.parameters',
+ 'list_vpc_parameter': 'stratiform.parameters',
+ 'mapping': 'stratiform.mappings',
+ 'mssql': 'stratiform.common',
+ 'mysql': 'stratiform.common',
+ 'ntp': 'stratiform.common',
+ 'number_parameter': 'stratiform.parameters',
+ 'output': 'stratiform.outputs',
+ 'parameter': 'stratiform.parameters',
+ 'pop3': 'stratiform.common',
+ 'pop3s': 'stratiform.common',
+ 'port': 'stratiform.common',
+ 'port_range': 'stratiform.common',
+ 'ports': 'stratiform.common',
+ 'ports_all': 'stratiform.common',
+ 'postgresql': 'stratiform.common',
+ 'protocol': 'stratiform.common',
+ 'protocol_all': 'stratiform.common',
+ 'rdp': 'stratiform.common',
+ 'ref': 'stratiform.base',
+ 'security_group_parameter': 'stratiform.parameters',
+ 'smtp': 'stratiform.common',
+ 'smtps': 'stratiform.common',
+ 'ssh': 'stratiform.common',
+ 'string_parameter': 'stratiform.parameters',
+ 'subnet_parameter': 'stratiform.parameters',
+ 'tag': 'stratiform.resources',
+ 'tags': 'stratiform.resources',
+ 'tcp': 'stratiform.common',
+ 'template': 'stratiform.templates',
+ 'udp': 'stratiform.common',
+ 'version': 'stratiform.templates',
+ 'vpc_parameter': 'stratiform.parameters'}
+
+RESOURCE_TYPES = {'AWS::AWS::AutoScaling::ScheduleAction': ('stratiform.asg',
+                                           'ScheduledAction'),
+ 'AWS::AutoScaling::AutoScalingGroup': ('stratiform.asg', 'AutoScalingGroup'),
+ 'AWS::AutoScaling::LaunchConfiguration': ('stratiform.asg',
+                                           'LaunchConfiguration'),
+ 'AWS::AutoScaling::LifecycleHook': ('stratiform.asg', 'LifecycleHook'),
+ 'AWS::AutoScaling::ScalingPolicy': ('stratiform.asg', 'ScalingPolicy'),
+ 'AWS::CloudFormation::Stack': ('stratiform.cloudformation', 'Stack'),
+ 'AWS::EC2::CustomerGateway': ('stratiform.ec2', 'CustomerGateway'),
+ 'AWS::EC2::DHCPOptions': ('stratiform.ec2', 'DHCPOptions'),
+ 'AWS::EC2::EIP': ('stratiform.ec2', 'EIP'),
+ 'AWS::EC2::EIPAssociation': ('stratiform.ec2', 'EIPAssociation'),
+ 'AWS::EC2::Instance': ('stratiform.ec2', 'Instance'),
+ 'AWS::EC2::InternetGateway': ('stratiform.ec2', 'InternetGateway'),
+ 'AWS::EC2::NetworkAcl': ('stratiform.ec2', 'NetworkAcl'),
+ 'AWS::EC2::NetworkAclEntry': ('stratiform.ec2', 'NetworkAclEntry'),
+ 'AWS::EC2::NetworkInterface': ('stratiform.ec2', 'NetworkInterface'),
+ 'AWS::EC2::NetworkInterfaceAttachment': ('stratiform.ec2',
+                                          'NetworkInterfaceAttachment'),
+ 'AWS::EC2::Route': ('stratiform.ec2', 'Route'),
+ 'AWS::EC2::RouteTable': ('stratiform.ec2', 'RouteTable'),
+ 'AWS::EC2::SecurityGroup': ('stratiform.ec2', 'SecurityGroup'),
+ 'AWS::EC2::SecurityGroupEgress': ('stratiform.ec2', 'SecurityGroupEgress'),
+ 'AWS::EC2::SecurityGroupIngress': ('stratiform.ec2', 'SecurityGroupIngress'),
+ 'AWS::EC2::Subnet': ('stratiform.ec2', 'Subnet'),
+ 'AWS::EC2::SubnetNetworkAclAssociation': ('stratiform.ec2',
+                                           'SubnetNetworkAclAssociation'),
+ 'AWS::EC2::SubnetRouteTableAssociation': ('stratiform.ec2',
+                                           'SubnetRouteTableAssociation'),
+ 'AWS::EC2::VPC': ('stratiform.ec2', 'VPC'),
+ 'AWS::EC2::VPCDHCPOptionsAssociation': ('stratiform.ec2',
+                                         'VPCDHCPOptionsAssociation'),
+ 'AWS::EC2::VPCGatewayAttachment': ('stratiform.ec2', 'VPCGatewayAttachment'),
+ 'AWS::EC2::VPCPeeringConnection': ('stratiform.ec2', 'VPCPeeringConnection'),
+ 'AWS::EC2::VPNConnection': ('stratiform.ec2', 'VPNConnection'),
+ 'AWS::EC2::VPNConnectionRoute': ('stratiform.ec2', 'VPNConnectionRoute'),
+ 'AWS::EC2::VPNGateway': ('stratiform.ec2', 'VPNGateway'),
+ 'AWS::EC2::VPNGatewayRoutePropagation': ('stratiform.ec2',
+                                          'VPNGatewayRoutePropagation'),
+ 'AWS::EC2::Volume': ('stratiform.ec2', 'Volume'),
+ 'AWS::EC2::VolumeAttachment': ('stratiform.ec2', 'VolumeAttachment'),
+ 'AWS::ElasticLoadBalancing::LoadBalancer': ('stratiform.elb', 'LoadBalancer'),
+ 'AWS::IAM::AccessKey': ('stratiform.iam', 'AccessKey'),
+ 'AWS::IAM::Group': ('stratiform.iam', 'Group'),
+ 'AWS::IAM::InstanceProfile': ('stratiform.iam', 'InstanceProfile'),
+ 'AWS::IAM::Policy': ('stratiform.iam', 'Policy'),
+ 'AWS::IAM::Role': ('stratiform.iam', 'Role'),
+ 'AWS::IAM::User': ('stratiform.iam', 'User'),
+ 'AWS::IAM::UserToGroupAddition': ('stratiform.iam', 'UserToGroupAddition'),
+ 'AWS::RDS::DBInstance': ('stratiform.rds', 'DBInstance'),
+ 'AWS::RDS::DBParameterGroup': ('stratiform.rds', 'DBParameterGroup'),
+ 'AWS::RDS::DBSecurityGroup': ('stratiform.rds', 'DBSecurityGroup'),
+ 'AWS::RDS::DBSecurityGroupIngress': ('stratiform.rds',
+                                      'DBSecurityGroupIngress'),
+ 'AWS::RDS::DBSubnetGroup': ('stratiform.rds', 'DBSubnetGroup'),
+ 'AWS::Route53::HealthCheck': ('stratiform.route53', 'HealthCheck'),
+ 'AWS::Route53::HostedZone': ('stratiform.route53', 'HostedZone'),
+ 'AWS::Route53::RecordSet': ('stratiform.route53', 'RecordSet'),
+ 'AWS::Route53::RecordSetGroup': ('stratiform.route53', 'RecordSetGroup')}
+
+SNAKE_CASE = {'AWSObject': 'aws_object',
+ 'AWSTemplateFormatVersion': 'aws_template_format_version',
+ 'AccessKey': 'access_key',
+ 'AccessLoggingPolicy': 'access_logging_policy',
+ 'AdjustmentType': 'adjustment_type',
+ 'AliasTarget': 'alias_target',
+ 'AllocatedStorage': 'allocated_storage',
+ 'AllocationId': 'allocation_id',
+ 'AllowMajorVersionUpgrade': 'allow_major_version_upgrade',
+ 'AllowedPattern': 'allowed_pattern',
+ 'AllowedValues': 'allowed_values',
+ 'AppCookieStickinessPolicy': 'app_cookie_stickiness_policy',
+ 'AssociatePublicIpAddress': 'associate_public_ip_address',
+ 'AssumeRolePolicyDocument': 'assume_role_policy_document',
+ 'AttachmentId': 'attachment_id',
+ 'Attribute': 'attribute',
+ 'Attributes': 'attributes',
+ 'AutoMinorVersionUpgrade': 'auto_minor_version_upgrade',
+ 'AutoScalingGroup': 'auto_scaling_group',
+ 'AutoScalingGroupName': 'auto_scaling_group_name',
+ 'AutoScalingTag': 'auto_scaling_tag',
+ 'AvailabilityZone': 'availability_zone',
+ 'AvailabilityZones': 'availability_zones',
+ 'BackupRetentionPeriod': 'backup_retention_period',
+ 'BgpAsn': 'bgp_asn',
+ 'BlockDeviceMapping': 'block_device_mapping',
+ 'BlockDeviceMappings': 'block_device_mappings',
+ 'CharacterSetName': 'character_set_name',
+ 'CidrBlock': 'cidr_block',
+ 'CidrIp': 'cidr_ip',
+ 'ClassicLinkVPCId': 'classic_link_vpc_id',
+ 'ClassicLinkVPCSecurityGroups': 'classic_link_vpc_security_groups',
+ 'Code': 'code',
+ 'Comment': 'comment',
+ 'Condition': 'condition',
+ 'Conditions': 'conditions',
+ 'ConnectionDrainingPolicy': 'connection_draining_policy',
+ 'ConnectionSettings': 'connection_settings',
+ 'ConstraintDescription': 'constraint_description',
+ 'ContinentCode': 'continent_code',
+ 'CookieExpirationPeriod': 'cookie_expiration_period',
+ 'CookieName': 'cookie_name',
+ 'Cooldown': 'cooldown',
+ 'CountryCode': 'country_code',
+ 'CrossZone': 'cross_zone',
+ 'CustomerGateway': 'customer_gateway',
+ 'CustomerGatewayId': 'customer_gateway_id',
+ 'DBClusterIdentifier': 'db_cluster_identifier',
+ 'DBInstance': 'db_instance',
+ 'DBInstanceClass': 'db_instance_class',
+ 'DBInstanceIdentifier': 'db_instance_identifier',
+ 'DBName': 'db_name',
+ 'DBParameterGroup': 'db_parameter_group',
+ 'DBParameterGroupName': 'db_parameter_group_name',
+ 'DBSecurityGroup': 'db_security_group',
+ 'DBSecurityGroupIngress': 'db_security_group_ingress',
+ 'DBSecurityGroups': 'db_security_groups',
+ 'DBSnapshotIdentifier': 'db_snapshot_identifier',
+ 'DBSubnetGroup': 'db_subnet_group',
+ 'DBSubnetGroupDescription': 'db_subnet_group_description',
+ 'DBSubnetGroupName': 'db_subnet_group_name',
+ 'DHCPOptions': 'dhcp_options',
+ 'DNSName': 'dns_name',
+ 'Default': 'default',
+ 'DefaultResult': 'default_result',
+ 'DeleteOnTermination': 'delete_on_termination',
+ 'Description': 'description',
+ 'DesiredCapacity': 'desired_capacity',
+ 'DestinationCidrBlock': 'destination_cidr_block',
+ 'DestinationSecurityGroupId': 'destination_security_group_id',
+ 'Device': 'device',
+ 'DeviceIndex': 'device_index',
+ 'DeviceName': 'device_name',
+ 'DhcpOptionsId': 'dhcp_options_id',
+ 'DisableApiTermination': 'disable_api_termination',
+ 'Domain': 'domain',
+ 'DomainName': 'domain_name',
+ 'DomainNameServers': 'domain_name_servers',
+ 'EIP': 'eip',
+ 'EIPAssociation': 'eip_association',
+ 'Ebs': 'ebs',
+ 'EbsBlockDevice': 'ebs_block_device',
+ 'EbsOptimized': 'ebs_optimized',
+ 'Egress': 'egress',
+ 'EmitInterval': 'emit_interval',
+ 'EnableDnsHostnames': 'enable_dns_hostnames',
+ 'EnableDnsSupport': 'enable_dns_support',
+ 'Enabled': 'enabled',
+ 'Encrypted': 'encrypted',
+ 'EndTime': 'end_time',
+ 'Engine': 'engine',
+ 'EngineVersion': 'engine_version',
+ 'EstimatedInstanceWarmup': 'estimated_instance_warmup',
+ 'EvaluateTargetHealth': 'evaluate_target_health',
+ 'Failover': 'failover',
+ 'FailureThreshold': 'failure_threshold',
+ 'Family': 'family',
+ 'From': 'from',
+ 'FromPort': 'from_port',
+ 'FullyQualifiedDomainName': 'fully_qualified_domain_name',
+ 'GatewayId': 'gateway_id',
+ 'GeoLocation': 'geo_location',
+ 'Granularity': 'granularity',
+ 'Group': 'group',
+ 'GroupDescription': 'group_description',
+ 'GroupId': 'group_id',
+ 'GroupName': 'group_name',
+ 'GroupSet': 'group_set',
+ 'Groups': 'groups',
+ 'HealthCheck': 'health_check',
+ 'HealthCheckConfig': 'health_check_config',
+ 'HealthCheckGracePeriod': 'health_check_grace_period',
+ 'HealthCheckId': 'health_check_id',
+ 'HealthCheckType': 'health_check_type',
+ 'HealthyThreshold': 'healthy_threshold',
+ 'HeartbeatTimeout': 'heartbeat_timeout',
+ 'HosedZoneName': 'hosed_zone_name',
+ 'HostedZone': 'hosted_zone',
+ 'HostedZoneConfig': 'hosted_zone_config',
+ 'HostedZoneId': 'hosted_zone_id',
+ 'HostedZoneName': 'hosted_zone_name',
+ 'HostedZoneTags': 'hosted_zone_tags',
+ 'HostedZoneVPC': 'hosted_zone_vpc',
+ 'ICMPProperty': 'icmp_property',
+ 'IPAddress': 'ip_address',
+ 'IamInstanceProfile': 'iam_instance_profile',
+ 'Icmp': 'icmp',
+ 'IdleTimeout': 'idle_timeout',
+ 'ImageId': 'image_id',
+ 'Instance': 'instance',
+ 'InstanceId': 'instance_id',
+ 'InstanceInitiatedShutdownBehavior': 'instance_initiated_shutdown_behavior',
+ 'InstanceMonitoring': 'instance_monitoring',
+ 'InstancePort': 'instance_port',
+ 'InstancePorts': 'instance_ports',
+ 'InstanceProfile': 'instance_profile',
+ 'InstanceProtocol': 'instance_protocol',
+ 'InstanceTenancy': 'instance_tenancy',
+ 'InstanceType': 'instance_type',
+ 'Instances': 'instances',
+ 'InternetGateway': 'internet_gateway',
+ 'InternetGatewayId': 'internet_gateway_id',
+ 'Interval': 'interval',
+ 'Iops': 'iops',
+ 'IpAddress': 'ip_address',
+ 'IpOwnerId': 'ip_owner_id',
+ 'IpProtocol': 'ip_protocol',
+ 'KernelId': 'kernel_id',
+ 'Key': 'key',
+ 'KeyName': 'key_name',
+ 'KmsKeyId': 'kms_key_id',
+ 'LBCookieStickinessPolicy': 'lb_cookie_stickiness_policy',
+ 'LaunchConfiguration': 'launch_configuration',
+ 'LaunchConfigurationName': 'launch_configuration_name',
+ 'LicenseModel': 'license_model',
+ 'LifecycleHook': 'lifecycle_hook',
+ 'LifecycleTransititon': 'lifecycle_transititon',
+ 'Listener': 'listener',
+ 'Listeners': 'listeners',
+ 'LoadBalancer': 'load_balancer',
+ 'LoadBalancerName': 'load_balancer_name',
+ 'LoadBalancerNames': 'load_balancer_names',
+ 'LoadBalancerPort': 'load_balancer_port',
+ 'LoadBalancerPorts': 'load_balancer_ports',
+ 'LoginProfile': 'login_profile',
+ 'Mappings': 'mappings',
+ 'MasterUserPassword': 'master_user_password',
+ 'MasterUsername': 'master_username',
+ 'MaxLength': 'max_length',
+ 'MaxSize': 'max_size',
+ 'MaxValue': 'max_value',
+ 'MetricAggregationType': 'metric_aggregation_type',
+ 'MetricIntervalLowerBound': 'metric_interval_lower_bound',
+ 'MetricIntervalUpperBound': 'metric_interval_upper_bound',
+ 'Metrics': 'metrics',
+ 'MetricsCollection': 'metrics_collection',
+ 'MinAdjustmentMagnitude': 'min_adjustment_magnitude',
+ 'MinLength': 'min_length',
+ 'MinSize': 'min_size',
+ 'MinValue': 'min_value',
+ 'Monitoring': 'monitoring',
+ 'MountPoint': 'mount_point',
+ 'MultiAZ': 'multi_az',
+ 'Name': 'name',
+ 'NameableAWSObject': 'nameable_aws_object',
+ 'NetbiosNameServers': 'netbios_name_servers',
+ 'NetbiosNodeType': 'netbios_node_type',
+ 'NetworkAcl': 'network_acl',
+ 'NetworkAclEntry': 'network_acl_entry',
+ 'NetworkAclId': 'network_acl_id',
+ 'NetworkInterface': 'network_interface',
+ 'NetworkInterfaceAssociation': 'network_interface_association',
+ 'NetworkInterfaceAttachment': 'network_interface_attachment',
+ 'NetworkInterfaceAttachmentProperty': 'network_interface_attachment_property',
+ 'NetworkInterfaceGroupItem': 'network_interface_group_item',
+ 'NetworkInterfaceId': 'network_interface_id',
+ 'NetworkInterfacePrivateIpSpecification': 'network_interface_private_ip_specification',
+ 'NetworkInterfaceProperty': 'network_interface_property',
+ 'NetworkInterfaces': 'network_interfaces',
+ 'NoDevice': 'no_device',
+ 'NoEcho': 'no_echo',
+ 'NotificationARNs': 'notification_ar_ns',
+ 'NotificationConfigurations': 'notification_configurations',
+ 'NotificationMetadata': 'notification_metadata',
+ 'NotificationTargetARN': 'notification_target_arn',
+ 'NotificationTypes': 'notification_types',
+ 'NtpServers': 'ntp_servers',
+ 'OptionGroupName': 'option_group_name',
+ 'Output': 'output',
+ 'Outputs': 'outputs',
+ 'Parameter': 'parameter',
+ 'Parameters': 'parameters',
+ 'Password': 'password',
+ 'Path': 'path',
+ 'PeerVpcId': 'peer_vpc_id',
+ 'PlacementGroup': 'placement_group',
+ 'PlacementGroupName': 'placement_group_name',
+ 'PlacementTenancy': 'placement_tenancy',
+ 'Policies': 'policies',
+ 'Policy': 'policy',
+ 'PolicyCode': 'policy_code',
+ 'PolicyDocument': 'policy_document',
+ 'PolicyName': 'policy_name',
+ 'PolicyNames': 'policy_names',
+ 'PolicyType': 'policy_type',
+ 'Port': 'port',
+ 'PortRange': 'port_range',
+ 'PreferredBackupWindow': 'preferred_backup_window',
+ 'PreferredMaintenanceWindow': 'preferred_maintenance_window',
+ 'Primary': 'primary',
+ 'PrivateIpAddress': 'private_ip_address',
+ 'PrivateIpAddresses': 'private_ip_addresses',
+ 'PropagateAtLaunch': 'propagate_at_launch',
+ 'Protocol': 'protocol',
+ 'PseudoParameter': 'pseudo_parameter',
+ 'PublicIp': 'public_ip',
+ 'PubliclyAccessible': 'publicly_accessible',
+ 'RDSSecurityGroupRule': 'rds_security_group_rule',
+ 'RamDiskId': 'ram_disk_id',
+ 'RamdiskId': 'ramdisk_id',
+ 'RecordSet': 'record_set',
+ 'RecordSetGeoLocation': 'record_set_geo_location',
+ 'RecordSetGroup': 'record_set_group',
+ 'RecordsSets': 'records_sets',
+ 'Recurrence': 'recurrence',
+ 'Ref': 'ref',
+ 'Region': 'region',
+ 'RequestInterval': 'request_interval',
+ 'Resource': 'resource',
+ 'ResourcePath': 'resource_path',
+ 'ResourceRecords': 'resource_records',
+ 'Resources': 'resources',
+ 'Role': 'role',
+ 'RoleARN': 'role_arn',
+ 'Roles': 'roles',
+ 'Route': 'route',
+ 'RouteTable': 'route_table',
+ 'RouteTableId': 'route_table_id',
+ 'RouteTableIds': 'route_table_ids',
+ 'RuleAction': 'rule_action',
+ 'RuleNumber': 'rule_number',
+ 'S3BucketName': 's3_bucket_name',
+ 'S3BucketPrefix': 's3_bucket_prefix',
+ 'SSLCertificateId': 'ssl_certificate_id',
+ 'ScalingAdjustment': 'scaling_adjustment',
+ 'ScalingPolicy': 'scaling_policy',
+ 'ScalingPolicyStepAdjustments': 'scaling_policy_step_adjustments',
+ 'ScheduledAction': 'scheduled_action',
+ 'Scheme': 'scheme',
+ 'SearchString': 'search_string',
+ 'SecondaryPrivateIpAddressCount': 'secondary_private_ip_address_count',
+ 'SecurityGroup': 'security_group',
+ 'SecurityGroupEgress': 'security_group_egress',
+ 'SecurityGroupIds': 'security_group_ids',
+ 'SecurityGroupIngress': 'security_group_ingress',
+ 'SecurityGroupRuleEgress': 'security_group_rule_egress',
+ 'SecurityGroupRuleIngress': 'security_group_rule_ingress',
+ 'SecurityGroups': 'security_groups',
+ 'Serial': 'serial',
+ 'SetIdentifier': 'set_identifier',
+ 'Size': 'size',
+ 'SnapshotId': 'snapshot_id',
+ 'SourceDBInstanceIdentifier': 'source_db_instance_identifier',
+ 'SourceDestCheck': 'source_dest_check',
+ 'SourceSecurityGroupId': 'source_security_group_id',
+ 'SourceSecurityGroupName': 'source_security_group_name',
+ 'SourceSecurityGroupOwnerId': 'source_security_group_owner_id',
+ 'SpotPrice': 'spot_price',
+ 'Stack': 'stack',
+ 'StartTime': 'start_time',
+ 'StaticRoutesOnly': 'static_routes_only',
+ 'Status': 'status',
+ 'StepAdjustments': 'step_adjustments',
+ 'StorageEncrypted': 'storage_encrypted',
+ 'StorageType': 'storage_type',
+ 'SubdivisionCode': 'subdivision_code',
+ 'Subnet': 'subnet',
+ 'SubnetId': 'subnet_id',
+ 'SubnetIds': 'subnet_ids',
+ 'SubnetNetworkAclAssociation': 'subnet_network_acl_association',
+ 'SubnetRouteTableAssociation': 'subnet_route_table_association',
+ 'Subnets': 'subnets',
+ 'TTL': 'ttl',
+ 'Tag': 'tag',
+ 'Tags': 'tags',
+ 'Target': 'target',
+ 'Template': 'template',
+ 'TemplateURL': 'template_url',
+ 'TerminationPolicies': 'termination_policies',
+ 'Timeout': 'timeout',
+ 'TimeoutInMinutes': 'timeout_in_minutes',
+ 'To': 'to',
+ 'ToPort': 'to_port',
+ 'TopicARN': 'topic_arn',
+ 'Type': 'type',
+ 'UnhealthyThreshold': 'unhealthy_threshold',
+ 'User': 'user',
+ 'UserData': 'user_data',
+ 'UserName': 'user_name',
+ 'UserToGroupAddition': 'user_to_group_addition',
+ 'Users': 'users',
+ 'VPC': 'vpc',
+ 'VPCDHCPOptionsAssociation': 'vpcdhcp_options_association',
+ 'VPCGatewayAttachment': 'vpc_gateway_attachment',
+ 'VPCId': 'vpc_id',
+ 'VPCPeeringConnection': 'vpc_peering_connection',
+ 'VPCRegion': 'vpc_region',
+ 'VPCSecurityGroups': 'vpc_security_groups',
+ 'VPCZoneIdentifier': 'vpc_zone_identifier',
+ 'VPCs': 'vp_cs',
+ 'VPNConnection': 'vpn_connection',
+ 'VPNConnectionRoute': 'vpn_connection_route',
+ 'VPNGateway': 'vpn_gateway',
+ 'VPNGatewayRoutePropagation': 'vpn_gateway_route_propagation',
+ 'VPnConnectionId': 'v_pn_connection_id',
+ 'Value': 'value',
+ 'VirtualName': 'virtual_name',
+ 'Volume': 'volume',
+ 'VolumeAttachment': 'volume_attachment',
+ 'VolumeId': 'volume_id',
+ 'VolumeSize': 'volume_size',
+ 'VolumeType': 'volume_type',
+ 'Volumes': 'volumes',
+ 'VpcId': 'vpc_id',
+ 'VpcPeeringConnectionId': 'vpc_peering_connection_id',
+ 'VpnGatewayId': 'vpn_gateway_id',
+ 'Weight': 'weight'}
+
+CAMEL_CASE = {'access_key': 'AccessKey',
+ 'access_logging_policy': 'AccessLoggingPolicy',
+ 'adjustment_type': 'AdjustmentType',
+ 'alias_target': 'AliasTarget',
+ 'allocated_storage': 'AllocatedStorage',
+ 'allocation_id': 'AllocationId',
+ 'allow_major_version_upgrade': 'AllowMajorVersionUpgrade',
+ 'allowed_pattern': 'AllowedPattern',
+ 'allowed_values': 'AllowedValues',
+ 'app_cookie_stickiness_policy': 'AppCookieStickinessPolicy',
+ 'associate_public_ip_address': 'AssociatePublicIpAddress',
+ 'assume_role_policy_document': 'AssumeRolePolicyDocument',
+ 'attachment_id': 'AttachmentId',
+ 'attribute': 'Attribute',
+ 'attributes': 'Attributes',
+ 'auto_minor_version_upgrade': 'AutoMinorVersionUpgrade',
+ 'auto_scaling_group': 'AutoScalingGroup',
+ 'auto_scaling_group_name': 'AutoScalingGroupName',
+ 'auto_scaling_tag': 'AutoScalingTag',
+ 'availability_zone': 'AvailabilityZone',
+ 'availability_zones': 'AvailabilityZones',
+ 'aws_object': 'AwsObject',
+ 'aws_template_format_version': 'AwsTemplateFormatVersion',
+ 'backup_retention_period': 'BackupRetentionPeriod',
+ 'bgp_asn': 'BgpAsn',
+ 'block_device_mapping': 'BlockDeviceMapping',
+ 'block_device_mappings': 'BlockDeviceMappings',
+ 'character_set_name': 'CharacterSetName',
+ 'cidr_block': 'CidrBlock',
+ 'cidr_ip': 'CidrIp',
+ 'classic_link_vpc_id': 'ClassicLinkVpcId',
+ 'classic_link_vpc_security_groups': 'ClassicLinkVpcSecurityGroups',
+ 'code': 'Code',
+ 'comment': 'Comment',
+ 'condition': 'Condition',
+ 'conditions': 'Conditions',
+ 'connection_draining_policy': 'ConnectionDrainingPolicy',
+ 'connection_settings': 'ConnectionSettings',
+ 'constraint_description': 'ConstraintDescription',
+ 'continent_code': 'ContinentCode',
+ 'cookie_expiration_period': 'CookieExpirationPeriod',
+ 'cookie_name': 'CookieName',
+ 'cooldown': 'Cooldown',
+ 'country_code': 'CountryCode',
+ 'cross_zone': 'CrossZone',
+ 'customer_gateway': 'CustomerGateway',
+ 'customer_gateway_id': 'CustomerGatewayId',
+ 'db_cluster_identifier': 'DbClusterIdentifier',
+ 'db_instance': 'DbInstance',
+ 'db_instance_class': 'DbInstanceClass',
+ 'db_instance_identifier': 'DbInstanceIdentifier',
+ 'db_name': 'DbName',
+ 'db_parameter_group': 'DbParameterGroup',
+ 'db_parameter_group_name': 'DbParameterGroupName',
+ 'db_security_group': 'DbSecurityGroup',
+ 'db_security_group_ingress': 'DbSecurityGroupIngress',
+ 'db_security_groups': 'DbSecurityGroups',
+ 'db_snapshot_identifier': 'DbSnapshotIdentifier',
+ 'db_subnet_group': 'DbSubnetGroup',
+ 'db_subnet_group_description': 'DbSubnetGroupDescription',
+ 'db_subnet_group_name': 'DbSubnetGroupName',
+ 'default': 'Default',
+ 'default_result': 'DefaultResult',
+ 'delete_on_termination': 'DeleteOnTermination',
+ 'description': 'Description',
+ 'desired_capacity': 'DesiredCapacity',
+ 'destination_cidr_block': 'DestinationCidrBlock',
+ 'destination_security_group_id': 'DestinationSecurityGroupId',
+ 'device': 'Device',
+ 'device_index': 'DeviceIndex',
+ 'device_name': 'DeviceName',
+ 'dhcp_options': 'DhcpOptions',
+ 'dhcp_options_id': 'DhcpOptionsId',
+ 'disable_api_termination': 'DisableApiTermination',
+ 'dns_name': 'DnsName',
+ 'domain': 'Domain',
+ 'domain_name': 'DomainName',
+ 'domain_name_servers': 'DomainNameServers',
+ 'ebs': 'Ebs',
+ 'ebs_block_device': 'EbsBlockDevice',
+ 'ebs_optimized': 'EbsOptimized',
+ 'egress': 'Egress',
+ 'eip': 'Eip',
+ 'eip_association': 'EipAssociation',
+ 'emit_interval': 'EmitInterval',
+ 'enable_dns_hostnames': 'EnableDnsHostnames',
+ 'enable_dns_support': 'EnableDnsSupport',
+ 'enabled': 'Enabled',
+ 'encrypted': 'Encrypted',
+ 'end_time': 'EndTime',
+ 'engine': 'Engine',
+ 'engine_version': 'EngineVersion',
+ 'estimated_instance_warmup': 'EstimatedInstanceWarmup',
+ 'evaluate_target_health': 'EvaluateTargetHealth',
+ 'failover': 'Failover',
+ 'failure_threshold': 'FailureThreshold',
+ 'family': 'Family',
+ 'from': 'From',
+ 'from_port': 'FromPort',
+ 'fully_qualified_domain_name': 'FullyQualifiedDomainName',
+ 'gateway_id': 'GatewayId',
+ 'geo_location': 'GeoLocation',
+ 'granularity': 'Granularity',
+ 'group': 'Group',
+ 'group_description': 'GroupDescription',
+ 'group_id': 'GroupId',
+ 'group_name': 'GroupName',
+ 'group_set': 'GroupSet',
+ 'groups': 'Groups',
+ 'health_check': 'HealthCheck',
+ 'health_check_config': 'HealthCheckConfig',
+ 'health_check_grace_period': 'HealthCheckGracePeriod',
+ 'health_check_id': 'HealthCheckId',
+ 'health_check_type': 'HealthCheckType',
+ 'healthy_threshold': 'HealthyThreshold',
+ 'heartbeat_timeout': 'HeartbeatTimeout',
+ 'hosed_zone_name': 'HosedZoneName',
+ 'hosted_zone': 'HostedZone',
+ 'hosted_zone_config': 'HostedZoneConfig',
+ 'hosted_zone_id': 'HostedZoneId',
+ 'hosted_zone_name': 'HostedZoneName',
+ 'hosted_zone_tags': 'HostedZoneTags',
+ 'hosted_zone_vpc': 'HostedZoneVpc',
+ 'iam_instance_profile': 'IamInstanceProfile',
+ 'icmp': 'Icmp',
+ 'icmp_property': 'IcmpProperty',
+ 'idle_timeout': 'IdleTimeout',
+ 'image_id': 'ImageId',
+ 'instance': 'Instance',
+ 'instance_id': 'InstanceId',
+ 'instance_initiated_shutdown_behavior': 'InstanceInitiatedShutdownBehavior',
+ 'instance_monitoring': 'InstanceMonitoring',
+ 'instance_port': 'InstancePort',
+ 'instance_ports': 'InstancePorts',
+ 'instance_profile': 'InstanceProfile',
+ 'instance_protocol': 'InstanceProtocol',
+ 'instance_tenancy': 'InstanceTenancy',
+ 'instance_type': 'InstanceType',
+ 'instances': 'Instances',
+ 'internet_gateway': 'InternetGateway',
+ 'internet_gateway_id': 'InternetGatewayId',
+ 'interval': 'Interval',
+ 'iops': 'Iops',
+ 'ip_address': 'IpAddress',
+ 'ip_owner_id': 'IpOwnerId',
+ 'ip_protocol': 'IpProtocol',
+ 'kernel_id': 'KernelId',
+ 'key': 'Key',
+ 'key_name': 'KeyName',
+ 'kms_key_id': 'KmsKeyId',
+ 'launch_configuration': 'LaunchConfiguration',
+ 'launch_configuration_name': 'LaunchConfigurationName',
+ 'lb_cookie_stickiness_policy': 'LbCookieStickinessPolicy',
+ 'license_model': 'LicenseModel',
+ 'lifecycle_hook': 'LifecycleHook',
+ 'lifecycle_transititon': 'LifecycleTransititon',
+ 'listener': 'Listener',
+ 'listeners': 'Listeners',
+ 'load_balancer': 'LoadBalancer',
+ 'load_balancer_name': 'LoadBalancerName',
+ 'load_balancer_names': 'LoadBalancerNames',
+ 'load_balancer_port': 'LoadBalancerPort',
+ 'load_balancer_ports': 'LoadBalancerPorts',
+ 'login_profile': 'LoginProfile',
+ 'mappings': 'Mappings',
+ 'master_user_password': 'MasterUserPassword',
+ 'master_username': 'MasterUsername',
+ 'max_length': 'MaxLength',
+ 'max_size': 'MaxSize',
+ 'max_value': 'MaxValue',
+ 'metric_aggregation_type': 'MetricAggregationType',
+ 'metric_interval_lower_bound': 'MetricIntervalLowerBound',
+ 'metric_interval_upper_bound': 'MetricIntervalUpperBound',
+ 'metrics': 'Metrics',
+ 'metrics_collection': 'MetricsCollection',
+ 'min_adjustment_magnitude': 'MinAdjustmentMagnitude',
+ 'min_length': 'MinLength',
+ 'min_size': 'MinSize',
+ 'min_value': 'MinValue',
+ 'monitoring': 'Monitoring',
+ 'mount_point': 'MountPoint',
+ 'multi_az': 'MultiAz',
+ 'name': 'Name',
+ 'nameable_aws_object': 'NameableAwsObject',
+ 'netbios_name_servers': 'NetbiosNameServers',
+ 'netbios_node_type': 'NetbiosNodeType',
+ 'network_acl': 'NetworkAcl',
+ 'network_acl_entry': 'NetworkAclEntry',
+ 'network_acl_id': 'NetworkAclId',
+ 'network_interface': 'NetworkInterface',
+ 'network_interface_association': 'NetworkInterfaceAssociation',
+ 'network_interface_attachment': 'NetworkInterfaceAttachment',
+ 'network_interface_attachment_property': 'NetworkInterfaceAttachmentProperty',
+ 'network_interface_group_item': 'NetworkInterfaceGroupItem',
+ 'network_interface_id': 'NetworkInterfaceId',
+ 'network_interface_private_ip_specification': 'NetworkInterfacePrivateIpSpecification',
+ 'network_interface_property': 'NetworkInterfaceProperty',
+ 'network_interfaces': 'NetworkInterfaces',
+ 'no_device': 'NoDevice',
+ 'no_echo': 'NoEcho',
+ 'notification_ar_ns': 'NotificationArNs',
+ 'notification_configurations': 'NotificationConfigurations',
+ 'notification_metadata': 'NotificationMetadata',
+ 'notification_target_arn': 'NotificationTargetArn',
+ 'notification_types': 'NotificationTypes',
+ 'ntp_servers': 'NtpServers',
+ 'option_group_name': 'OptionGroupName',
+ 'output': 'Output',
+ 'outputs': 'Outputs',
+ 'parameter': 'Parameter',
+ 'parameters': 'Parameters',
+ 'password': 'Password',
+ 'path': 'Path',
+ 'peer_vpc_id': 'PeerVpcId',
+ 'placement_group': 'PlacementGroup',
+ 'placement_group_name': 'PlacementGroupName',
+ 'placement_tenancy': 'PlacementTenancy',
+ 'policies': 'Policies',
+ 'policy': 'Policy',
+ 'policy_code': 'PolicyCode',
+ 'policy_document': 'PolicyDocument',
+ 'policy_name': 'PolicyName',
+ 'policy_names': 'PolicyNames',
+ 'policy_type': 'PolicyType',
+ 'port': 'Port',
+ 'port_range': 'PortRange',
+ 'preferred_backup_window': 'PreferredBackupWindow',
+ 'preferred_maintenance_window': 'PreferredMaintenanceWindow',
+ 'primary': 'Primary',
+ 'private_ip_address': 'PrivateIpAddress',
+ 'private_ip_addresses': 'PrivateIpAddresses',
+ 'propagate_at_launch': 'PropagateAtLaunch',
+ 'protocol': 'Protocol',
+ 'pseudo_parameter': 'PseudoParameter',
+ 'public_ip': 'PublicIp',
+ 'publicly_accessible': 'PubliclyAccessible',
+ 'ram_disk_id': 'RamDiskId',
+ 'ramdisk_id': 'RamdiskId',
+ 'rds_security_group_rule': 'RdsSecurityGroupRule',
+ 'record_set': 'RecordSet',
+ 'record_set_geo_location': 'RecordSetGeoLocation',
+ 'record_set_group': 'RecordSetGroup',
+ 'records_sets': 'RecordsSets',
+ 'recurrence': 'Recurrence',
+ 'ref': 'Ref',
+ 'region': 'Region',
+ 'request_interval': 'RequestInterval',
+ 'resource': 'Resource',
+ 'resource_path': 'ResourcePath',
+ 'resource_records': 'ResourceRecords',
+ 'resources': 'Resources',
+ 'role': 'Role',
+ 'role_arn': 'RoleArn',
+ 'roles': 'Roles',
+ 'route': 'Route',
+ 'route_table': 'RouteTable',
+ 'route_table_id': 'RouteTableId',
+ 'route_table_ids': 'RouteTableIds',
+ 'rule_action': 'RuleAction',
+ 'rule_number': 'RuleNumber',
+ 's3_bucket_name': 'S3BucketName',
+ 's3_bucket_prefix': 'S3BucketPrefix',
+ 'scaling_adjustment': 'ScalingAdjustment',
+ 'scaling_policy': 'ScalingPolicy',
+ 'scaling_policy_step_adjustments': 'ScalingPolicyStepAdjustments',
+ 'scheduled_action': 'ScheduledAction',
+ 'scheme': 'Scheme',
+ 'search_string': 'SearchString',
+ 'secondary_private_ip_address_count': 'SecondaryPrivateIpAddressCount',
+ 'security_group': 'SecurityGroup',
+ 'security_group_egress': 'SecurityGroupEgress',
+ 'security_group_ids': 'SecurityGroupIds',
+ 'security_group_ingress': 'SecurityGroupIngress',
+ 'security_group_rule_egress': 'SecurityGroupRuleEgress',
+ 'security_group_rule_ingress': 'SecurityGroupRuleIngress',
+ 'security_groups': 'SecurityGroups',
+ 'serial': 'Serial',
+ 'set_identifier': 'SetIdentifier',
+ 'size': 'Size',
+ 'snapshot_id': 'SnapshotId',
+ 'source_db_instance_identifier': 'SourceDbInstanceIdentifier',
+ 'source_dest_check': 'SourceDestCheck',
+ 'source_security_group_id': 'SourceSecurityGroupId',
+ 'source_security_group_name': 'SourceSecurityGroupName',
+ 'source_security_group_owner_id': 'SourceSecurityGroupOwnerId',
+ 'spot_price': 'SpotPrice',
+ 'ssl_certificate_id': 'SslCertificateId',
+ 'stack': 'Stack',
+ 'start_time': 'StartTime',
+ 'static_routes_only': 'StaticRoutesOnly',
+ 'status': 'Status',
+ 'step_adjustments': 'StepAdjustments',
+ 'storage_encrypted': 'StorageEncrypted',
+ 'storage_type': 'StorageType',
+ 'subdivision_code': 'SubdivisionCode',
+ 'subnet': 'Subnet',
+ 'subnet_id': 'SubnetId',
+ 'subnet_ids': 'SubnetIds',
+ 'subnet_network_acl_association': 'SubnetNetworkAclAssociation',
+ 'subnet_route_table_association': 'SubnetRouteTableAssociation',
+ 'subnets': 'Subnets',
+ 'tag': 'Tag',
+ 'tags': 'Tags',
+ 'target': 'Target',
+ 'template': 'Template',
+ 'template_url': 'TemplateUrl',
+ 'termination_policies': 'TerminationPolicies',
+ 'timeout': 'Timeout',
+ 'timeout_in_minutes': 'TimeoutInMinutes',
+ 'to': 'To',
+ 'to_port': 'ToPort',
+ 'topic_arn': 'TopicArn',
+ 'ttl': 'Ttl',
+ 'type': 'Type',
+ 'unhealthy_threshold': 'UnhealthyThreshold',
+ 'user': 'User',
+ 'user_data': 'UserData',
+ 'user_name': 'UserName',
+ 'user_to_group_addition': 'UserToGroupAddition',
+ 'users': 'Users',
+ 'v_pn_connection_id': 'VPnConnectionId',
+ 'value': 'Value',
+ 'virtual_name': 'VirtualName',
+ 'volume': 'Volume',
+ 'volume_attachment': 'VolumeAttachment',
+ 'volume_id': 'VolumeId',
+ 'volume_size': 'VolumeSize',
+ 'volume_type': 'VolumeType',
+ 'volumes': 'Volumes',
+ 'vp_cs': 'VpCs',
+ 'vpc': 'Vpc',
+ 'vpc_gateway_attachment': 'VpcGatewayAttachment',
+ 'vpc_id': 'VpcId',
+ 'vpc_peering_connection': 'VpcPeeringConnection',
+ 'vpc_peering_connection_id': 'VpcPeeringConnectionId',
+ 'vpc_region': 'VpcRegion',
+ 'vpc_security_groups': 'VpcSecurityGroups',
+ 'vpc_zone_identifier': 'VpcZoneIdentifier',
+ 'vpcdhcp_options_association': 'VpcdhcpOptionsAssociation',
+ 'vpn_connection': 'VpnConnection',
+ 'vpn_connection_route': 'VpnConnectionRoute',
+ 'vpn_gateway': 'VpnGateway',
+ 'vpn_gateway_id': 'VpnGatewayId',
+ 'vpn_gateway_route_propagation': 'VpnGatewayRoutePropagation',
+ 'weight': 'Weight'}
@@ -16,8 +16,8 @@ from copy import copy
 
 from stratiform.base import AWSObject, prop
 from stratiform.common import AvailabilityZone, CIDR, DomainName, PortRange, IpAddress, IpProtocol
-from stratiform.utils import Wrapper, ListWrapper, snake_case, super_copy
-from stratiform.resources import Resource, merge
+from stratiform.utils import Wrapper, ListWrapper, super_copy
+from stratiform.resources import Resource, merge, resource_constructors
 
 from stratiform import ec2
 
@@ -110,8 +110,11 @@ class AutoScalingTags(object):
 
     @staticmethod
     def from_tags(tags, propagate_at_launch=False):
-        mapped = [AutoScalingTag.from_tag(t, propagate_at_launch) for t in tags.tags]
-        return AutoScalingTags(*mapped)
+        def create():
+            mapped = [AutoScalingTag.from_tag(t, propagate_at_launch) for t in tags.tags]
+            return AutoScalingTags(*mapped)
+        key = ('auto_scaling_tags', type(propagate_at_launch), propagate_at_launch)
+        return tags.derive(key, create)
 
 ################################ AWS Resource Types ################################
 class AutoScalingGroup(Resource):
@@ -201,10 +204,8 @@ class ScheduledAction(Resource):
                 prop('StartTime')]
 
 #### Public API ####
-# Generate functional snake_cased form of constructors for public API
-def __is_resource(obj):
-    return issubclass(type(obj), type) and issubclass(obj, Resource)
-constructors = {snake_case(name): obj for (name, obj) in globals().items() if __is_resource(obj)}
+# Functional snake_cased form of constructors for public API
+constructors = resource_constructors(__name__, globals())
 globals().update(constructors)
 
 adjustment_type            = AdjustmentType
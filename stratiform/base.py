@@ -12,17 +12,18 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
-import json, re
+import json, os, re
 
 from collections import OrderedDict as odict
 from copy import copy
 
-from stratiform.utils import class_name, snake_case, super_copy
+from stratiform import registry
+from stratiform.utils import ConsList, class_name, snake_case, super_copy
 from stratiform.dispatchers import typed_dispatch
 
 def named_as_ref(obj):
     if isinstance(obj, NameableAWSObject) and hasattr(obj, 'object_name'):
-        return Ref(obj)
+        return obj.__ref__()
     else:
         return obj
 
@@ -39,6 +40,8 @@ def unique_attr(seq, attr):
     return result
 
 class Property(object):
+    __slots__ = ('name', 'type', 'attr', 'func', 'default')
+
     def __init__(self, name, type=None, attr=None, func=None, default=None):
         self.name = name
         self.type = type
@@ -49,11 +52,81 @@ class Property(object):
     def __repr__(self):
         return "Property(%s, %r, %r, %r"%(self.name, self.type, self.attr, self.func)
 
+class Schema(object):
+    """The compiled, immutable form of the property list of an AWSObject
+    class.
+
+    A schema holds the ordered properties, the unique attribute names,
+    the names and types of the arguments accepted for positional
+    dispatch, an index from property name to property, and an index
+    from type name to the types of properties and arguments. It is
+    compiled once per class by AWSObject.__schema__().
+
+    """
+    def __init__(self, props, attrs, arg_names, arg_types):
+        self.props     = tuple(props)
+        self.attrs     = tuple(attrs)
+        self.arg_names = tuple(arg_names)
+        self.arg_types = tuple(arg_types)
+        self.attr_set  = frozenset(self.attrs)
+        self.source    = None
+        self.index     = {}
+        self.types     = {}
+        for p in self.props:
+            self.index.setdefault(p.name, p)
+        for t in [p.type for p in self.props] + list(self.arg_types):
+            if t is not None:
+                self.types.setdefault(t.__name__, t)
+
+    @staticmethod
+    def compile(props):
+        """Returns the schema for the specified list of properties.
+        """
+        unique = unique_attr(props, 'attr')
+        typed  = [u for u in unique if u.type != None]
+        return Schema(props,
+                      [u.attr for u in unique],
+                      [t.attr for t in typed],
+                      [t.type for t in typed])
+
+    def extend(self, attrs=(), args=()):
+        """Returns a new schema with the additional untyped attributes and
+        (name, type) arguments. These are accepted as keyword
+        arguments, but are not serialized as properties.
+
+        """
+        args = list(args)
+        return Schema(self.props,
+                      self.attrs + tuple(attrs) + tuple(n for n, _ in args),
+                      self.arg_names + tuple(n for n, _ in args),
+                      self.arg_types + tuple(t for _, t in args))
+
+    def __repr__(self):
+        return "Schema(%r)"%(self.attrs,)
+
 class AWSObjectType(type):
+    """Metaclass of AWSObject. Exposes the types of the properties and
+    arguments of a class as class attributes, e.g.,
+    asg.AutoScalingGroup.HealthCheckType, through the type index of the
+    class schema, and registers each class defining a resource_type
+    string in stratiform.registry.
+
+    """
+    def __init__(cls, name, bases, dct):
+        super(AWSObjectType, cls).__init__(name, bases, dct)
+        if isinstance(dct.get('resource_type'), basestring):
+            registry.register(cls)
+
     def __getattr__(cls, key):
-        for p in cls.props():
-            if key == p.type.__name__:
-                return p.type
+        # Only reached for names not found normally. Dunder names and
+        # the names needed to compile the schema are never types.
+        if key[:2] != '__' and key not in ('props', '_schema'):
+            try:
+                types = cls.__schema__().types
+            except AttributeError:
+                raise AttributeError(key)
+            if key in types:
+                return types[key]
         raise AttributeError(key)
 
 class AWSObject(object):
@@ -63,10 +136,22 @@ class AWSObject(object):
 
     __metaclass__ = AWSObjectType
 
+    # Shared by every object until a sibling is added
+    _siblings = ConsList.EMPTY
+
+    # Whether __cached_json__() caches the serializable form. Set to
+    # False (or set STRATIFORM_NO_JSON_CACHE in the environment) to
+    # rebuild it on every render when debugging.
+    cache_json = not os.environ.get('STRATIFORM_NO_JSON_CACHE')
+
+    # Whether a Fingerprint may store the digest of this object with
+    # its cached serializable form. Objects whose form holds
+    # collections that change in place, like Template, set it False.
+    cache_digest = True
+
     @typed_dispatch
     def __init__(self, **kwargs):
         self.__set_attrs__(**kwargs)
-        self._siblings = []
 
     @typed_dispatch
     def __call__(self, **kwargs):
@@ -75,36 +160,82 @@ class AWSObject(object):
         return result
 
     def __copy__(self):
-        result = super_copy(AWSObject, self)
-        result._siblings = copy(result._siblings)
-        return result
+        return super_copy(AWSObject, self)
+
+    def __setattr__(self, k, v):
+        super(AWSObject, self).__setattr__(k, v)
+        self.__dict__.pop('_json', None)
+        self.__dict__.pop('_digest', None)
+
+    def __cached_json__(self):
+        """Returns the serializable form of this object, as built by
+        __json__(), caching it until an attribute of this object is
+        set. The form is shallow, as nested objects are serialized by
+        their own __json__(), so only this object's own attributes
+        affect it.
+
+        """
+        data = self.__dict__.get('_json')
+        if data is None:
+            data = self.__json__()
+            if AWSObject.cache_json:
+                self.__dict__['_json'] = data
+        return data
 
     def __set_attrs__(self, **kwargs):
+        attrs = self.__schema__().attr_set
         for k, v in kwargs.iteritems():
-            if k not in self.__attrs__():
+            if k not in attrs:
                 err_msg = "%s() got unexpected keyword argument '%s'"
                 raise TypeError(err_msg%(class_name(self), k))
             setattr(self, k, v)
- 
+
+    @classmethod
+    def __schema__(cls):
+        """Returns the compiled schema for this class, compiling and caching
+        it on first use. Each class that overrides props() gets its
+        own schema.
+
+        """
+        schema = cls.__dict__.get('_schema')
+        if schema is None or schema.source is not cls.props:
+            schema = cls.__compile_schema__()
+            schema.source = cls.props
+            cls._schema = schema
+        return schema
+
+    @classmethod
+    def __compile_schema__(cls):
+        """Compiles the schema for this class. Subclasses that accept
+        arguments not listed in props() extend the returned schema.
+
+        """
+        return Schema.compile(cls.props())
+
     def __attrs__(self):
-        unique = unique_attr(self.__props__(), 'attr')
-        return [u.attr for u in unique]
+        return self.__schema__().attrs
 
     def arg_names(self):
-        unique = unique_attr(self.__props__(), 'attr')
-        unique = filter(lambda p: p.type != None, unique)
-        return [u.attr for u in unique]
+        return self.__schema__().arg_names
 
     def arg_types(self):
-        unique = unique_attr(self.__props__(), 'attr')
-        unique = filter(lambda p: p.type != None, unique)
-        return [u.type for u in unique]
+        return self.__schema__().arg_types
 
     def siblings(self):
-        return self._siblings
+        return self._siblings.to_list()
+
+    def with_sibling(self, sibling):
+        """Returns a copy of this object with the additional sibling. The
+        siblings are shared with this object, not copied, so the copy
+        costs O(1) in their number.
+
+        """
+        result = copy(self)
+        result._siblings = self._siblings.append(sibling)
+        return result
 
     def __props__(self):
-        return self.props()
+        return self.__schema__().props
 
     def __json__(self):
         data = odict()
@@ -134,6 +265,68 @@ class NameableAWSObject(AWSObject):
             result.object_name = object_name
         return result
     
+    def __ref__(self):
+        """Returns a Ref to this object. The Ref is created once and reused
+        for every reference to this object.
+
+        """
+        ref = self.__dict__.get('_ref')
+        if ref is None or ref.ref is not self:
+            ref = Ref(self)
+            self.__dict__['_ref'] = ref
+        return ref
+
+    @classmethod
+    def bulk(cls, names, **kwargs):
+        """Creates one object per name, e.g.,
+
+            ec2.subnet.bulk(['A', 'B'], vpc_id=vpc, availability_zone=column([az1, az2]),
+                            cidr_block=column([cidr1, cidr2]), tags=shared)
+
+        A value wrapped in column() holds one value per name; any other
+        value, including a list, is shared by every object. The
+        arguments are validated once and the objects bound in a single
+        pass. Returns a Bulk, which Template.add() accepts.
+
+        """
+        names = list(names)
+        attrs = cls.__schema__().attr_set
+        shared, columns = {}, []
+        for k, v in kwargs.iteritems():
+            if k not in attrs:
+                err_msg = "%s() got unexpected keyword argument '%s'"
+                raise TypeError(err_msg%(cls.__name__, k))
+            if isinstance(v, Column):
+                if len(v.values) != len(names):
+                    msg = "%s.bulk() got %d values for '%s' but %d names"
+                    raise ValueError(msg%(cls.__name__, len(v.values), k, len(names)))
+                columns.append((k, v.values))
+            else:
+                shared[k] = v
+
+        # Objects whose construction is the generic one are bound
+        # directly; others are constructed one by one.
+        if cls.__init__.__func__ is not NameableAWSObject.__init__.__func__ or \
+           cls.__setattr__.__func__ is not AWSObject.__setattr__.__func__:
+            objects = []
+            for i, name in enumerate(names):
+                kw = dict(shared)
+                kw.update((k, v[i]) for k, v in columns)
+                objects.append(cls(name, **kw))
+            return Bulk(objects)
+
+        new  = cls.__new__
+        keys = [k for k, _ in columns]
+        objects = [None] * len(names)
+        for i, row in enumerate(zip(names, *[v for _, v in columns])):
+            obj = new(cls)
+            d = obj.__dict__
+            d.update(shared)
+            d.update(zip(keys, row[1:]))
+            d['object_name'] = row[0]
+            objects[i] = obj
+        return Bulk(objects)
+
     @staticmethod
     def __parse_args(args):
         object_name = None
@@ -141,20 +334,57 @@ class NameableAWSObject(AWSObject):
             object_name, args = args[0], args[1:]
         return object_name, args
 
-    def __attrs__(self):
-        sattrs = super(NameableAWSObject, self).__attrs__()
-        return ['object_name'] + sattrs
+    @classmethod
+    def __compile_schema__(cls):
+        schema = super(NameableAWSObject, cls).__compile_schema__()
+        return schema.extend(attrs=['object_name'])
+
+class Bulk(object):
+    """The objects created by NameableAWSObject.bulk(), in order.
+    """
+    __slots__ = ('objects',)
+
+    def __init__(self, objects):
+        self.objects = objects
+
+    def __len__(self):
+        return len(self.objects)
+
+    def __iter__(self):
+        return iter(self.objects)
+
+    def __getitem__(self, i):
+        return self.objects[i]
+
+    def __repr__(self):
+        return "Bulk(%d objects)"%len(self.objects)
+
+class Column(object):
+    """The per-object values of an argument of NameableAWSObject.bulk().
+    """
+    __slots__ = ('values',)
+
+    def __init__(self, values):
+        self.values = list(values)
+
+    def __repr__(self):
+        return "Column(%d values)"%len(self.values)
 
 class Ref(AWSObject):
     @staticmethod
     def props():
         return [Property('Ref', NameableAWSObject, func='object_name')]
 
+    def __cached_json__(self):
+        # Depends on the name of the referenced object, so never cached
+        return self.__json__()
+
     def __json__(self):
         return {'Ref' : self.ref.object_name}
 
 #### Public API ####
-ref  = Ref
-prop = Property
+ref    = Ref
+prop   = Property
+column = Column
 
-__all__ = ['ref', 'prop']
+__all__ = ['ref', 'prop', 'column']
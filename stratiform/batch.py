@@ -0,0 +1,171 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Renders many template scripts in one invocation.
+
+Each job is a template script, like those in example/, plus the argv
+it expects. Shared modules (e.g., example/common.py) are imported once
+in the parent process and the jobs are rendered across a forked
+process pool, so every worker inherits the imported state instead of
+paying for it again.
+
+Usage:
+
+    python -m stratiform.batch -o out -p common \\
+        example/vpc.py "example/sg.py dev" "example/api.py dev"
+
+"""
+
+import argparse, importlib, multiprocessing, os, runpy, shlex, sys, time, traceback
+
+from stratiform.templates import Template
+
+class Job(object):
+    """A template script and the argv to render it with.
+    """
+    def __init__(self, path, argv=()):
+        self.path = path
+        self.argv = list(argv)
+
+    @staticmethod
+    def parse(spec):
+        """Parses a job from a string like "example/api.py dev".
+        """
+        words = shlex.split(spec)
+        return Job(words[0], words[1:])
+
+    @property
+    def name(self):
+        stem = os.path.splitext(os.path.basename(self.path))[0]
+        return '-'.join([stem] + self.argv)
+
+    def __repr__(self):
+        return "Job(%r, %r)"%(self.path, self.argv)
+
+class Result(object):
+    """The outcome of rendering a single job.
+    """
+    def __init__(self, job, output=None, seconds=0.0, size=0, error=None):
+        self.job     = job
+        self.output  = output
+        self.seconds = seconds
+        self.size    = size
+        self.error   = error
+
+def find_template(namespace):
+    """Returns the single Template instance defined in the namespace of
+    a template script.
+
+    """
+    found = [v for v in namespace.values() if isinstance(v, Template)]
+    if len(found) != 1:
+        msg = "expected exactly one template, found %d"
+        raise ValueError(msg%len(found))
+    return found[0]
+
+def render_job(job, outdir):
+    """Runs the template script of the job and writes its JSON to
+    outdir. Returns a Result, recording rather than raising any error,
+    including a script calling sys.exit(), so one failed script does
+    not abort the pool.
+
+    """
+    start = time.time()
+    output = os.path.join(outdir, job.name + '.json')
+    argv = sys.argv
+    try:
+        sys.argv = [job.path] + job.argv
+        namespace = runpy.run_path(job.path, run_name='__stratiform_batch__')
+        template = find_template(namespace)
+        with open(output, 'w') as fp:
+            template.dump(fp)
+        return Result(job, output, time.time() - start, os.path.getsize(output))
+    except (Exception, SystemExit):
+        return Result(job, seconds=time.time() - start, error=traceback.format_exc())
+    finally:
+        sys.argv = argv
+
+def _render_star(args):
+    return render_job(*args)
+
+def render(jobs, outdir, preload=(), processes=None):
+    """Renders each job into outdir, returning a list of Results in job
+    order.
+
+    The directory of each job is added to sys.path and the preload
+    modules are imported before the worker pool is forked, so the
+    workers share them.
+
+    """
+    if not os.path.isdir(outdir):
+        os.makedirs(outdir)
+    for job in jobs:
+        path = os.path.dirname(os.path.abspath(job.path))
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    for module in preload:
+        importlib.import_module(module)
+
+    processes = min(processes or multiprocessing.cpu_count(), len(jobs)) or 1
+    if processes == 1:
+        return [render_job(job, outdir) for job in jobs]
+    pool = multiprocessing.Pool(processes)
+    try:
+        return pool.map(_render_star, [(job, outdir) for job in jobs], chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+
+def summary(error):
+    """Returns the last line of a formatted traceback, e.g.,
+    'IndexError: list index out of range'.
+
+    """
+    lines = [l for l in error.splitlines() if l.strip()]
+    return lines[-1] if lines else error
+
+def report(results, elapsed, out=sys.stdout):
+    """Writes a per-job timing report.
+    """
+    out.write("%-32s %10s %10s  %s\n"%("stack", "seconds", "bytes", "status"))
+    for r in results:
+        status = "error: " + summary(r.error) if r.error else r.output
+        out.write("%-32s %10.3f %10d  %s\n"%(r.job.name, r.seconds, r.size, status))
+    slowest = max([r.seconds for r in results] or [0.0])
+    out.write("%d stack(s) in %.3fs (slowest %.3fs, sum %.3fs)\n"%(
+        len(results), elapsed, slowest, sum(r.seconds for r in results)))
+    for r in results:
+        if r.error:
+            out.write("\n%s (%s) failed:\n%s"%(r.job.name, r.job.path, r.error))
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Render many stratiform templates.")
+    parser.add_argument('jobs', nargs='+', metavar='JOB',
+                        help='template script and its arguments, e.g. "example/api.py dev"')
+    parser.add_argument('-o', '--outdir', default='.',
+                        help='directory for the rendered JSON (default: .)')
+    parser.add_argument('-p', '--preload', action='append', default=[], metavar='MODULE',
+                        help='module to import before forking, e.g. common (repeatable)')
+    parser.add_argument('-j', '--processes', type=int, default=None,
+                        help='number of worker processes (default: cpu count)')
+    opts = parser.parse_args(args)
+
+    start = time.time()
+    results = render([Job.parse(j) for j in opts.jobs], opts.outdir,
+                     opts.preload, opts.processes)
+    report(results, time.time() - start)
+    return 1 if any(r.error for r in results) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
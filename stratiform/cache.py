@@ -0,0 +1,127 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import errno, os, tempfile
+
+import stratiform
+from stratiform.utils import Fingerprint
+
+class RenderCache(object):
+    """An on-disk, content-addressed cache of rendered templates.
+
+    Entries are keyed by the Fingerprint of the template object graph
+    and the render options, so a template whose inputs are unchanged
+    is returned from the cache without being serialized. The least
+    recently used entries are evicted once the cache holds more than
+    max_entries entries or max_bytes bytes.
+
+    Use it through Template.to_json(cache=...).
+
+    """
+    SUFFIX = '.json'
+
+    def __init__(self, path, max_entries=1024, max_bytes=None):
+        self.path        = path
+        self.max_entries = max_entries
+        self.max_bytes   = max_bytes
+        self.hits        = 0
+        self.misses      = 0
+        self.evictions   = 0
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+    def key(self, template, indent=2, separators=(',', ': ')):
+        """Returns the cache key for rendering template with the specified
+        options.
+
+        """
+        options = [stratiform.__version__, indent, list(separators)]
+        return Fingerprint().digest([options, template])
+
+    def render(self, template, indent=2, separators=(',', ': ')):
+        """Returns the JSON form of template, from the cache if present.
+        """
+        key = self.key(template, indent, separators)
+        text = self.get(key)
+        if text is None:
+            text = template.to_json(indent=indent, separators=separators)
+            self.put(key, text)
+        return text
+
+    def get(self, key):
+        """Returns the cached text for key, or None on a miss.
+        """
+        entry = self._entry(key)
+        try:
+            with open(entry) as fp:
+                text = fp.read()
+        except IOError as e:
+            if e.errno != errno.ENOENT:
+                raise
+            self.misses += 1
+            return None
+        os.utime(entry, None)
+        self.hits += 1
+        return text
+
+    def put(self, key, text):
+        """Stores text under key, then evicts entries if over the limits.
+        """
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        with os.fdopen(fd, 'w') as fp:
+            fp.write(text)
+        os.rename(tmp, self._entry(key))
+        self.evict()
+
+    def evict(self):
+        """Removes least recently used entries until the cache is within
+        its limits.
+
+        """
+        entries = []
+        for name in os.listdir(self.path):
+            if name.endswith(RenderCache.SUFFIX):
+                st = os.stat(os.path.join(self.path, name))
+                entries.append((st.st_mtime, st.st_size, name))
+        entries.sort()
+        count = len(entries)
+        size  = sum(e[1] for e in entries)
+        for _, esize, name in entries:
+            over_count = self.max_entries is not None and count > self.max_entries
+            over_bytes = self.max_bytes is not None and size > self.max_bytes
+            if not (over_count or over_bytes):
+                break
+            try:
+                os.remove(os.path.join(self.path, name))
+            except OSError as e:
+                if e.errno != errno.ENOENT:
+                    raise
+            count -= 1
+            size  -= esize
+            self.evictions += 1
+
+    def stats(self):
+        """Returns the hit, miss, and eviction counters.
+        """
+        return {'hits'      : self.hits,
+                'misses'    : self.misses,
+                'evictions' : self.evictions}
+
+    def _entry(self, key):
+        return os.path.join(self.path, key + RenderCache.SUFFIX)
+
+#### Public API ####
+render_cache = RenderCache
+
+__all__ = ['render_cache']
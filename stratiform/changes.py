@@ -0,0 +1,211 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Structured differences between templates.
+
+    changes = template.diff(open('previous.json').read())
+    for name in changes.modified['Resources']:
+        for change in changes.modified['Resources'][name]:
+            print change
+
+Each side may be a Template, its JSON text, a file-like object
+holding it, or its parsed form. The entries of each collection
+section are matched by logical ID and compared first by content,
+and only the entries that differ are parsed and compared property by
+property.
+
+Entries of two Templates are compared by their Fingerprint digests,
+which hash each shared subtree once, and entries that are the same
+object, as after copy(template), are equal without being hashed.
+Diffing a template against a modified copy thus takes time
+proportional to the number of changed entries. Entries read from
+JSON are compared by value, so key order does not matter, but true
+and false still differ from 1 and 0.
+
+"""
+
+import json
+
+from collections import OrderedDict as odict
+
+from stratiform.utils import CompactEncoder, Fingerprint, json_form
+
+SECTIONS = ['Parameters', 'Mappings', 'Conditions', 'Resources', 'Outputs']
+
+class Change(object):
+    """A change at path, a tuple of keys and list indexes, from old to
+    new. kind is one of ADDED, REMOVED or MODIFIED; old or new is None
+    when the value was added or removed.
+
+    """
+    ADDED    = 'added'
+    REMOVED  = 'removed'
+    MODIFIED = 'modified'
+
+    def __init__(self, kind, path, old=None, new=None):
+        self.kind = kind
+        self.path = path
+        self.old  = old
+        self.new  = new
+
+    def __str__(self):
+        path = '.'.join(str(p) for p in self.path)
+        if self.kind == Change.ADDED:
+            return "+ %s: %s"%(path, _short(self.new))
+        if self.kind == Change.REMOVED:
+            return "- %s: %s"%(path, _short(self.old))
+        return "~ %s: %s -> %s"%(path, _short(self.old), _short(self.new))
+
+    def __repr__(self):
+        return "Change(%r, %r)"%(self.kind, self.path)
+
+class ChangeSet(object):
+    """The differences between two templates. For each section, added
+    and removed list the logical IDs only in the new or old template,
+    and modified maps the IDs of changed entries to their Changes,
+    with paths relative to the entry. Changes to the other top-level
+    values, e.g., the Description, are listed in other.
+
+    """
+    def __init__(self):
+        self.added    = odict((s, []) for s in SECTIONS)
+        self.removed  = odict((s, []) for s in SECTIONS)
+        self.modified = odict((s, odict()) for s in SECTIONS)
+        self.other    = []
+
+    def __nonzero__(self):
+        return bool(self.other) or any(self.added[s] or self.removed[s] or self.modified[s]
+                                       for s in SECTIONS)
+
+    def __str__(self):
+        lines = [str(c) for c in self.other]
+        for s in SECTIONS:
+            lines.extend("+ %s.%s"%(s, name) for name in self.added[s])
+            lines.extend("- %s.%s"%(s, name) for name in self.removed[s])
+            for name, changes in self.modified[s].iteritems():
+                lines.append("~ %s.%s"%(s, name))
+                lines.extend("    " + str(c) for c in changes)
+        return '\n'.join(lines)
+
+def diff(old, new):
+    """Returns the ChangeSet from the template old to the template new.
+    """
+    from stratiform.templates import shared_fragment
+    old, new = _sections(old), _sections(new)
+    result  = ChangeSet()
+    encoder = CompactEncoder(share=shared_fragment)
+    fingerprint = Fingerprint()
+    for key in _union(old, new):
+        if key in SECTIONS:
+            _diff_section(key, old.get(key) or {}, new.get(key) or {}, result, encoder, fingerprint)
+        elif key not in old:
+            result.other.append(Change(Change.ADDED, (key,), new=_plain(encoder, new[key])))
+        elif key not in new:
+            result.other.append(Change(Change.REMOVED, (key,), old=_plain(encoder, old[key])))
+        else:
+            _diff_values((key,), _plain(encoder, old[key]), _plain(encoder, new[key]), result.other)
+    return result
+
+def _diff_section(section, old, new, result, encoder, fingerprint):
+    for name, value in new.iteritems():
+        previous = old.get(name)
+        if previous is None:
+            result.added[section].append(name)
+        elif previous is value:
+            continue
+        elif hasattr(previous, '__json__') and hasattr(value, '__json__'):
+            if fingerprint.digest(previous) != fingerprint.digest(value):
+                _diff_entry(section, name, _plain(encoder, previous), _plain(encoder, value), result)
+        elif not _identical(_unordered(encoder, previous), _unordered(encoder, value)):
+            _diff_entry(section, name, _plain(encoder, previous), _plain(encoder, value), result)
+    for name in old.iterkeys():
+        if name not in new:
+            result.removed[section].append(name)
+
+def _diff_entry(section, name, old, new, result):
+    changes = []
+    _diff_values((), old, new, changes)
+    if changes:
+        result.modified[section][name] = changes
+
+def _diff_values(path, old, new, changes):
+    if isinstance(old, dict) and isinstance(new, dict):
+        for k in _union(old, new):
+            if k not in old:
+                changes.append(Change(Change.ADDED, path + (k,), new=new[k]))
+            elif k not in new:
+                changes.append(Change(Change.REMOVED, path + (k,), old=old[k]))
+            else:
+                _diff_values(path + (k,), old[k], new[k], changes)
+    elif isinstance(old, list) and isinstance(new, list):
+        for i in xrange(min(len(old), len(new))):
+            _diff_values(path + (i,), old[i], new[i], changes)
+        for i in xrange(len(old), len(new)):
+            changes.append(Change(Change.ADDED, path + (i,), new=new[i]))
+        for i in xrange(len(new), len(old)):
+            changes.append(Change(Change.REMOVED, path + (i,), old=old[i]))
+    elif old != new or isinstance(old, bool) != isinstance(new, bool):
+        changes.append(Change(Change.MODIFIED, path, old, new))
+
+def _identical(old, new):
+    """Returns whether the JSON values old and new are equal, telling
+    true and false from 1 and 0, which Python holds equal.
+
+    """
+    return old == new and _same_types(old, new)
+
+def _same_types(old, new):
+    if isinstance(old, dict):
+        return all(_same_types(v, new[k]) for k, v in old.iteritems())
+    elif isinstance(old, list):
+        return all(_same_types(a, b) for a, b in zip(old, new))
+    return isinstance(old, bool) == isinstance(new, bool)
+
+def _sections(template):
+    """Returns the top-level mapping of template, without serializing
+    the entries of a Template.
+
+    """
+    if hasattr(template, 'read'):
+        template = template.read()
+    if isinstance(template, basestring):
+        return json.loads(template)
+    if hasattr(template, '__json__'):
+        return json_form(template)
+    return template
+
+def _union(old, new):
+    keys = list(new.iterkeys())
+    keys.extend(k for k in old.iterkeys() if k not in new)
+    return keys
+
+def _parse(text):
+    return json.loads(text, object_pairs_hook=odict)
+
+def _plain(encoder, value):
+    if hasattr(value, '__json__'):
+        return _parse(encoder.encode(value))
+    return value
+
+def _unordered(encoder, value):
+    # Parsing without key order is several times faster
+    if hasattr(value, '__json__'):
+        return json.loads(encoder.encode(value))
+    return value
+
+def _short(value, limit=60):
+    text = json.dumps(value, separators=(',', ':'))
+    return text if len(text) <= limit else text[:limit - 3] + '...'
+
+__all__ = ['diff', 'Change', 'ChangeSet']
@@ -0,0 +1,216 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""CIDR block allocation and overlap checks.
+
+    vpc = Allocator(cidr("10.20.0.0/16"))
+    vpc.reserve(cidr("10.20.10.0/24"))             # an existing subnet
+    public  = vpc.allocate_zones(24, [zone_a, zone_b])
+    private = vpc.allocate_zones(22, [zone_a, zone_b])
+
+The allocator is a buddy allocator over the integer form of the
+blocks: free space is kept as aligned blocks in per-prefix sets and
+min-heaps, so allocating the lowest free block or reserving a block
+takes amortized one heap operation or set lookup per prefix length.
+find_overlaps() and aggregate() handle n blocks in O(n log n) with a
+sort and a single sweep.
+
+"""
+
+import heapq
+
+from collections import OrderedDict as odict
+
+from stratiform.common import CIDR
+
+class AllocationError(ValueError):
+    """Raised when a block cannot be allocated or reserved.
+    """
+    pass
+
+class Allocator(object):
+    """Carves non-overlapping blocks out of a parent CIDR block.
+    """
+    def __init__(self, parent):
+        parent.first   # IPv4 blocks only
+        self.parent    = parent
+        self.allocated = []
+        # Free blocks: prefix -> set of network addresses, with a heap
+        # of them for the lowest. Heap entries no longer in the set are
+        # stale, left by reserve(), and are dropped when they surface.
+        self.free  = {parent.prefix: set([parent.network])}
+        self.heaps = {parent.prefix: [parent.network]}
+
+    def allocate(self, prefix):
+        """Returns the lowest free block with the specified prefix.
+        """
+        if prefix < self.parent.prefix or prefix > 32:
+            msg = "cannot allocate a /%d from %s"
+            raise AllocationError(msg%(prefix, self.parent))
+        # Free blocks are disjoint and no two are buddies, so the lowest
+        # free /prefix is the low end of the lowest free block at least
+        # that large.
+        best = None
+        for p in xrange(prefix, self.parent.prefix - 1, -1):
+            network = self._lowest(p)
+            if network is not None and (best is None or network < best[0]):
+                best = (network, p)
+        if best is None:
+            msg = "no free /%d left in %s"
+            raise AllocationError(msg%(prefix, self.parent))
+        network, p = best
+        self._take(network, p)
+        for q in xrange(p + 1, prefix + 1):
+            self._release(network + (1 << (32 - q)), q)
+        return self._record(CIDR.from_int(network, prefix))
+
+    def allocate_many(self, prefix, count):
+        """Returns a list of count free blocks with the specified prefix.
+        """
+        return [self.allocate(prefix) for _ in xrange(count)]
+
+    def allocate_zones(self, prefix, zones, count=1):
+        """Returns an ordered dict of count blocks with the specified
+        prefix for each of zones, allocated round-robin across them.
+
+        """
+        result = odict((z, []) for z in zones)
+        for _ in xrange(count):
+            for z in zones:
+                result[z].append(self.allocate(prefix))
+        return result
+
+    def reserve(self, block):
+        """Marks block, e.g., an existing subnet, as allocated. Raises an
+        AllocationError if any part of it is not free.
+
+        """
+        if block not in self.parent:
+            raise AllocationError("%s is not within %s"%(block, self.parent))
+        # Find the free block that contains it, then split around it
+        for p in xrange(block.prefix, self.parent.prefix - 1, -1):
+            network = block.network & CIDR.mask(p)
+            if network in self.free.get(p, ()):
+                self.free[p].remove(network)
+                for q in xrange(p + 1, block.prefix + 1):
+                    # Release the half of each split not holding block
+                    half = 1 << (32 - q)
+                    network = block.network & CIDR.mask(q)
+                    self._release(network ^ half, q)
+                return self._record(CIDR.from_int(block.network, block.prefix))
+        raise AllocationError("%s overlaps an allocated block"%block)
+
+    def _lowest(self, prefix):
+        """Returns the lowest free network with prefix, or None.
+        """
+        heap, free = self.heaps.get(prefix), self.free.get(prefix)
+        while heap and heap[0] not in free:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def _take(self, network, prefix):
+        # network is the top of its heap, as found by _lowest()
+        heapq.heappop(self.heaps[prefix])
+        self.free[prefix].remove(network)
+
+    def _release(self, network, prefix):
+        self.free.setdefault(prefix, set()).add(network)
+        heapq.heappush(self.heaps.setdefault(prefix, []), network)
+
+    def _record(self, block):
+        self.allocated.append(block)
+        return block
+
+    def available(self):
+        """Returns the number of free addresses.
+        """
+        return sum(len(blocks) << (32 - p) for p, blocks in self.free.iteritems())
+
+def find_overlaps(blocks):
+    """Returns the (earlier, later) pairs of overlapping blocks, where
+    earlier is the block with the lowest address among those that
+    overlap later. Each block overlapping another appears at least
+    once. Runs in O(n log n).
+
+    """
+    result = []
+    cover = None
+    for block in sorted(blocks, key=CIDR.key):
+        if cover is not None and block.first <= cover.last:
+            result.append((cover, block))
+            if block.last > cover.last:
+                cover = block
+        else:
+            cover = block
+    return result
+
+def aggregate(blocks):
+    """Returns the fewest blocks covering exactly the addresses of
+    blocks, in address order. Contained blocks are dropped and
+    adjacent halves of a block are merged into it.
+
+    """
+    merged = []
+    last   = -1
+    for block in sorted(blocks, key=CIDR.key):
+        if block.last <= last:
+            continue
+        network, prefix = block.network, block.prefix
+        # Merge with the top of the stack while it is the other half
+        while merged and prefix > 0 and merged[-1][1] == prefix and \
+              merged[-1][0] == network ^ (1 << (32 - prefix)) and \
+              merged[-1][0] & CIDR.mask(prefix - 1) == merged[-1][0]:
+            network, prefix = merged.pop()[0], prefix - 1
+        merged.append((network, prefix))
+        last = block.last
+    return [CIDR.from_int(network, prefix) for network, prefix in merged]
+
+def check_subnets(template):
+    """Returns a list of error messages for the subnets of template that
+    overlap each other or lie outside their VPC. Blocks that are not
+    literal IPv4 blocks are skipped.
+
+    """
+    from stratiform.ec2 import Subnet, VPC
+
+    errors  = []
+    by_vpc  = odict()
+    for name, resource in template.resources.iteritems():
+        if isinstance(resource, Subnet) and _literal(getattr(resource, 'cidr_block', None)):
+            by_vpc.setdefault(getattr(resource, 'vpc_id', None), []).append(resource)
+    for vpc, subnets in by_vpc.iteritems():
+        if isinstance(vpc, VPC) and _literal(getattr(vpc, 'cidr_block', None)):
+            for s in subnets:
+                if s.cidr_block not in vpc.cidr_block:
+                    errors.append("subnet %s (%s) is outside VPC %s (%s)"%(
+                        s.object_name, s.cidr_block, vpc.object_name, vpc.cidr_block))
+        owners = {}
+        for s in subnets:
+            owners.setdefault(s.cidr_block, []).append(s.object_name)
+        for block, names in owners.iteritems():
+            if len(names) > 1:
+                errors.append("subnets %s share %s"%(', '.join(names), block))
+        for a, b in find_overlaps(owners.keys()):
+            if a != b:
+                errors.append("subnet %s (%s) overlaps %s (%s)"%(
+                    owners[b][0], b, owners[a][0], a))
+    return errors
+
+def _literal(block):
+    return isinstance(block, CIDR) and block.network is not None
+
+#### Public API ####
+allocator = Allocator
+
+__all__ = ['aggregate', 'allocator', 'find_overlaps', 'check_subnets']
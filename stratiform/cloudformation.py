@@ -0,0 +1,33 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+from stratiform.base import prop
+from stratiform.resources import Resource, Tags, resource_constructors
+
+class Stack(Resource):
+    resource_type = 'AWS::CloudFormation::Stack'
+
+    @staticmethod
+    def props():
+        return [prop('NotificationARNs'),
+                prop('Parameters', dict),
+                prop('Tags', Tags),
+                prop('TemplateURL', basestring),
+                prop('TimeoutInMinutes', int)]
+
+# Functional snake_cased form of constructors for public API
+constructors = resource_constructors(__name__, globals())
+globals().update(constructors)
+
+__all__ = sorted(constructors.keys())
@@ -0,0 +1,178 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Compaction of security group rules.
+
+    web = web.ingress("HTTP",     tcp, http,      cidr("10.0.0.0/24"))  \\
+             .ingress("HTTP2",    tcp, http,      cidr("10.0.1.0/24"))  \\
+             .ingress("HTTPAlt",  tcp, port(81),  cidr("10.0.0.0/23"))  \\
+             .compact()
+    # One rule: WebInboundHTTP, tcp 80-81 from 10.0.0.0/23
+
+The rules of a security group only allow traffic, so the group allows
+the union of what its rules match, and any set of rules matching the
+same union is equivalent. coalesce_rules() rewrites the rules that
+differ only in their CIDR block and port range: duplicates and rules
+covered by another rule are dropped, overlapping or adjacent port
+ranges of the same block are joined, and blocks with the same port
+range are aggregated into supernets. The result matches exactly the
+same traffic.
+
+Rules are kept or copied, never modified. A merged rule is a copy of
+the first rule it covers, with that rule's name.
+
+"""
+
+from collections import OrderedDict as odict
+
+from stratiform.cidrs import aggregate
+from stratiform.common import CIDR, IpProtocol, PortRange
+from stratiform.rulecheck import ALL_PROTOCOLS, MAX_PORT, Rule, RuleIndex, _cidr, _protocol
+
+# The properties a rule may set and still be merged with others
+MERGEABLE = frozenset(['cidr_ip', 'ip_protocol', 'port_range', 'group_id', 'object_name'])
+
+def coalesce_rules(rules):
+    """Returns the fewest rules, built from rules, that allow exactly the
+    traffic rules allow. Rules that cannot be merged, e.g., those
+    with a source security group, are returned unchanged, in order.
+
+    """
+    slots  = []
+    groups = odict()
+    for rule in rules:
+        if _merge_key(rule) is None:
+            slots.append(rule)
+            continue
+        if rule.__class__ not in groups:
+            groups[rule.__class__] = []
+            slots.append(rule.__class__)
+        groups[rule.__class__].append(rule)
+    result = []
+    for slot in slots:
+        if slot in groups:
+            result.extend(_coalesce(groups[slot]))
+        else:
+            result.append(slot)
+    return result
+
+def _merge_key(rule):
+    """Returns the (owner, protocol) that rules must share to be merged,
+    or None if rule cannot be merged.
+
+    """
+    # Underscored entries, e.g., the cached JSON form, are not properties
+    if not set(k for k in rule.__dict__ if k[:1] != '_').issubset(MERGEABLE):
+        return None
+    protocol = _protocol(rule, 'ip_protocol')
+    if protocol is None or not _cidr(getattr(rule, 'cidr_ip', None)):
+        return None
+    if protocol in (6, 17):
+        try:
+            int(rule.port_range.from_port), int(rule.port_range.to_port)
+        except (AttributeError, TypeError, ValueError):
+            return None
+    elif protocol != ALL_PROTOCOLS:
+        # E.g., the type and code of ICMP rules, compared as is
+        protocol = (protocol, getattr(rule, 'port_range', None))
+    # Chained rules refer to different copies of their group
+    group = getattr(rule, 'group_id', None)
+    return (getattr(group, 'object_name', group), protocol)
+
+def _bounds(protocol, rule):
+    if protocol in (6, 17):
+        return int(rule.port_range.from_port), int(rule.port_range.to_port)
+    return 0, MAX_PORT
+
+def _boxes(key, rules):
+    """Returns the (lo, hi, CIDR) boxes covering the traffic of rules,
+    which share key, with port ranges joined and blocks aggregated.
+
+    """
+    current = set((_bounds(key[1], r), r.cidr_ip) for r in rules)
+    while True:
+        by_block = odict()
+        for ports, block in current:
+            by_block.setdefault(block, []).append(ports)
+        by_ports = odict()
+        for block, ranges in by_block.iteritems():
+            for ports in _join(ranges):
+                by_ports.setdefault(ports, []).append(block)
+        merged = set((ports, block) for ports, blocks in by_ports.iteritems()
+                                    for block in aggregate(blocks))
+        if merged == current:
+            return [(lo, hi, block) for (lo, hi), block in merged]
+        current = merged
+
+def _join(ranges):
+    joined = []
+    for lo, hi in sorted(ranges):
+        if joined and lo <= joined[-1][1] + 1:
+            joined[-1] = (joined[-1][0], max(hi, joined[-1][1]))
+        else:
+            joined.append((lo, hi))
+    return joined
+
+def _coalesce(rules):
+    by_key = odict()
+    for rule in rules:
+        by_key.setdefault(_merge_key(rule), []).append(rule)
+    boxes = []
+    for key, group in by_key.iteritems():
+        owner, protocol = key
+        boxes.extend((owner, Rule(None, None, protocol, lo, hi, block, 'allow'))
+                     for lo, hi, block in _boxes(key, group))
+    # Keep the boxes not covered by another, visiting wider ones first
+    boxes.sort(key=lambda (owner, box): (box.prefix, box.lo - box.hi, box.protocol != ALL_PROTOCOLS,
+                                         box.network, box.lo))
+    index = {}
+    kept  = []
+    for owner, box in boxes:
+        owned = index.setdefault(owner, RuleIndex())
+        if owned.covering(box, 'allow') is None:
+            box.name = len(kept)
+            owned.add(box)
+            kept.append(box)
+    # Each rule claims a box holding it, preferring one of its own
+    # protocol. Every rule lies in a claimed box, so the claimed
+    # boxes allow exactly the same traffic.
+    claims = {}
+    for exact in (True, False):
+        for i, rule in enumerate(rules):
+            owner, protocol = _merge_key(rule)
+            lo, hi = _bounds(protocol, rule)
+            probe = Rule(None, None, protocol, lo, hi, rule.cidr_ip, 'allow')
+            b = index[owner].covering(probe, 'allow', exact)
+            if b is not None and b not in claims:
+                claims[b] = i
+    return [_emit(rules[i], kept[b]) for b, i in sorted(claims.iteritems(), key=lambda (b, i): i)]
+
+def _emit(rule, box):
+    """Returns rule if it matches exactly box, or else a copy of rule
+    that does.
+
+    """
+    protocol = _merge_key(rule)[1]
+    block = rule.cidr_ip
+    if (protocol, _bounds(protocol, rule), block.network, block.prefix) == \
+       (box.protocol, (box.lo, box.hi), box.network, box.prefix):
+        return rule
+    kwargs = {'cidr_ip': CIDR.from_int(box.network, box.prefix)}
+    if box.protocol != protocol:
+        kwargs['ip_protocol'] = IpProtocol.all
+    elif protocol in (6, 17):
+        kwargs['port_range'] = PortRange(str(box.lo) if box.lo == box.hi else "%d-%d"%(box.lo, box.hi))
+    return rule(**kwargs)
+
+__all__ = ['coalesce_rules']
@@ -12,7 +12,7 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
-import re
+import re, weakref
 
 from stratiform.base import AWSObject, prop
 from stratiform.utils import Wrapper, ListWrapper
@@ -21,7 +21,109 @@ class AvailabilityZone(Wrapper):
     pass
 
 class CIDR(Wrapper):
-    pass
+    """An IPv4 CIDR block. The network address and prefix length are
+    parsed once and stored as integers, for arithmetic and overlap
+    checks; the block serializes as the string it was created from.
+
+    A CIDR wrapping anything other than an IPv4 block string, e.g., a
+    parameter reference, has network and prefix None and does not
+    support arithmetic.
+
+    """
+    __slots__ = ('network', 'prefix')
+
+    _pattern = re.compile(r'^(\d{1,3})\.(\d{1,3})\.(\d{1,3})\.(\d{1,3})/(\d{1,2})$')
+
+    def __init__(self, wrapped):
+        if hasattr(self, 'prefix'):
+            return
+        super(CIDR, self).__init__(wrapped)
+        self.network = self.prefix = None
+        match = isinstance(wrapped, basestring) and CIDR._pattern.match(wrapped)
+        if match:
+            octets = [int(g) for g in match.groups()[:4]]
+            prefix = int(match.group(5))
+            if max(octets) < 256 and prefix <= 32:
+                address = (octets[0] << 24) | (octets[1] << 16) | (octets[2] << 8) | octets[3]
+                self.network = address & CIDR.mask(prefix)
+                self.prefix  = prefix
+
+    @staticmethod
+    def mask(prefix):
+        """Returns the netmask of prefix as an integer.
+        """
+        return (0xffffffff << (32 - prefix)) & 0xffffffff
+
+    @staticmethod
+    def from_int(network, prefix):
+        """Returns the CIDR for the integer network address and prefix.
+        """
+        octets = [(network >> shift) & 0xff for shift in (24, 16, 8, 0)]
+        return CIDR("%d.%d.%d.%d/%d"%(tuple(octets) + (prefix,)))
+
+    def _check(self):
+        if self.network is None:
+            raise ValueError("'%s' is not an IPv4 CIDR block"%(self.wrapped,))
+
+    @property
+    def first(self):
+        """The first address of the block, as an integer.
+        """
+        self._check()
+        return self.network
+
+    @property
+    def last(self):
+        """The last address of the block, as an integer.
+        """
+        self._check()
+        return self.network | (~CIDR.mask(self.prefix) & 0xffffffff)
+
+    @property
+    def size(self):
+        self._check()
+        return 1 << (32 - self.prefix)
+
+    def __contains__(self, other):
+        """Returns whether the CIDR other lies entirely within this block.
+        """
+        return self.first <= other.first and other.last <= self.last
+
+    def overlaps(self, other):
+        return self.first <= other.last and other.first <= self.last
+
+    def subnets(self, prefix):
+        """Yields the blocks with the longer prefix that make up this one,
+        in address order.
+
+        """
+        self._check()
+        if not self.prefix <= prefix <= 32:
+            raise ValueError("cannot split a /%d into /%d blocks"%(self.prefix, prefix))
+        step = 1 << (32 - prefix)
+        for network in xrange(self.network, self.last + 1, step):
+            yield CIDR.from_int(network, prefix)
+
+    def supernet(self, prefix=None):
+        """Returns the enclosing block with the specified shorter prefix,
+        by default one bit shorter.
+
+        """
+        self._check()
+        prefix = self.prefix - 1 if prefix is None else prefix
+        if not 0 <= prefix <= self.prefix:
+            raise ValueError("/%d is not a supernet of a /%d"%(prefix, self.prefix))
+        return CIDR.from_int(self.network & CIDR.mask(prefix), prefix)
+
+    def key(self):
+        """Returns a sort key ordering blocks by address and then by size,
+        largest first.
+
+        """
+        return (self.first, -self.size)
+
+    def __repr__(self):
+        return "CIDR(%r)"%(self.wrapped,)
 CIDR.all = CIDR("0.0.0.0/0")
 
 class DomainName(Wrapper):
@@ -39,12 +141,30 @@ class IpAddress(Wrapper):
 IpAddress.localhost = IpAddress('127.0.0.1')
 
 class PortRange(AWSObject):
+    """A range of ports. Ranges are interned by their string form, so
+    port(443) always returns the same object.
+
+    """
+    _interned = weakref.WeakValueDictionary()
+
     @staticmethod
     def props():
         return [prop('From', attr='from_port'),
                 prop('To', attr='to_port')]
 
+    def __new__(cls, ports=None):
+        if ports is None:
+            return super(PortRange, cls).__new__(cls)
+        key = (cls, str(ports))
+        obj = PortRange._interned.get(key)
+        if obj is None:
+            obj = super(PortRange, cls).__new__(cls)
+            PortRange._interned[key] = obj
+        return obj
+
     def __init__(self, ports):
+        if 'from_port' in self.__dict__:
+            return
         match = re.compile(r'^(\d+)(?:-+(\d+))?$').match(str(ports))
         from_port = match.groups()[0]
         to_port   = match.groups()[1] or from_port
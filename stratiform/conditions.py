@@ -45,17 +45,10 @@ class Conditionable(object):
     """Mixin for AWSObject types that can accept a condition parameter.
 
     """
-    def __attrs__(self):
-        sattrs = super(Conditionable, self).__attrs__()
-        return sattrs + ['condition']
-
-    def arg_names(self):
-        snames = super(Conditionable, self).arg_names()
-        return snames + ['condition']
-
-    def arg_types(self):
-        stypes = super(Conditionable, self).arg_types()
-        return stypes + [Condition]
+    @classmethod
+    def __compile_schema__(cls):
+        schema = super(Conditionable, cls).__compile_schema__()
+        return schema.extend(args=[('condition', Condition)])
 
     def __json__(self):
         if hasattr(self, 'condition'):
@@ -12,7 +12,7 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
-import wrapt
+import functools, wrapt
 
 from stratiform.utils import class_name
 
@@ -34,37 +34,85 @@ def named_args(func, self, args, kwargs):
         kwargs[k] = v
     return func(**kwargs)
 
-@wrapt.decorator
-def typed_dispatch(func, self, args, kwargs):
+class DispatchTable(object):
+    """Maps the concrete type of a positional argument to the names of the
+    declared (name, type) pairs it matches.
+
+    The table is filled lazily. The first argument of a given
+    concrete type is checked against every declared type; the
+    matches are then cached, so later arguments of that type are
+    bound with a single dict lookup.
+
+    """
+    def __init__(self, names, types):
+        self.names = names
+        self.types = types
+        self.pairs = zip(names, types)
+        self.table = {}
+
+    def bind(self, args, kwargs, cls_name, func_name):
+        """Adds each positional arg to kwargs under the name its type
+        matches. Raises a TypeError if an arg matches no name, more than
+        one name, or a name already in kwargs.
+
+        """
+        if len(args) > len(self.types):
+            msg = "%s.%s() takes at most %d arguments(s) (%d given)"
+            raise TypeError(msg%(cls_name, func_name, len(self.types), len(args)))
+        for v in args:
+            found = self.matches(v)
+            if not found:
+                msg = "%s.%s() got argument of unexpected type '%s'"
+                raise TypeError(msg%(cls_name, func_name, class_name(v)))
+            k = found[0]
+            if k in kwargs:
+                msg = "%s() got multiple values for keyword argument '%s'"
+                raise TypeError(msg%(func_name, k))
+            if len(found) > 1:
+                msg = "%s() got ambigious argument. Matches both '%s' and '%s'"
+                raise TypeError(msg%(func_name, k, found[1]))
+            kwargs[k] = v
+        return kwargs
+
+    def matches(self, value):
+        try:
+            return self.table[value.__class__]
+        except KeyError:
+            found = tuple(k for k, t in self.pairs if isinstance(value, t))
+            self.table[value.__class__] = found
+            return found
+
+# Dispatch tables, keyed by class
+_tables = {}
+
+def dispatch_table(obj):
+    """Returns the dispatch table for the class of obj, (re)building it if
+    the declared argument types have changed.
+
+    """
+    cls   = obj.__class__
+    types = obj.arg_types()
+    table = _tables.get(cls)
+    if table is None or (table.types is not types and table.types != types):
+        names = obj.arg_names()
+        if len(types) != len(names):
+            msg = "%s must declare same number of types (%d given) and names (%d given) for dispatch"
+            raise TypeError(msg%(class_name(obj), len(types), len(names)))
+        table = DispatchTable(names, types)
+        _tables[cls] = table
+    return table
+
+def typed_dispatch(func):
     """A decorator that converts positional args to keyword args before
     dispatching the method. Positional args are assigned to names
     based on their types, not their positions.  Types and names are
-    retrieved from the passed instance via the _arg_types(self) and
-    _arg_names(self) instance methods.
+    retrieved from the passed instance via the arg_types(self) and
+    arg_names(self) instance methods.
 
     """
-    types = self.arg_types()
-    names = self.arg_names()
-    if len(types) != len(names):
-        msg = "%s must declare same number of types (%d given) and names (%d given) for dispatch"
-        raise TypeError(msg%(class_name(self), len(types), len(names)))
-    if len(args) > len(types):
-        msg = "%s.%s() takes at most %d arguments(s) (%d given)"
-        raise TypeError(msg%(class_name(func.im_self), func.__name__, len(types), len(args)))
-    posargs = []
-    for v in args:
-        found_key = None
-        for k, t in zip(names, types):
-            if isinstance(v, t):
-                if found_key != None:
-                    msg = "%s() got ambigious argument. Matches both '%s' and '%s'"
-                    raise TypeError(msg%(func.__name__, found_key, k))
-                if k in kwargs:
-                    msg = "%s() got multiple values for keyword argument '%s'"
-                    raise TypeError(msg%(func.__name__, k))
-                found_key = k
-                kwargs[k] = v
-        if found_key == None:
-            msg = "%s.%s() got argument of unexpected type '%s'"
-            raise TypeError(msg%(class_name(func.im_self), func.__name__, class_name(v)))
-    return func(*posargs, **kwargs)
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        dispatch_table(self).bind(args, kwargs, class_name(self), func.__name__)
+        return func(self, **kwargs)
+    wrapper.__wrapped__ = func
+    return wrapper
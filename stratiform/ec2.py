@@ -16,9 +16,11 @@ from copy import copy
 
 from stratiform.base import AWSObject, prop
 from stratiform.common import AvailabilityZone, CIDR, DomainName, PortRange, IpAddress, IpProtocol
-from stratiform.utils import Wrapper, ListWrapper, snake_case, super_copy
+from stratiform.utils import ConsList, Wrapper, ListWrapper, super_copy
 
-from stratiform.resources import Resource, Tags
+from stratiform.coalesce import coalesce_rules
+from stratiform.resources import Resource, Tags, resource_constructors
+from stratiform.rules import RuleTable
 
 ################################ Custom Types ################################
 class AclAction(Wrapper):
@@ -184,17 +186,10 @@ class InternetGateway(Resource):
     def props():
         return [prop('Tags', Tags)]
 
-    def __attrs__(self):
-        sattrs = super(InternetGateway, self).__attrs__()
-        return sattrs + ['vpc']
-
-    def arg_names(self):
-        sarg_names = super(InternetGateway, self).arg_names()
-        return sarg_names + ['vpc']
-
-    def arg_types(self):
-        sarg_types = super(InternetGateway, self).arg_types()
-        return sarg_types + [VPC]
+    @classmethod
+    def __compile_schema__(cls):
+        schema = super(InternetGateway, cls).__compile_schema__()
+        return schema.extend(args=[('vpc', VPC)])
 
     def siblings(self):
         siblings = super(InternetGateway, self).siblings()
@@ -225,10 +220,8 @@ class NetworkAcl(Resource):
                 prop('Tags', Tags)]
 
     def entry(self, *args, **kwargs):
-        result = copy(self)
         kwargs['network_acl_id'] = self
-        result._siblings.append(network_acl_entry(*args, **kwargs))
-        return result
+        return self.with_sibling(network_acl_entry(*args, **kwargs))
 
     def ingress(self, *args, **kwargs):
         kwargs['egress'] = False
@@ -269,6 +262,48 @@ class NetworkAcl(Resource):
         args[0] = self.object_name + action.title() + kind.title() + args[0]
         return args
 
+    def rules(self):
+        '''Returns an empty NetworkAclRules table for this ACL, for
+        entries too numerous to chain.
+
+        '''
+        return NetworkAclRules(self)
+
+class NetworkAclRules(RuleTable):
+    '''A columnar table of the entries of a NetworkAcl. The methods take
+    the same arguments as those of NetworkAcl, but append to the
+    table in place instead of returning a new ACL.
+
+    '''
+    owner_attr = 'network_acl_id'
+
+    def entry(self, name, *args, **kwargs):
+        return self.append(0, name, *args, **kwargs)
+
+    def ingress(self, name, *args, **kwargs):
+        kwargs['egress'] = False
+        return self.entry(name, *args, **kwargs)
+
+    def allow_ingress(self, name, *args, **kwargs):
+        kwargs['rule_action'] = AclAction.allow
+        return self.ingress(self.owner.object_name + "AllowIngress" + name, *args, **kwargs)
+
+    def deny_ingress(self, name, *args, **kwargs):
+        kwargs['rule_action'] = AclAction.deny
+        return self.ingress(self.owner.object_name + "DenyIngress" + name, *args, **kwargs)
+
+    def egress(self, name, *args, **kwargs):
+        kwargs['egress'] = True
+        return self.entry(name, *args, **kwargs)
+
+    def allow_egress(self, name, *args, **kwargs):
+        kwargs['rule_action'] = AclAction.allow
+        return self.egress(self.owner.object_name + "AllowEgress" + name, *args, **kwargs)
+
+    def deny_egress(self, name, *args, **kwargs):
+        kwargs['rule_action'] = AclAction.deny
+        return self.egress(self.owner.object_name + "DenyEgress" + name, *args, **kwargs)
+
 class NetworkAclEntry(Resource):
     resource_type = 'AWS::EC2::NetworkAclEntry'
 
@@ -327,17 +362,10 @@ class RouteTable(Resource):
         return [prop('VpcId', VPC),
                 prop('Tags', Tags)]
 
-    def __attrs__(self):
-        sattrs = super(RouteTable, self).__attrs__()
-        return sattrs + ['subnet']
-
-    def arg_names(self):
-        sarg_names = super(RouteTable, self).arg_names()
-        return sarg_names + ['subnet']
-
-    def arg_types(self):
-        sarg_types = super(RouteTable, self).arg_types()
-        return sarg_types + [Subnet]
+    @classmethod
+    def __compile_schema__(cls):
+        schema = super(RouteTable, cls).__compile_schema__()
+        return schema.extend(args=[('subnet', Subnet)])
 
     def siblings(self):
         siblings = super(RouteTable, self).siblings()
@@ -361,10 +389,8 @@ class RouteTable(Resource):
         return [association]
 
     def route(self, *args, **kwargs):
-        result = copy(self)
         kwargs['route_table_id'] = self
-        result._siblings.append(Route(*args, **kwargs))
-        return result
+        return self.with_sibling(Route(*args, **kwargs))
 
 class SecurityGroup(Resource):
     resource_type = 'AWS::EC2::SecurityGroup'
@@ -378,20 +404,16 @@ class SecurityGroup(Resource):
                 prop('Tags', Tags)]
 
     def egress(self, *args, **kwargs):
-        result = copy(self)
         args = self.prefix_name_arg("Outbound", args)
         args, kwargs = SecurityGroup.name_sg_arg('destination_security_group_id', args, kwargs)
         kwargs['group_id'] = self
-        result._siblings.append(security_group_egress(*args, **kwargs))
-        return result
+        return self.with_sibling(security_group_egress(*args, **kwargs))
 
     def ingress(self, *args, **kwargs):
-        result = copy(self)
         args = self.prefix_name_arg("Inbound", args)
         args, kwargs = SecurityGroup.name_sg_arg('source_security_group_id', args, kwargs)
         kwargs['group_id'] = self
-        result._siblings.append(security_group_ingress(*args, **kwargs))
-        return result
+        return self.with_sibling(security_group_ingress(*args, **kwargs))
 
     def prefix_name_arg(self, kind, args):
         '''Adds a prefix consisting of the group name and the direction to the
@@ -420,6 +442,46 @@ class SecurityGroup(Resource):
             args.remove(sg)
         return args, kwargs
 
+    def compact(self):
+        '''Returns a copy of this group with its ingress and egress rules,
+        both siblings and inline, replaced by the fewest rules that
+        allow the same traffic. See coalesce.coalesce_rules().
+
+        '''
+        result = copy(self)
+        result._siblings = ConsList.EMPTY
+        for sibling in coalesce_rules(self.siblings()):
+            result._siblings = result._siblings.append(sibling)
+        for attr in ['security_group_ingress', 'security_group_egress']:
+            rules = self.__dict__.get(attr)
+            if rules:
+                setattr(result, attr, coalesce_rules(rules))
+        return result
+
+    def rules(self):
+        '''Returns an empty SecurityGroupRules table for this group, for
+        ingress and egress rules too numerous to chain.
+
+        '''
+        return SecurityGroupRules(self)
+
+class SecurityGroupRules(RuleTable):
+    '''A columnar table of the SecurityGroupIngress and SecurityGroupEgress
+    rules of a SecurityGroup. The methods take the same arguments as
+    those of SecurityGroup, but append to the table in place instead
+    of returning a new group.
+
+    '''
+    owner_attr = 'group_id'
+
+    def ingress(self, name, *args, **kwargs):
+        args, kwargs = SecurityGroup.name_sg_arg('source_security_group_id', list(args), kwargs)
+        return self.append(0, self.owner.object_name + "Inbound" + name, *args, **kwargs)
+
+    def egress(self, name, *args, **kwargs):
+        args, kwargs = SecurityGroup.name_sg_arg('destination_security_group_id', list(args), kwargs)
+        return self.append(1, self.owner.object_name + "Outbound" + name, *args, **kwargs)
+
 class SecurityGroupEgress(Resource):
     resource_type = 'AWS::EC2::SecurityGroupEgress'
 
@@ -511,17 +573,10 @@ class VPC(Resource):
                 prop('InstanceTenancy', VPC.Tenancy),
                 prop('Tags', Tags)]
 
-    def __attrs__(self):
-        sattrs = super(VPC, self).__attrs__()
-        return sattrs + ['dhcp_options']
-
-    def arg_names(self):
-        sarg_names = super(VPC, self).arg_names()
-        return sarg_names + ['dhcp_options']
-
-    def arg_types(self):
-        sarg_types = super(VPC, self).arg_types()
-        return sarg_types + [DHCPOptions]
+    @classmethod
+    def __compile_schema__(cls):
+        schema = super(VPC, cls).__compile_schema__()
+        return schema.extend(args=[('dhcp_options', DHCPOptions)])
 
     def siblings(self):
         siblings = super(VPC, self).siblings()
@@ -605,11 +660,12 @@ class VPNGatewayRoutePropagation(Resource):
         return [prop('RouteTableIds'),
                 prop('VpnGatewayId', VPNGateway)]
 
+NetworkAclRules.entry_classes    = (NetworkAclEntry,)
+SecurityGroupRules.entry_classes = (SecurityGroupIngress, SecurityGroupEgress)
+
 #### Public API ####
-# Generate functional snake_cased form of constructors for public API
-def __is_resource(obj):
-    return issubclass(type(obj), type) and issubclass(obj, Resource)
-constructors = {snake_case(name): obj for (name, obj) in globals().items() if __is_resource(obj)}
+# Functional snake_cased form of constructors for public API
+constructors = resource_constructors(__name__, globals())
 globals().update(constructors)
 
 acl_action          = AclAction
@@ -98,7 +98,7 @@ class Select(Fn):
 
     def __json__(self):
         params = [named_as_ref(self.index),
-                  [named_as_ref(v) for v in self.values]]
+                  [named_as_ref(v) for v in self.objects]]
         return {'Fn::Select' : params}
 
 class ConditionFn(Fn):
@@ -0,0 +1,222 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+from collections import OrderedDict as odict
+
+from stratiform.base import AWSObject, NameableAWSObject, Ref
+from stratiform.conditions import Condition
+from stratiform.functions import Fn, GetAtt, If
+from stratiform.outputs import Output
+from stratiform.parameters import PseudoParameter
+from stratiform.resources import Tags
+from stratiform.rules import RuleTable
+from stratiform.utils import Wrapper
+
+def references(obj):
+    """Yields the (kind, name) of each named object that obj refers to,
+    where kind is one of 'Ref', 'GetAtt', 'If', or 'Condition'. The
+    object graph is walked directly; nothing is serialized.
+
+    """
+    seen = set()
+    stack = list(_children(obj))
+    while stack:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen.add(id(o))
+        if isinstance(o, Ref):
+            o = o.ref
+        if isinstance(o, NameableAWSObject) and hasattr(o, 'object_name'):
+            if not isinstance(o, PseudoParameter):
+                yield 'Ref', o.object_name
+        elif isinstance(o, Condition):
+            yield 'Condition', o.object_name
+        else:
+            if isinstance(o, GetAtt):
+                yield 'GetAtt', o.resource.object_name
+            elif isinstance(o, If):
+                yield 'If', o.condition.object_name
+            stack.extend(_children(o))
+
+def _children(o):
+    """Returns the values directly held by o that may contain references.
+    """
+    if isinstance(o, (list, tuple)):
+        return o
+    elif isinstance(o, dict):
+        return o.values()
+    elif isinstance(o, Tags):
+        return o.tags
+    elif isinstance(o, RuleTable):
+        return o.values()
+    elif isinstance(o, Wrapper):
+        return [o.wrapped]
+    elif isinstance(o, AWSObject):
+        attrs = [p.attr for p in o.__props__()] + ['condition']
+        return [getattr(o, a) for a in attrs if hasattr(o, a)]
+    elif isinstance(o, Condition):
+        return [o.func]
+    elif isinstance(o, GetAtt):
+        return [o.attribute]
+    elif isinstance(o, If):
+        return [o.true_value, o.false_value]
+    elif isinstance(o, Fn):
+        return vars(o).values()
+    return []
+
+class DependencyGraph(object):
+    """An index of the references between the named objects of a
+    template, maintained incrementally as objects are added.
+
+    Nodes are logical names. Each edge records the kinds of reference
+    ('Ref', 'GetAtt', 'If', 'Condition') from an object to another
+    named object. Pseudo parameters are not recorded.
+
+    Outputs may share the logical name of a resource, e.g., the one
+    they export, and nothing can refer to them, so they are kept in
+    outputs and output_edges instead of the nodes.
+
+    """
+    def __init__(self):
+        self.nodes   = odict()
+        self.edges   = {}
+        self.reverse = {}
+        self.outputs      = odict()
+        self.output_edges = {}
+
+    def __copy__(self):
+        result = DependencyGraph()
+        result.nodes   = odict(self.nodes)
+        result.edges   = dict((k, dict((t, set(s)) for t, s in v.iteritems()))
+                              for k, v in self.edges.iteritems())
+        result.reverse = dict((k, set(v)) for k, v in self.reverse.iteritems())
+        result.outputs      = odict(self.outputs)
+        result.output_edges = dict((k, dict((t, set(s)) for t, s in v.iteritems()))
+                                   for k, v in self.output_edges.iteritems())
+        return result
+
+    def add(self, name, obj):
+        """Records obj under name and indexes its outgoing references,
+        replacing any object of the same kind (output or not)
+        previously recorded under name.
+
+        """
+        out = {}
+        for kind, target in references(obj):
+            out.setdefault(target, set()).add(kind)
+        if isinstance(obj, Output):
+            self.outputs[name] = obj
+            self.output_edges[name] = out
+            return
+        self.remove(name)
+        self.nodes[name] = obj
+        for target in out:
+            self.reverse.setdefault(target, set()).add(name)
+        self.edges[name] = out
+
+    def remove(self, name, output=False):
+        """Removes the object recorded under name, or the output if
+        output is true, and its outgoing edges.
+
+        """
+        if output:
+            self.outputs.pop(name, None)
+            self.output_edges.pop(name, None)
+            return
+        if name not in self.nodes:
+            return
+        del self.nodes[name]
+        for target in self.edges.pop(name, {}):
+            sources = self.reverse.get(target)
+            sources.discard(name)
+            if not sources:
+                del self.reverse[target]
+
+    def dependencies(self, name):
+        """Returns the names that name, or the Output object, refers to.
+        """
+        return set(self._out(name))
+
+    def dependents(self, name):
+        """Returns the names that refer to name.
+        """
+        return set(self.reverse.get(_name(name), ()))
+
+    def edge_kinds(self, source, target):
+        """Returns the kinds of reference from source, a name or an
+        Output object, to target.
+
+        """
+        return set(self._out(source).get(_name(target), ()))
+
+    def _out(self, source):
+        if isinstance(source, Output):
+            return self.output_edges.get(source.object_name, {})
+        return self.edges.get(_name(source), {})
+
+    def topological_order(self):
+        """Returns the recorded names ordered so that every name follows
+        the names it depends on. References to names not in the graph
+        are ignored. Raises a ValueError if the graph has a cycle.
+
+        """
+        indegree = odict((n, 0) for n in self.nodes)
+        for name, out in self.edges.iteritems():
+            indegree[name] = sum(1 for t in out if t in self.nodes)
+        ready = [n for n, d in indegree.iteritems() if d == 0]
+        order = []
+        while ready:
+            n = ready.pop()
+            order.append(n)
+            for dependent in self.reverse.get(n, ()):
+                indegree[dependent] -= 1
+                if indegree[dependent] == 0:
+                    ready.append(dependent)
+        if len(order) != len(self.nodes):
+            raise ValueError("dependency cycle: %s"%' -> '.join(self.find_cycle()))
+        return order
+
+    def find_cycle(self):
+        """Returns a list of names forming a dependency cycle, with the
+        first name repeated at the end, or None if there is no cycle.
+
+        """
+        WHITE, GREY, BLACK = 0, 1, 2
+        color = dict((n, WHITE) for n in self.nodes)
+        for root in self.nodes:
+            if color[root] != WHITE:
+                continue
+            path  = [root]
+            stack = [iter(self._targets(root))]
+            color[root] = GREY
+            while stack:
+                for t in stack[-1]:
+                    if color[t] == GREY:
+                        return path[path.index(t):] + [t]
+                    if color[t] == WHITE:
+                        color[t] = GREY
+                        path.append(t)
+                        stack.append(iter(self._targets(t)))
+                        break
+                else:
+                    color[path.pop()] = BLACK
+                    stack.pop()
+        return None
+
+    def _targets(self, name):
+        return [t for t in self.edges.get(name, ()) if t in self.nodes]
+
+def _name(obj):
+    return getattr(obj, 'object_name', obj)
@@ -13,8 +13,8 @@
 #    limitations under the License.
 
 from stratiform.base import AWSObject, prop
-from stratiform.utils import Wrapper, snake_case
-from stratiform.resources import Resource
+from stratiform.utils import Wrapper
+from stratiform.resources import Resource, resource_constructors
 
 ################################ Custom Types ################################
 class KeyStatus(Wrapper):
@@ -99,10 +99,8 @@ class UserToGroupAddition(Resource):
                 prop('Users')]
 
 #### Public API ####
-# Generate functional snake_cased form of constructors for public API
-def __is_resource(obj):
-    return issubclass(type(obj), type) and issubclass(obj, Resource)
-constructors = {snake_case(name): obj for (name, obj) in globals().items() if __is_resource(obj)}
+# Functional snake_cased form of constructors for public API
+constructors = resource_constructors(__name__, globals())
 globals().update(constructors)
 
 key_status   = KeyStatus
@@ -0,0 +1,193 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import errno, hashlib, json, mmap, os, tempfile
+
+import stratiform
+from stratiform.utils import JSONEncoder, json_form
+
+class IncrementalRenderer(object):
+    """Renders templates to the file path, reusing the unchanged parts of
+    the previous render.
+
+    A sidecar index file records the digest and the byte span of each
+    entry of the collection sections (e.g., each resource) in the
+    previous output. On the next render, an entry whose digest is
+    unchanged is copied from the previous output through a memory map
+    instead of being serialized again. The output is identical to
+    Template.to_json() with the same indent and separators.
+
+    The digest is the SHA-1 of the compact JSON form of the entry,
+    which the C encoder produces several times faster than the
+    indented form.
+
+    Use it through Template.dump_incremental(path, ...).
+
+    """
+    INDEX_SUFFIX = '.index'
+    SECTIONS     = ['Parameters', 'Mappings', 'Conditions', 'Resources', 'Outputs']
+
+    def __init__(self, path, indent=2, separators=(',', ': ')):
+        self.path       = path
+        self.index_path = path + IncrementalRenderer.INDEX_SUFFIX
+        self.indent     = indent
+        self.separators = separators
+        self.reused     = 0
+        self.rendered   = 0
+
+    def options(self):
+        return [stratiform.__version__, self.indent, list(self.separators)]
+
+    def render(self, template):
+        """Writes the JSON form of template to path and updates the index.
+        """
+        index = self._load_index()
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as fp:
+                with self._previous(index) as previous:
+                    entries = self._write(template, fp, index, previous)
+            os.rename(tmp, self.path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+        st = os.stat(self.path)
+        self._save_index({'options' : self.options(),
+                          'size'    : st.st_size,
+                          'mtime'   : st.st_mtime,
+                          'entries' : entries})
+
+    def stats(self):
+        """Returns the counts of entries reused and rendered.
+        """
+        return {'reused'   : self.reused,
+                'rendered' : self.rendered}
+
+    def _write(self, template, fp, index, previous):
+        encoder = JSONEncoder(indent=self.indent, separators=self.separators)
+        compact = JSONEncoder(separators=(',', ':'))
+        key     = json.encoder.encode_basestring_ascii
+        item_separator, key_separator = self.separators
+        entries = []
+        out = _Output(fp)
+
+        def newline(level):
+            if self.indent is None:
+                return ''
+            return '\n' + ' ' * (self.indent * level)
+
+        def fragment(value, level, text=None):
+            # JSON strings hold no raw newlines, so indenting every line
+            # of a nested value matches the encoder
+            if text is None or self.indent is not None or self.separators != (',', ':'):
+                text = encoder.encode(value)
+            return text if self.indent is None else text.replace('\n', newline(level))
+
+        out.write('{')
+        for i, (section, value) in enumerate(json_form(template).iteritems()):
+            out.write((item_separator if i else '') + newline(1) + key(section) + key_separator)
+            if section not in IncrementalRenderer.SECTIONS or not value:
+                out.write(fragment(value, 1))
+                continue
+            out.write('{')
+            for j, (name, entry) in enumerate(value.iteritems()):
+                out.write((item_separator if j else '') + newline(2))
+                text   = compact.encode(entry)
+                digest = hashlib.sha1(text).hexdigest()
+                start  = out.offset
+                span   = index.get((section, name))
+                if previous is not None and span is not None and span[0] == digest:
+                    out.write(previous[span[1]:span[2]])
+                    self.reused += 1
+                else:
+                    out.write(key(name) + key_separator + fragment(entry, 2, text))
+                    self.rendered += 1
+                entries.append([section, name, digest, start, out.offset])
+            out.write(newline(1) + '}')
+        out.write(newline(0) + '}')
+        out.flush()
+        return entries
+
+    def _load_index(self):
+        """Returns the (section, name) -> (digest, start, end) spans of the
+        previous output, or an empty dict if it cannot be reused.
+
+        """
+        try:
+            with open(self.index_path) as fp:
+                data = json.load(fp)
+            st = os.stat(self.path)
+        except (IOError, OSError) as e:
+            if e.errno != errno.ENOENT:
+                raise
+            return {}
+        except ValueError:
+            return {}
+        if data.get('options') != self.options() or data.get('size') != st.st_size or \
+           data.get('mtime') != st.st_mtime:
+            return {}
+        return dict(((s, n), (d, start, end)) for s, n, d, start, end in data['entries'])
+
+    def _save_index(self, data):
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.index_path)), suffix='.tmp')
+        with os.fdopen(fd, 'w') as fp:
+            json.dump(data, fp, separators=(',', ':'))
+        os.rename(tmp, self.index_path)
+
+    def _previous(self, index):
+        if not index:
+            return _Mapping(None)
+        fp = open(self.path, 'rb')
+        try:
+            return _Mapping(mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ))
+        finally:
+            fp.close()
+
+class _Mapping(object):
+    # A context manager closing the memory map, if any, on exit
+    def __init__(self, mapped):
+        self.mapped = mapped
+
+    def __enter__(self):
+        return self.mapped
+
+    def __exit__(self, *exc):
+        if self.mapped is not None:
+            self.mapped.close()
+
+class _Output(object):
+    # A file-like object counting the bytes written, with buffering
+    def __init__(self, fp, buffer_size=64 * 1024):
+        self.fp     = fp
+        self.offset = 0
+        self.chunks = []
+        self.size   = 0
+        self.buffer_size = buffer_size
+
+    def write(self, text):
+        self.chunks.append(text)
+        self.size   += len(text)
+        self.offset += len(text)
+        if self.size >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        self.fp.write(''.join(self.chunks))
+        self.chunks = []
+        self.size   = 0
+
+#### Public API ####
+incremental_renderer = IncrementalRenderer
+
+__all__ = ['incremental_renderer']
@@ -0,0 +1,406 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Loads CloudFormation JSON templates as stratiform objects.
+
+    with open('legacy.json') as fp:
+        t = load(fp)
+    t.resources['WebServer'].instance_type
+
+Resources are rebuilt as instances of the class registered for their
+Type, parameters as Parameters, conditions as Conditions and outputs
+as Outputs. Ref and Fn::* nodes become the referenced objects, Refs,
+and the functions of stratiform.functions.
+
+Each rebuilt object is checked against the JSON it came from. An
+entry that its class cannot reproduce, e.g., a resource with a
+DependsOn or a property the class lacks, and a resource of an
+unregistered type, are loaded as a RawResource, RawParameter or
+RawOutput holding the converted JSON, so to_json() reproduces every
+entry, up to the order of keys. Mappings are kept as plain dicts. A
+template rendered by stratiform loads back to an identical rendering.
+
+The input is read twice in chunks: once to create an empty object
+for each logical ID, so references can be resolved in any order,
+and once to fill them in. Only one entry is parsed at a time.
+
+"""
+
+import json, re
+
+from cStringIO import StringIO
+from collections import OrderedDict as odict
+
+from stratiform.base import Ref, prop
+from stratiform.common import PortRange
+from stratiform.conditions import Condition
+from stratiform import functions, parameters, registry
+from stratiform.outputs import Output
+from stratiform.parameters import Parameter, PseudoParameter
+from stratiform.resources import DeletionPolicy, Resource
+from stratiform.templates import Template, Version
+from stratiform.utils import JSONEncoder, Wrapper
+
+class Raw(object):
+    """Mixin for entries loaded as their converted JSON form.
+    """
+    @staticmethod
+    def props():
+        return [prop('Data', attr='data')]
+
+    def __json__(self):
+        return self.data
+
+class RawResource(Raw, Resource):
+    """A resource loaded as its converted JSON form.
+    """
+    @property
+    def resource_type(self):
+        return self.data.get('Type')
+
+class RawParameter(Raw, Parameter):
+    """A parameter loaded as its converted JSON form.
+    """
+    pass
+
+class RawOutput(Raw, Output):
+    """An output loaded as its converted JSON form.
+    """
+    pass
+
+PSEUDO_PARAMETERS = dict((p.object_name, p) for p in
+                         [parameters.AccountId, parameters.NotificationArns,
+                          parameters.NoValue, parameters.Region,
+                          parameters.StackId, parameters.StackName])
+
+def load(fp):
+    """Returns the Template read from the seekable file-like object fp.
+    """
+    loader = Loader(fp)
+    return loader.load()
+
+def loads(text):
+    """Returns the Template parsed from the JSON text.
+    """
+    return load(StringIO(text))
+
+class Loader(object):
+    """Rebuilds a Template from a seekable file-like object, read in
+    chunks of chunk_size bytes.
+
+    """
+    def __init__(self, fp, chunk_size=64 * 1024):
+        self.fp         = fp
+        self.chunk_size = chunk_size
+        self.objects    = {}
+        self.conditions = {}
+
+    def load(self):
+        start = self.fp.tell()
+        self._declare()
+        self.fp.seek(start)
+        return self._build()
+
+    def _declare(self):
+        """Creates an empty object for each logical ID.
+        """
+        reader = Reader(self.fp, json.JSONDecoder(), self.chunk_size)
+        for key in reader.members():
+            if key not in ('Parameters', 'Conditions', 'Resources'):
+                reader.skip()
+                continue
+            for name in reader.members():
+                data = reader.value()
+                if key == 'Parameters':
+                    self.objects[name] = _shell(Parameter, name)
+                elif key == 'Conditions':
+                    condition = Condition.__new__(Condition)
+                    condition.object_name = _str(name)
+                    self.conditions[name] = condition
+                else:
+                    if not isinstance(data, dict) or 'Type' not in data:
+                        raise ValueError("resource '%s' has no Type"%name)
+                    cls = registry.lookup(data['Type'], RawResource)
+                    self.objects[name] = _shell(cls, name)
+
+    def _build(self):
+        reader = Reader(self.fp, json.JSONDecoder(object_pairs_hook=odict), self.chunk_size)
+        template = Template()
+        for key in reader.members():
+            if key == 'Description':
+                template.description = _str(reader.value())
+            elif key == 'AWSTemplateFormatVersion':
+                template.aws_template_format_version = Version(_str(reader.value()))
+            elif key == 'Mappings':
+                for name in reader.members():
+                    name, mapping = _str(name), reader.value()
+                    template.mappings[name] = mapping
+                    template.graph.add(name, mapping)
+            elif key in ('Parameters', 'Conditions', 'Resources', 'Outputs'):
+                for name in reader.members():
+                    template.add(self._entry(key, name, reader.value()))
+            else:
+                raise ValueError("unsupported template section '%s'"%key)
+        return template
+
+    def _entry(self, section, name, data):
+        if section == 'Conditions':
+            condition = self.conditions[name]
+            condition.func = self.convert(data)
+            return condition
+        if section == 'Outputs':
+            obj = _shell(Output, name)
+        else:
+            obj = self.objects[name]
+        if not isinstance(obj, Raw):
+            if section == 'Resources':
+                built = self._resource(obj, data)
+            else:
+                built = self._set_props(obj, data)
+            if built and _reproduces(obj, data):
+                return obj
+            obj.__dict__.clear()
+            obj.object_name = _str(name)
+        # Every reference to obj is already made, so it keeps its
+        # identity and becomes the matching raw class
+        obj.__class__ = _raw_class(section)
+        obj.data = self.convert(data)
+        return obj
+
+    def _resource(self, obj, data):
+        for key, value in data.iteritems():
+            if key == 'Type':
+                continue
+            elif key == 'Properties':
+                if not isinstance(value, dict) or not self._set_props(obj, value):
+                    return False
+            elif key == 'Condition' and value in self.conditions:
+                obj.condition = self.conditions[value]
+            elif key == 'DeletionPolicy':
+                obj.deletion_policy = DeletionPolicy(_str(value))
+            else:
+                return False
+        return True
+
+    def _set_props(self, obj, data):
+        """Sets the attributes of obj from the properties in data. Returns
+        False if a property is unknown.
+
+        """
+        by_name = obj.__schema__().index
+        ports = {}
+        for key, value in data.iteritems():
+            p = by_name.get(key)
+            if p is None:
+                return False
+            if p.type is PortRange:
+                ports[key] = value
+                if key != 'PortRange':
+                    continue
+                value = _port_range(value.get('From'), value.get('To')) \
+                        if isinstance(value, dict) else None
+                if value is None:
+                    return False
+            setattr(obj, p.attr, self._typed(p.type, value))
+        if 'FromPort' in ports or 'ToPort' in ports:
+            value = _port_range(ports.get('FromPort'), ports.get('ToPort'))
+            if value is None:
+                return False
+            setattr(obj, by_name['FromPort'].attr, value)
+        return True
+
+    def _typed(self, cls, value):
+        """Converts value, wrapping a literal in cls if cls is a Wrapper
+        type and returning a referenced object as itself.
+
+        """
+        if isinstance(value, dict) and value.keys() == ['Ref']:
+            target = self._target(value['Ref'])
+            if target is not None:
+                return target
+        converted = self.convert(value)
+        if isinstance(cls, type) and issubclass(cls, Wrapper) and \
+           isinstance(converted, (basestring, int, long, float, bool)):
+            return cls(converted)
+        return converted
+
+    def _target(self, name):
+        if not isinstance(name, basestring):
+            return None
+        target = self.objects.get(name)
+        if target is None and name.startswith('AWS::'):
+            target = PSEUDO_PARAMETERS.get(name)
+            if target is None:
+                target = PSEUDO_PARAMETERS[name] = PseudoParameter(_str(name))
+        return target
+
+    def convert(self, node, conditions=False):
+        """Returns node with Ref and Fn::* nodes replaced by objects.
+        If conditions, {"Condition": name} nodes become Conditions.
+
+        """
+        if isinstance(node, list):
+            return [self.convert(v, conditions) for v in node]
+        if isinstance(node, basestring):
+            return _str(node)
+        if not isinstance(node, dict):
+            return node
+        if len(node) == 1:
+            key, value = node.items()[0]
+            converted = self._function(key, value, conditions)
+            if converted is not None:
+                return converted
+        return odict((_str(k), self.convert(v, conditions)) for k, v in node.iteritems())
+
+    def _function(self, key, value, conditions):
+        args = value if isinstance(value, list) else None
+        if key == 'Ref':
+            target = self._target(value)
+            return Ref(target) if target is not None else None
+        if key == 'Condition' and conditions:
+            return self.conditions.get(value)
+        if key == 'Fn::GetAtt' and args and len(args) == 2 and args[0] in self.objects:
+            return functions.GetAtt(self.objects[args[0]], self.convert(args[1]))
+        if key == 'Fn::Join' and args and len(args) == 2 and isinstance(args[1], list):
+            return functions.Join(self.convert(args[0]), self.convert(args[1]))
+        if key == 'Fn::Select' and args and len(args) == 2 and isinstance(args[1], list):
+            return functions.Select(self.convert(args[0]), self.convert(args[1]))
+        if key == 'Fn::Base64':
+            return functions.Base64(self.convert(value))
+        if key == 'Fn::GetAZs':
+            return functions.GetAZs(self.convert(value))
+        if key == 'Fn::FindInMap' and args and len(args) == 3 and isinstance(args[0], basestring):
+            return functions.FindInMap(_str(args[0]), self.convert(args[1]), self.convert(args[2]))
+        if key == 'Fn::Equals' and args and len(args) == 2:
+            return functions.Equals(self.convert(args[0]), self.convert(args[1]))
+        if key == 'Fn::If' and args and len(args) == 3 and args[0] in self.conditions:
+            return functions.If(self.conditions[args[0]], self.convert(args[1]), self.convert(args[2]))
+        if key in ('Fn::And', 'Fn::Or') and args:
+            fn = functions.And if key == 'Fn::And' else functions.Or
+            return fn(*self.convert(args, True))
+        if key == 'Fn::Not' and args and len(args) == 1:
+            return functions.Not(self.convert(args[0], True))
+        return None
+
+class Reader(object):
+    """Reads a JSON document incrementally from fp, one member or value
+    at a time, holding at most one value and one chunk in memory.
+
+    """
+    WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+    def __init__(self, fp, decoder, chunk_size=64 * 1024):
+        self.fp         = fp
+        self.decoder    = decoder
+        self.chunk_size = chunk_size
+        self.buf        = ''
+        self.pos        = 0
+
+    def _fill(self, size=None):
+        data = self.fp.read(size or self.chunk_size)
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return bool(data)
+
+    def _peek(self):
+        while True:
+            self.pos = Reader.WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or not self._fill():
+                return self.buf[self.pos:self.pos + 1]
+
+    def _expect(self, c):
+        if self._peek() != c:
+            raise ValueError("expected '%s' at '%s'"%(c, self.buf[self.pos:self.pos + 20]))
+        self.pos += 1
+
+    def value(self):
+        """Returns the next value.
+        """
+        self._peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+                # A number may continue past the end of the buffer
+                if end < len(self.buf) or not self._fill(size):
+                    self.pos = end
+                    return value
+            except ValueError:
+                if not self._fill(size):
+                    raise
+            size *= 2
+
+    def skip(self):
+        self.value()
+
+    def members(self):
+        """Yields the keys of the next object. The caller reads the value
+        of each key before resuming.
+
+        """
+        self._expect('{')
+        if self._peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, basestring):
+                raise ValueError("expected an object key, got %r"%(key,))
+            self._expect(':')
+            yield key
+            c = self._peek()
+            self.pos += 1
+            if c == '}':
+                return
+            if c != ',':
+                raise ValueError("expected ',' or '}' at '%s'"%self.buf[self.pos - 1:self.pos + 20])
+
+def _shell(cls, name):
+    obj = cls.__new__(cls)
+    obj.object_name = _str(name)
+    return obj
+
+def _port_range(from_port, to_port):
+    # Ports are rendered as strings, so numeric ports are not reproduced
+    if not isinstance(from_port, basestring) or not isinstance(to_port, basestring) or \
+       not from_port.isdigit() or not to_port.isdigit():
+        return None
+    return PortRange("%s-%s"%(from_port, to_port))
+
+def _raw_class(section):
+    return {'Parameters' : RawParameter,
+            'Resources'  : RawResource,
+            'Outputs'    : RawOutput}[section]
+
+def _reproduces(obj, data):
+    """Returns whether the JSON form of obj equals data, ignoring key order.
+    """
+    try:
+        text = JSONEncoder(separators=(',', ':')).encode(obj)
+    except (AttributeError, TypeError, ValueError):
+        return False
+    return json.loads(text) == json.loads(json.dumps(data))
+
+def _str(s):
+    # Python 2 json returns unicode; ASCII strings become str, as
+    # stratiform's own values are
+    if isinstance(s, unicode):
+        try:
+            return s.encode('ascii')
+        except UnicodeEncodeError:
+            pass
+    return s
+
+#### Public API ####
+__all__ = ['load', 'loads']
@@ -0,0 +1,415 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Splits an oversized template into nested stacks.
+
+The resources of a template are partitioned into child templates so
+that few references cross between children, and a parent template
+creates each child as an AWS::CloudFormation::Stack. Each cut
+reference is wired through an Output of the producing child and a
+Parameter of the consuming child.
+
+The partitioning works on the dependency graph of the template:
+
+1. Resources that must stay together are contracted into groups: a
+   resource and the targets of its GetAtt references, an output and
+   the resources it refers to, a RuleTable and its owner, and any
+   resulting cycles.
+2. The groups are laid out in a depth-first topological order, which
+   keeps dependencies next to their dependents, and cut into
+   consecutive parts of at most max_resources resources.
+3. Fiduccia-Mattheyses style passes move groups between parts when
+   that reduces the number of cut references. A group only moves to
+   parts between those of its dependencies and its dependents, so
+   the children always form a DAG that CloudFormation can create.
+
+Each step is linear in the size of the graph, so templates with
+tens of thousands of resources partition in seconds.
+
+"""
+
+import math
+
+from collections import OrderedDict as odict
+
+from stratiform.base import ref
+from stratiform.cloudformation import Stack
+from stratiform.conditions import Condition
+from stratiform.functions import GetAtt
+from stratiform.outputs import Output
+from stratiform.parameters import Parameter
+from stratiform.rules import RuleTable
+from stratiform.templates import Template
+
+class Partition(object):
+    """The result of partitioning a template: the parent template and
+    the child templates, keyed by the logical name of their stacks.
+
+    """
+    def __init__(self, parent, children, cut):
+        self.parent   = parent
+        self.children = children
+        self.cut      = cut
+
+    def __repr__(self):
+        return "Partition(%d children, %d cut references)"%(len(self.children), self.cut)
+
+def partition(template, parts=None, max_resources=200, template_url='{name}.json',
+              prefix='Nested', passes=8):
+    """Partitions the resources of template into child templates of at
+    most max_resources resources each, returning a Partition.
+
+    If parts is given, the resources are spread over about that many
+    children; otherwise as few children as possible are used.
+    template_url is a format string (with {name}) or a function from
+    child stack name to the URL the child template will be uploaded
+    to.
+
+    """
+    url = template_url
+    if isinstance(template_url, basestring):
+        url = lambda name: template_url.format(name=name)
+
+    graph     = template.graph
+    resources = template.resources
+    tables    = template.rule_tables
+    outputs   = template.outputs
+
+    groups = _groups(graph, resources, tables, outputs)
+    deps, rdeps = _group_edges(graph, groups, resources)
+    weight = [sum(1 if m in resources else len(tables.get(m, ())) for m in g)
+              for g in groups]
+
+    total = sum(weight)
+    capacity = max_resources
+    if parts:
+        capacity = min(max_resources, int(math.ceil(float(total) / parts)))
+        capacity = max([capacity] + weight)
+    if weight and max(weight) > max_resources:
+        msg = "%d resources must stay in one stack, exceeding the limit of %d"
+        raise ValueError(msg%(max(weight), max_resources))
+
+    order = _dfs_order(deps)
+    part  = _initial_parts(order, weight, capacity)
+    _refine(order, part, weight, deps, rdeps, capacity, passes)
+
+    return _assemble(template, groups, part, url, prefix)
+
+class _UnionFind(object):
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, x):
+        root = x
+        while self.parent.get(root, root) != root:
+            root = self.parent[root]
+        while x != root:
+            self.parent[x], x = root, self.parent.get(x, x)
+        return root
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[rb] = ra
+
+def _groups(graph, resources, tables, outputs):
+    """Returns the lists of resource, rule table, and output names that
+    must be placed in the same child, in template order.
+
+    """
+    units = list(resources) + list(tables) + [_output_unit(n) for n in outputs]
+    uf = _UnionFind()
+    for name in units:
+        for target, kinds in _edges(graph, name).iteritems():
+            if target in resources and (isinstance(name, tuple) or 'GetAtt' in kinds):
+                uf.union(name, target)
+    for name, table in tables.iteritems():
+        uf.union(table.owner.object_name, name)
+
+    # Merge cycles between the contracted groups
+    members = odict()
+    for name in units:
+        members.setdefault(uf.find(name), []).append(name)
+    groups = members.values()
+    index = dict((m, i) for i, g in enumerate(groups) for m in g)
+    deps = [set(index[t] for m in g for t in _edges(graph, m)
+                if t in resources and index[t] != i)
+            for i, g in enumerate(groups)]
+    for scc in _sccs(deps):
+        for i in scc[1:]:
+            uf.union(groups[scc[0]][0], groups[i][0])
+
+    merged = odict()
+    for name in units:
+        merged.setdefault(uf.find(name), []).append(name)
+    return merged.values()
+
+def _sccs(deps):
+    """Returns the strongly connected components with more than one node
+    of the graph given as a list of successor sets (Tarjan).
+
+    """
+    index, low, on_stack = {}, {}, set()
+    stack, result, counter = [], [], [0]
+    for root in xrange(len(deps)):
+        if root in index:
+            continue
+        work = [(root, iter(deps[root]))]
+        index[root] = low[root] = counter[0]; counter[0] += 1
+        stack.append(root); on_stack.add(root)
+        while work:
+            v, it = work[-1]
+            for w in it:
+                if w not in index:
+                    index[w] = low[w] = counter[0]; counter[0] += 1
+                    stack.append(w); on_stack.add(w)
+                    work.append((w, iter(deps[w])))
+                    break
+                elif w in on_stack:
+                    low[v] = min(low[v], index[w])
+            else:
+                work.pop()
+                if work:
+                    low[work[-1][0]] = min(low[work[-1][0]], low[v])
+                if low[v] == index[v]:
+                    scc = []
+                    while True:
+                        w = stack.pop(); on_stack.discard(w)
+                        scc.append(w)
+                        if w == v:
+                            break
+                    if len(scc) > 1:
+                        result.append(scc)
+    return result
+
+def _group_edges(graph, groups, resources):
+    """Returns the weighted dependency and dependent maps between groups.
+    """
+    index = dict((m, i) for i, g in enumerate(groups) for m in g)
+    deps  = [{} for _ in groups]
+    rdeps = [{} for _ in groups]
+    for i, g in enumerate(groups):
+        for m in g:
+            for t in _edges(graph, m):
+                j = index.get(t) if t in resources else None
+                if j is not None and j != i:
+                    deps[i][j]  = deps[i].get(j, 0) + 1
+                    rdeps[j][i] = rdeps[j].get(i, 0) + 1
+    return deps, rdeps
+
+def _dfs_order(deps):
+    """Returns the groups in a topological order (dependencies first)
+    produced by depth-first search, so each group lands near the
+    groups it depends on.
+
+    """
+    seen, order = set(), []
+    for root in xrange(len(deps)):
+        if root in seen:
+            continue
+        seen.add(root)
+        work = [(root, iter(sorted(deps[root])))]
+        while work:
+            v, it = work[-1]
+            for w in it:
+                if w not in seen:
+                    seen.add(w)
+                    work.append((w, iter(sorted(deps[w]))))
+                    break
+            else:
+                work.pop()
+                order.append(v)
+    return order
+
+def _initial_parts(order, weight, capacity):
+    part, current, filled = [0] * len(order), 0, 0
+    for g in order:
+        if filled and filled + weight[g] > capacity:
+            current, filled = current + 1, 0
+        part[g] = current
+        filled += weight[g]
+    return part
+
+def _refine(order, part, weight, deps, rdeps, capacity, passes):
+    """Moves groups between parts while that reduces the cut, keeping
+    every dependency in the same or an earlier part.
+
+    """
+    nparts = max(part) + 1 if part else 0
+    load = [0] * nparts
+    for g, p in enumerate(part):
+        load[p] += weight[g]
+    for _ in xrange(passes):
+        moved = 0
+        for g in order:
+            p  = part[g]
+            lo = max([part[d] for d in deps[g]] or [0])
+            hi = min([part[r] for r in rdeps[g]] or [nparts - 1])
+            if lo == hi:
+                continue
+            conn = {}
+            for d, c in deps[g].iteritems():
+                conn[part[d]] = conn.get(part[d], 0) + c
+            for r, c in rdeps[g].iteritems():
+                conn[part[r]] = conn.get(part[r], 0) + c
+            best, best_gain = p, 0
+            for q, c in conn.iteritems():
+                gain = c - conn.get(p, 0)
+                if q != p and lo <= q <= hi and gain > best_gain and \
+                   load[q] + weight[g] <= capacity:
+                    best, best_gain = q, gain
+            if best != p:
+                load[p] -= weight[g]
+                load[best] += weight[g]
+                part[g] = best
+                moved += 1
+        if not moved:
+            break
+
+def _assemble(template, groups, part, url, prefix):
+    graph = template.graph
+    used  = sorted(set(part))
+    names = dict((p, '%s%d'%(prefix, i + 1)) for i, p in enumerate(used))
+    owner = {}
+    for g, members in enumerate(groups):
+        for m in members:
+            owner[m] = names[part[g]]
+
+    children = odict((names[p], Template("%s (%s)"%(getattr(template, 'description', ''), names[p])))
+                     for p in used)
+    imports  = dict((n, odict()) for n in children)
+    exports  = set()
+    cut      = 0
+
+    def support(name, child, seen):
+        # Parameters and conditions needed by name, transitively
+        for t in _edges(graph, name):
+            if t in seen:
+                continue
+            if t in template.parameters:
+                seen.add(t)
+                _insert(child, template.parameters[t])
+            elif t in template.conditions:
+                seen.add(t)
+                _insert(child, template.conditions[t])
+                support(t, child, seen)
+
+    needed = dict((n, set()) for n in children)
+    for collection in (template.resources, template.rule_tables, template.outputs):
+        for name, item in collection.iteritems():
+            if collection is template.outputs:
+                name = _output_unit(name)
+            cname = owner[name]
+            child = children[cname]
+            _insert(child, item)
+            support(name, child, needed[cname])
+            for t in _edges(graph, name):
+                if t in template.resources and owner[t] != cname:
+                    imports[cname][t] = owner[t]
+                    exports.add(t)
+                    cut += 1
+
+    parent = Template(getattr(template, 'description', ''))
+    for cname, child in children.iteritems():
+        child.mappings.update(template.mappings)
+        taken = _logical_ids(child)
+        for t, producer in imports[cname].iteritems():
+            # References to t in the child resolve to this parameter, so
+            # it must take the name of t
+            if t in taken:
+                msg = "cannot import resource '%s' into %s, which already uses the name"
+                raise ValueError(msg%(t, cname))
+            _insert(child, Parameter(t, type=Parameter.Type.String,
+                                     description="%s from %s"%(t, producer)))
+    export_names = {}
+    for t in sorted(exports):
+        child = children[owner[t]]
+        export_names[t] = _unique(t + 'Ref', _logical_ids(child))
+        _insert(child, Output(export_names[t], value=template.resources[t]))
+
+    for name, param in template.parameters.iteritems():
+        if any(name in needed[c] for c in children):
+            _insert(parent, param)
+    stacks = {}
+    for cname, child in children.iteritems():
+        params = odict()
+        for name in child.parameters:
+            if name in imports[cname]:
+                params[name] = GetAtt(stacks[imports[cname][name]], 'Outputs.%s'%export_names[name])
+            else:
+                params[name] = ref(template.parameters[name])
+        stacks[cname] = Stack(cname, template_url=url(cname), parameters=params)
+        _insert(parent, stacks[cname])
+    for name, output in template.outputs.iteritems():
+        kwargs = {'value' : GetAtt(stacks[owner[_output_unit(name)]], 'Outputs.%s'%name)}
+        if hasattr(output, 'description'):
+            kwargs['description'] = output.description
+        _insert(parent, Output(name, **kwargs))
+
+    return Partition(parent, children, cut)
+
+def _output_unit(name):
+    # Outputs may share the logical name of a resource, so their units
+    # are tagged with the section
+    return ('Outputs', name)
+
+def _edges(graph, unit):
+    """Returns the outgoing edges of the resource, rule table, or output
+    unit.
+
+    """
+    if isinstance(unit, tuple):
+        return graph.output_edges.get(unit[1], {})
+    return graph.edges.get(unit, {})
+
+def _logical_ids(template):
+    names = set()
+    for coll in (template.parameters, template.mappings, template.conditions,
+                 template.resources, template.outputs):
+        names.update(coll)
+    for table in template.rule_tables.itervalues():
+        names.update(table.names)
+    return names
+
+def _unique(name, taken):
+    """Returns name, or name with the smallest numeric suffix from 2,
+    that is not in taken.
+
+    """
+    candidate, i = name, 2
+    while candidate in taken:
+        candidate, i = '%s%d'%(name, i), i + 1
+    return candidate
+
+def _insert(template, item):
+    """Adds item to template without also adding its siblings, which the
+    partitioner places separately.
+
+    """
+    if isinstance(item, RuleTable):
+        template.add(item)
+        return
+    if isinstance(item, Parameter):
+        coll = template.parameters
+    elif isinstance(item, Condition):
+        coll = template.conditions
+    elif isinstance(item, Output):
+        coll = template.outputs
+    else:
+        coll = template.resources
+    coll[item.object_name] = item
+    template.graph.add(item.object_name, item)
+
+#### Public API ####
+__all__ = ['partition']
@@ -16,9 +16,8 @@ from copy import copy
 
 from stratiform.base import AWSObject, prop
 from stratiform.common import AvailabilityZone, CIDR
-from stratiform.utils import snake_case
 
-from stratiform.resources import Resource, Tags
+from stratiform.resources import Resource, Tags, resource_constructors
 
 ################################ AWS Property Types ################################
 class RDSSecurityGroupRule(AWSObject):
@@ -109,10 +108,8 @@ class DBSecurityGroupIngress(Resource):
                 prop('EC2SecurityGroupOwnerId', basestring)]
 
 #### Public API ####
-# Generate functional snake_cased form of constructors for public API
-def __is_resource(obj):
-    return issubclass(type(obj), type) and issubclass(obj, Resource)
-constructors = {snake_case(name): obj for (name, obj) in globals().items() if __is_resource(obj)}
+# Functional snake_cased form of constructors for public API
+constructors = resource_constructors(__name__, globals())
 globals().update(constructors)
 
 rds_security_group_rule = RDSSecurityGroupRule
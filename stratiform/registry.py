@@ -0,0 +1,87 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""The registry of resource classes by CloudFormation type.
+
+    lookup('AWS::EC2::Subnet')    # stratiform.ec2.Subnet
+    lookup_name('subnet')         # stratiform.ec2.Subnet
+    resource_types()              # every known type, sorted
+
+Every AWSObject class that defines a resource_type string is
+registered by its metaclass when the class is defined, so classes
+outside the package are found once their module is imported. A class
+defined later for a type replaces the earlier one.
+
+The types of the service modules are also listed in the RESOURCE_TYPES
+table generated by stratiform.tablegen, so looking up one of them
+imports only its module. Lookups are dict lookups.
+
+"""
+
+import importlib
+
+from stratiform._tables import RESOURCE_TYPES
+from stratiform.utils import snake_case
+
+_types = {}
+_names = {}
+
+# The snake_cased class names of the tabled types
+_tabled_names = dict((snake_case(class_name), resource_type)
+                     for resource_type, (_, class_name) in RESOURCE_TYPES.iteritems())
+
+def register(cls):
+    """Records cls under its resource_type and its snake_cased name.
+    """
+    _types[cls.resource_type] = cls
+    _names[snake_case(cls.__name__)] = cls
+    return cls
+
+def lookup(resource_type, default=None):
+    """Returns the class registered for resource_type, importing its
+    service module if needed, or default.
+
+    """
+    cls = _types.get(resource_type)
+    if cls is None and resource_type in RESOURCE_TYPES:
+        importlib.import_module(RESOURCE_TYPES[resource_type][0])
+        cls = _types.get(resource_type)
+    return default if cls is None else cls
+
+def lookup_name(name, default=None):
+    """Returns the class registered with the snake_cased class name,
+    e.g., 'security_group_ingress', or default.
+
+    """
+    cls = _names.get(name)
+    if cls is None and name in _tabled_names:
+        cls = lookup(_tabled_names[name])
+    return default if cls is None else cls
+
+def resource_types():
+    """Returns the sorted resource types of the registered and tabled
+    classes, without importing any module.
+
+    """
+    return sorted(set(_types) | set(RESOURCE_TYPES))
+
+def resource_classes():
+    """Returns the classes of resource_types(), by type, importing the
+    service modules.
+
+    """
+    return dict((t, lookup(t)) for t in resource_types())
+
+#### Public API ####
+__all__ = ['lookup', 'lookup_name', 'register', 'resource_types', 'resource_classes']
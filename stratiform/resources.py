@@ -12,31 +12,24 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
+import weakref
+
 from copy import copy
 from collections import OrderedDict as odict
 
+from stratiform._tables import CONSTRUCTORS
 from stratiform.base import AWSObject, NameableAWSObject, prop
 from stratiform.conditions import Condition, Conditionable
-from stratiform.utils import class_name, super_copy, Wrapper
+from stratiform.utils import class_name, snake_case, super_copy, Wrapper
 
 def merge(*seqs):
     return [item for seq in seqs for item in seq]
 
 class Resource(Conditionable, NameableAWSObject):
-    def __init__(self, *args, **kwargs):
-        super(Resource, self).__init__(*args, **kwargs)
-
-    def __attrs__(self):
-        sattrs = super(Resource, self).__attrs__()
-        return sattrs + ['deletion_policy']
-
-    def arg_names(self):
-        snames = super(Resource, self).arg_names()
-        return snames + ['deletion_policy']
-
-    def arg_types(self):
-        stypes = super(Resource, self).arg_types()
-        return stypes + [DeletionPolicy]
+    @classmethod
+    def __compile_schema__(cls):
+        schema = super(Resource, cls).__compile_schema__()
+        return schema.extend(args=[('deletion_policy', DeletionPolicy)])
 
     def __json__(self):
         data = odict([
@@ -54,20 +47,106 @@ class Tag(AWSObject):
         return [prop('Key'),
                 prop('Value')]
 
+    def key_of(self):
+        # The type is part of the key, as 1 == True == 1.0 but each
+        # renders differently
+        return (self.key, type(self.value), self.value)
+
+    def __eq__(self, other):
+        return isinstance(other, Tag) and self.key_of() == other.key_of()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.key_of())
+
     def __repr__(self):
         return "Tag(%s='%s')"%(self.key, self.value)
 
+def interned(pool, key, create):
+    """Returns the object in the weak-value pool for key, creating and
+    adding it if absent. Unhashable keys are not interned.
+
+    """
+    try:
+        obj = pool.get(key)
+    except TypeError:
+        return create()
+    if obj is None:
+        obj = create()
+        pool[key] = obj
+    return obj
+
 class Tags(object):
-    def __init__(self, *tags, **kwtags):
-        kwtags = [Tag(key=k,value=v) for k, v in kwtags.iteritems()]
-        self.tags = merge(tags, kwtags)
+    """An immutable, hashable set of tags.
+
+    Tags are interned: tag sets with equal contents are the same
+    object, as are equal Tag objects created through the keyword
+    form. Merges and other derived values are memoized on the tag set,
+    so e.g., TagsBase + tag(Name=...) is computed once per operand pair
+    and every resource using the result shares one object and, in
+    compact renders, one serialized fragment. The memo of each tag set
+    holds at most DERIVED_LIMIT values; later ones are computed but not
+    stored.
+
+    """
+    __slots__ = ('tags', '_derived', '__weakref__')
+
+    DERIVED_LIMIT = 64
+
+    _pool     = weakref.WeakValueDictionary()
+    _tag_pool = weakref.WeakValueDictionary()
+
+    def __new__(cls, *tags, **kwtags):
+        kwtags = [Tags.tag(k, v) for k, v in kwtags.iteritems()]
+        tags = tuple(merge(tags, kwtags))
+        return interned(Tags._pool, (cls, tags), lambda: cls.__create(tags))
+
+    @classmethod
+    def __create(cls, tags):
+        obj = super(Tags, cls).__new__(cls)
+        obj.tags = tags
+        obj._derived = {}
+        return obj
+
+    @staticmethod
+    def tag(key, value):
+        """Returns the interned Tag for key and value.
+        """
+        return interned(Tags._tag_pool, (key, type(value), value), lambda: Tag(key=key, value=value))
+
+    def derive(self, key, create):
+        """Returns the value memoized on this tag set under key, calling
+        create() to compute it on first use. Values for unhashable keys
+        are not memoized.
+
+        """
+        try:
+            return self._derived[key]
+        except KeyError:
+            value = create()
+            if len(self._derived) < Tags.DERIVED_LIMIT:
+                self._derived[key] = value
+            return value
+        except TypeError:
+            return create()
 
     def __add__(self, rhs):
         if rhs is None:
             return self
         if not isinstance(rhs, Tags):
             raise TypeError("cannot merge 'Tags' and '%s' objects"%class_name(rhs))
-        return Tags(*(self.tags + rhs.tags))
+        return self.derive(('add', rhs), lambda: Tags(*(self.tags + rhs.tags)))
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.tags == other.tags
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.tags)
 
     def __json__(self):
         return self.tags
@@ -78,6 +157,17 @@ DeletionPolicy.DELETE   = DeletionPolicy("Delete")
 DeletionPolicy.RETAIN   = DeletionPolicy("Retain")
 DeletionPolicy.SNAPSHOT = DeletionPolicy("Snapshot")
 
+def resource_constructors(module, namespace):
+    """Returns the snake_cased constructors for the resource classes in
+    the namespace of module, as precomputed by stratiform.tablegen.
+    Modules missing from the table are scanned instead.
+
+    """
+    if module in CONSTRUCTORS:
+        return dict((name, namespace[cls]) for name, cls in CONSTRUCTORS[module])
+    return dict((snake_case(name), obj) for name, obj in namespace.items()
+                if name[:1].isupper() and isinstance(obj, type) and issubclass(obj, Resource))
+
 #### Public API ####
 tag = tags = Tags
 deletion_policy = DeletionPolicy
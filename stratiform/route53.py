@@ -14,8 +14,8 @@
 
 from stratiform.base import AWSObject, prop
 from stratiform.common import DomainName, IpAddress
-from stratiform.utils import ListWrapper, Wrapper, snake_case
-from stratiform.resources import Resource, Tags
+from stratiform.utils import ListWrapper, Wrapper
+from stratiform.resources import Resource, Tags, resource_constructors
 
 ################################ Custom Types ################################
 class ContinentCode(Wrapper):
@@ -117,10 +117,8 @@ class RecordSetGroup(Resource):
                 prop('Comment')]
 
 #### Public API ####
-# Generate functional snake_cased form of constructors for public API
-def __is_resource(obj):
-    return issubclass(type(obj), type) and issubclass(obj, Resource)
-constructors = {snake_case(name): obj for (name, obj) in globals().items() if __is_resource(obj)}
+# Functional snake_cased form of constructors for public API
+constructors = resource_constructors(__name__, globals())
 globals().update(constructors)
 
 continent_code   = ContinentCode
@@ -0,0 +1,312 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Overlap and shadowing checks for NetworkAcl and SecurityGroup rules.
+
+    issues = check_rules(template)
+    template.to_json(check_rules=True)    # raises a RuleCheckError
+
+For each ACL and direction, the entries are visited in rule number
+order. Each entry is looked up in an index of the entries before it:
+a trie of their CIDR blocks, walked from the root along the blocks
+containing the entry's block, whose nodes hold the port ranges of
+the entries with that block in a Fenwick tree of the largest upper
+port by lower port. An entry covered by an earlier entry is reported
+as shadowed if the earlier entry has the opposite action, and as
+redundant if it has the same one. Entries sharing a rule number are
+reported as duplicates.
+
+Security group rules are unordered and all allow, so a rule is
+reported as redundant if another rule of the group covers it, or as
+a duplicate if another rule is identical.
+
+The checks take O(n log n) for n rules. Rules with values that are
+not literals, e.g., a CIDR block from a parameter, are skipped.
+
+"""
+
+from collections import OrderedDict as odict
+
+from stratiform.common import CIDR
+from stratiform.rules import ResourcesView
+
+ALL_PROTOCOLS = -1
+MAX_PORT      = 65535
+
+class RuleIssue(object):
+    """A problem with the rule named name. other is the name of the
+    conflicting rule.
+
+    """
+    DUPLICATE_NUMBER = 'duplicate rule number'
+    SHADOWED         = 'shadowed'
+    REDUNDANT        = 'redundant'
+    DUPLICATE        = 'duplicate'
+
+    def __init__(self, kind, owner, name, other):
+        self.kind  = kind
+        self.owner = owner
+        self.name  = name
+        self.other = other
+
+    def __str__(self):
+        if self.kind == RuleIssue.DUPLICATE_NUMBER:
+            return "%s: %s has the same rule number as %s"%(self.owner, self.name, self.other)
+        return "%s: %s is %s by %s"%(self.owner, self.name, {
+            RuleIssue.SHADOWED:  'shadowed',
+            RuleIssue.REDUNDANT: 'made redundant',
+            RuleIssue.DUPLICATE: 'duplicated'}[self.kind], self.other)
+
+    def __repr__(self):
+        return "RuleIssue(%r, %r, %r, %r)"%(self.kind, self.owner, self.name, self.other)
+
+class RuleCheckError(ValueError):
+    """Raised by Template.to_json(check_rules=True) when check_rules()
+    reports issues.
+
+    """
+    def __init__(self, issues, top=10):
+        self.issues = issues
+        lines = ["%d rule issues"%len(issues)]
+        lines.extend("  " + str(i) for i in issues[:top])
+        if len(issues) > top:
+            lines.append("  ...")
+        super(RuleCheckError, self).__init__('\n'.join(lines))
+
+class PrefixMax(object):
+    """A sparse Fenwick tree over the lower ports 0-65535 holding the
+    (largest upper port, rule name) of the ranges added so far.
+
+    """
+    __slots__ = ('tree',)
+
+    SIZE = MAX_PORT + 1
+
+    def __init__(self):
+        self.tree = {}
+
+    def add(self, lo, hi, name):
+        tree = self.tree
+        i = lo + 1
+        while i <= PrefixMax.SIZE:
+            best = tree.get(i)
+            if best is None or best[0] < hi:
+                tree[i] = (hi, name)
+            i += i & -i
+
+    def covering(self, lo, hi):
+        """Returns the name of a range added so far that contains lo-hi,
+        or None.
+
+        """
+        tree = self.tree
+        i = lo + 1
+        while i > 0:
+            best = tree.get(i)
+            if best is not None and best[0] >= hi:
+                return best[1]
+            i -= i & -i
+        return None
+
+class RuleIndex(object):
+    """The rules added so far, as a trie of their CIDR blocks keyed by
+    (protocol, action). Only the prefix lengths in use are walked.
+
+    """
+    def __init__(self):
+        self.nodes    = {}
+        self.prefixes = []
+
+    def add(self, rule):
+        key = (rule.protocol, rule.network, rule.prefix, rule.action)
+        node = self.nodes.get(key)
+        if node is None:
+            node = self.nodes[key] = PrefixMax()
+            if rule.prefix not in self.prefixes:
+                self.prefixes.append(rule.prefix)
+                self.prefixes.sort()
+        node.add(rule.lo, rule.hi, rule.name)
+
+    def covering(self, rule, action, exact=False):
+        """Returns the name of a rule added so far with the specified
+        action that matches every packet rule does, or None. If exact,
+        only rules of the same protocol are considered.
+
+        """
+        protocols = [rule.protocol]
+        if rule.protocol != ALL_PROTOCOLS and not exact:
+            protocols.append(ALL_PROTOCOLS)
+        nodes = self.nodes
+        for prefix in self.prefixes:
+            if prefix > rule.prefix:
+                break
+            network = rule.network & CIDR.mask(prefix)
+            for protocol in protocols:
+                node = nodes.get((protocol, network, prefix, action))
+                if node is not None:
+                    name = node.covering(rule.lo, rule.hi)
+                    if name is not None:
+                        return name
+        return None
+
+class Rule(object):
+    """The literal values of a rule, normalized for comparison.
+    """
+    __slots__ = ('name', 'number', 'protocol', 'lo', 'hi', 'network', 'prefix', 'action')
+
+    def __init__(self, name, number, protocol, lo, hi, block, action):
+        self.name     = name
+        self.number   = number
+        self.protocol = protocol
+        self.lo       = lo
+        self.hi       = hi
+        self.network  = block.network
+        self.prefix   = block.prefix
+        self.action   = action
+
+    def key(self):
+        return (self.protocol, self.lo, self.hi, self.network, self.prefix, self.action)
+
+def check_network_acl(owner, entries):
+    """Returns the RuleIssues of the Rule entries of one direction of a
+    NetworkAcl.
+
+    """
+    issues  = []
+    numbers = {}
+    index   = RuleIndex()
+    for rule in sorted(entries, key=lambda r: r.number):
+        other = numbers.setdefault(rule.number, rule.name)
+        if other != rule.name:
+            issues.append(RuleIssue(RuleIssue.DUPLICATE_NUMBER, owner, rule.name, other))
+        opposite = 'deny' if rule.action == 'allow' else 'allow'
+        other = index.covering(rule, opposite)
+        if other is not None:
+            issues.append(RuleIssue(RuleIssue.SHADOWED, owner, rule.name, other))
+        else:
+            other = index.covering(rule, rule.action)
+            if other is not None:
+                issues.append(RuleIssue(RuleIssue.REDUNDANT, owner, rule.name, other))
+        index.add(rule)
+    return issues
+
+def check_security_group(owner, rules):
+    """Returns the RuleIssues of the Rules of one direction of a
+    SecurityGroup.
+
+    """
+    issues = []
+    seen   = {}
+    index  = RuleIndex()
+    # Wider rules first, so every rule follows those covering it. Of
+    # rules alike but for the protocol, all protocols is the wider.
+    order = sorted(enumerate(rules), key=lambda (i, r): (r.prefix, r.lo - r.hi,
+                                                         r.protocol != ALL_PROTOCOLS, i))
+    for _, rule in order:
+        other = seen.setdefault(rule.key(), rule.name)
+        if other != rule.name:
+            issues.append(RuleIssue(RuleIssue.DUPLICATE, owner, rule.name, other))
+        else:
+            other = index.covering(rule, rule.action)
+            if other is not None:
+                issues.append(RuleIssue(RuleIssue.REDUNDANT, owner, rule.name, other))
+        index.add(rule)
+    return issues
+
+def check_rules(template):
+    """Returns the RuleIssues of the NetworkAclEntry and security group
+    rules of template, including those in its rule tables.
+
+    """
+    acls   = odict()
+    groups = odict()
+    resources = ResourcesView(template.resources, template.rule_tables)
+    for name, resource in resources.iteritems():
+        resource_type = getattr(resource, 'resource_type', None)
+        if resource_type == 'AWS::EC2::NetworkAclEntry':
+            rule = _acl_rule(name, resource)
+            if rule is not None:
+                key = (_owner_name(resource.network_acl_id), bool(_literal(getattr(resource, 'egress', False))))
+                acls.setdefault(key, []).append(rule)
+        elif resource_type in ('AWS::EC2::SecurityGroupIngress', 'AWS::EC2::SecurityGroupEgress'):
+            rule = _sg_rule(name, resource)
+            if rule is not None:
+                key = (_owner_name(getattr(resource, 'group_id', None)), resource_type.endswith('Egress'))
+                groups.setdefault(key, []).append(rule)
+        elif resource_type == 'AWS::EC2::SecurityGroup':
+            for attr, egress in [('security_group_ingress', False), ('security_group_egress', True)]:
+                for i, inline in enumerate(getattr(resource, attr, None) or []):
+                    rule = _sg_rule("%s.%s[%d]"%(name, attr, i), inline)
+                    if rule is not None:
+                        groups.setdefault((name, egress), []).append(rule)
+    issues = []
+    for (owner, egress), entries in acls.iteritems():
+        issues.extend(check_network_acl(_direction(owner, egress), entries))
+    for (owner, egress), rules in groups.iteritems():
+        issues.extend(check_security_group(_direction(owner, egress), rules))
+    return issues
+
+def _acl_rule(name, entry):
+    number   = _literal(getattr(entry, 'rule_number', None))
+    action   = _literal(getattr(entry, 'rule_action', None))
+    protocol = _protocol(entry, 'protocol')
+    block    = getattr(entry, 'cidr_block', None)
+    if not isinstance(number, (int, long)) or action not in ('allow', 'deny') or \
+       protocol is None or not _cidr(block):
+        return None
+    ports = _ports(protocol, getattr(entry, 'port_range', None))
+    if ports is None:
+        return None
+    if protocol == 1 and getattr(entry, 'icmp', None) is not None:
+        protocol = (1, _literal(getattr(entry.icmp, 'type', None)), _literal(getattr(entry.icmp, 'code', None)))
+    return Rule(name, number, protocol, ports[0], ports[1], block, action)
+
+def _sg_rule(name, rule):
+    protocol = _protocol(rule, 'ip_protocol')
+    block    = getattr(rule, 'cidr_ip', None)
+    if protocol is None or not _cidr(block):
+        return None
+    ports = _ports(protocol, getattr(rule, 'port_range', None))
+    if ports is None:
+        return None
+    return Rule(name, None, protocol, ports[0], ports[1], block, 'allow')
+
+def _protocol(rule, attr):
+    try:
+        return int(_literal(getattr(rule, attr, None)))
+    except (TypeError, ValueError):
+        return None
+
+def _ports(protocol, ports):
+    # Only TCP and UDP rules match on ports
+    if protocol not in (6, 17):
+        return 0, MAX_PORT
+    try:
+        return int(ports.from_port), int(ports.to_port)
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+def _cidr(block):
+    return isinstance(block, CIDR) and block.network is not None
+
+def _literal(value):
+    return getattr(value, 'wrapped', value)
+
+def _owner_name(owner):
+    return getattr(owner, 'object_name', repr(owner))
+
+def _direction(owner, egress):
+    return owner + (' egress' if egress else ' ingress')
+
+__all__ = ['check_rules', 'RuleIssue', 'RuleCheckError']
@@ -0,0 +1,235 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Columnar storage for large sets of similar rule resources.
+
+A RuleTable holds many resources of the same few classes, such as
+the NetworkAclEntry resources of one NetworkAcl, that differ only in
+a handful of property values. Instead of one object per rule, each
+property is a column: an array('I') of indexes into a pool of the
+distinct values used by the table. Rule names are interned, if they
+are byte strings.
+
+The resources are materialized only while the template is serialized,
+and Template.dump() materializes them one at a time as they are
+written, so a template with tens of thousands of rules holds little
+more than their columns.
+
+"""
+
+from array import array
+from collections import OrderedDict as odict
+
+from stratiform.dispatchers import DispatchTable
+
+class ValuePool(object):
+    """The distinct values of a table. Index 0 stands for no value.
+    """
+    def __init__(self):
+        self.values  = [None]
+        self.indexes = {}
+
+    def index(self, value):
+        try:
+            key = (value.__class__, value)
+            hash(key)
+        except TypeError:
+            key = (value.__class__, id(value))
+        i = self.indexes.get(key)
+        if i is None:
+            i = len(self.values)
+            self.values.append(value)
+            self.indexes[key] = i
+        return i
+
+    def __getitem__(self, i):
+        return self.values[i]
+
+    def __len__(self):
+        return len(self.values) - 1
+
+class RuleTable(object):
+    """A columnar table of resources of the classes in entry_classes,
+    all belonging to owner through the owner_attr property.
+
+    Subclasses set entry_classes and owner_attr and provide the
+    methods that append rules. Add a table to a template with
+    Template.add(), like a resource.
+
+    """
+    entry_classes = ()
+    owner_attr    = None
+
+    def __init__(self, owner):
+        self.owner   = owner
+        self.pool    = ValuePool()
+        self.names   = []
+        self.kinds   = array('B')
+        self.columns = odict((attr, array('I')) for attr in self._attrs())
+        self._index  = None
+
+    @classmethod
+    def _attrs(cls):
+        attrs = []
+        for entry in cls.entry_classes:
+            for attr in entry.__schema__().attrs:
+                if attr not in attrs and attr not in (cls.owner_attr, 'object_name'):
+                    attrs.append(attr)
+        return attrs
+
+    @classmethod
+    def _dispatch(cls, kind):
+        tables = cls.__dict__.get('_dispatch_tables')
+        if tables is None:
+            tables = []
+            for entry in cls.entry_classes:
+                schema = entry.__schema__()
+                tables.append(DispatchTable(schema.arg_names, schema.arg_types))
+            cls._dispatch_tables = tables
+        return tables[kind]
+
+    @property
+    def object_name(self):
+        # Logical IDs are alphanumeric, so this cannot name a resource
+        return self.owner.object_name + '.Rules'
+
+    def append(self, kind, name, *args, **kwargs):
+        """Appends a rule of class entry_classes[kind] named name. The
+        positional args are dispatched by type, as for the constructor
+        of the class.
+
+        """
+        entry = self.entry_classes[kind]
+        self._dispatch(kind).bind(args, kwargs, entry.__name__, '__init__')
+        for k, v in kwargs.iteritems():
+            if k not in self.columns:
+                err_msg = "%s() got unexpected keyword argument '%s'"
+                raise TypeError(err_msg%(entry.__name__, k))
+        index = self.pool.index
+        for attr, column in self.columns.iteritems():
+            column.append(index(kwargs[attr]) if attr in kwargs else 0)
+        self.names.append(intern(name) if type(name) is str else name)
+        self.kinds.append(kind)
+        self._index = None
+        return self
+
+    def __len__(self):
+        return len(self.names)
+
+    def materialize(self, i):
+        """Materializes the i-th rule as a resource object.
+        """
+        cls = self.entry_classes[self.kinds[i]]
+        obj = cls.__new__(cls)
+        d = obj.__dict__
+        pool = self.pool
+        for attr, column in self.columns.iteritems():
+            v = column[i]
+            if v:
+                d[attr] = pool[v]
+        d[self.owner_attr] = self.owner
+        d['object_name'] = self.names[i]
+        return obj
+
+    def iteritems(self):
+        """Yields the (name, resource) pairs of the rules in order,
+        materializing each resource as it is reached.
+
+        """
+        for i, name in enumerate(self.names):
+            yield name, self.materialize(i)
+
+    def __iter__(self):
+        for i in xrange(len(self.names)):
+            yield self.materialize(i)
+
+    def get(self, name, default=None):
+        if self._index is None:
+            self._index = dict((n, i) for i, n in enumerate(self.names))
+        i = self._index.get(name)
+        return default if i is None else self.materialize(i)
+
+    def values(self):
+        """Returns the distinct values referenced by the table, including
+        its owner.
+
+        """
+        return [self.owner] + self.pool.values[1:]
+
+    def __repr__(self):
+        return "%s(%s, %d rules)"%(self.__class__.__name__, self.object_name, len(self))
+
+class ResourcesView(dict):
+    """A read-only mapping of the resources of a template followed by the
+    rules of its rule tables, as serialized in its Resources section,
+    materializing each rule as it is reached.
+
+    The view is an empty dict that overrides the mapping methods, for
+    the pure Python encoder of the json module to stream it, as in
+    Template.dump(). The C encoder reads dicts directly and would see
+    it as empty, so it is never part of a serializable form.
+
+    """
+    def __init__(self, resources, tables):
+        super(ResourcesView, self).__init__()
+        self.resources = resources
+        self.tables    = tables
+
+    def iteritems(self):
+        for item in self.resources.iteritems():
+            yield item
+        for table in self.tables.itervalues():
+            for item in table.iteritems():
+                yield item
+
+    def iterkeys(self):
+        for k, _ in self.iteritems():
+            yield k
+
+    def itervalues(self):
+        for _, v in self.iteritems():
+            yield v
+
+    __iter__ = iterkeys
+
+    def items(self):
+        return list(self.iteritems())
+
+    def keys(self):
+        return list(self.iterkeys())
+
+    def values(self):
+        return list(self.itervalues())
+
+    def __len__(self):
+        return len(self.resources) + sum(len(t) for t in self.tables.itervalues())
+
+    def __contains__(self, k):
+        return self.get(k) is not None
+
+    def __getitem__(self, k):
+        v = self.get(k)
+        if v is None:
+            raise KeyError(k)
+        return v
+
+    def get(self, k, default=None):
+        v = self.resources.get(k)
+        if v is not None:
+            return v
+        for table in self.tables.itervalues():
+            v = table.get(k)
+            if v is not None:
+                return v
+        return default
@@ -0,0 +1,139 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Generates stratiform/_tables.py, the name tables read at import time.
+
+The snake_cased constructors of each service module, the public API
+names of the package, the module and class of each resource type,
+and the snake_case and camel_case forms of every property and
+resource name are computed here, once, instead of on every import.
+Rerun after adding or renaming a resource class or a public name:
+
+    python -m stratiform.tablegen          # rewrite _tables.py
+    python -m stratiform.tablegen --check  # fail if _tables.py is stale
+
+"""
+
+import importlib, os, pprint, sys
+
+from stratiform.base import AWSObject
+from stratiform.resources import Resource
+from stratiform.utils import to_camel_case, to_snake_case
+
+# Modules whose public API (__all__, unless listed) is re-exported by
+# the package, in import order; later names take precedence
+CORE_MODULES = [('stratiform.base', ['ref', 'column']),
+                ('stratiform.common', None),
+                ('stratiform.templates', None),
+                ('stratiform.parameters', None),
+                ('stratiform.conditions', None),
+                ('stratiform.mappings', None),
+                ('stratiform.resources', None),
+                ('stratiform.outputs', None)]
+
+SERVICE_MODULES = ['stratiform.asg', 'stratiform.cloudformation',
+                   'stratiform.ec2', 'stratiform.elb', 'stratiform.iam',
+                   'stratiform.rds', 'stratiform.route53']
+
+HEADER = '''\
+# Generated by stratiform.tablegen; do not edit.
+
+'''
+
+def scan_constructors(module):
+    """Returns the sorted (snake_name, class_name) pairs of the resource
+    classes defined in or imported into module.
+
+    """
+    found = set()
+    for name, obj in vars(module).items():
+        if name[:1].isupper() and isinstance(obj, type) and issubclass(obj, Resource):
+            found.add((to_snake_case(name), name))
+    return sorted(found)
+
+def scan_resource_types():
+    """Returns the (resource_type, (module, class_name)) pairs of the
+    resource classes defined in the service modules.
+
+    """
+    types = {}
+    for name in SERVICE_MODULES:
+        module = importlib.import_module(name)
+        for obj in vars(module).values():
+            if isinstance(obj, type) and issubclass(obj, Resource) and obj.__module__ == name and \
+               isinstance(vars(obj).get('resource_type'), basestring):
+                types[obj.resource_type] = (name, obj.__name__)
+    return sorted(types.items())
+
+def scan_exports():
+    """Returns the sorted (name, module) pairs of the public API of the
+    package.
+
+    """
+    exports = {}
+    for name, names in CORE_MODULES:
+        module = importlib.import_module(name)
+        exports.update((n, name) for n in (names or module.__all__))
+    return sorted(exports.items())
+
+def scan_names():
+    """Returns the sorted property and class names of the AWSObject
+    classes of the package.
+
+    """
+    names = set()
+    modules = [name for name, _ in CORE_MODULES] + SERVICE_MODULES
+    for module in map(importlib.import_module, modules):
+        for name, obj in vars(module).items():
+            if name[:1].isupper() and isinstance(obj, type) and issubclass(obj, AWSObject):
+                names.add(name)
+                if any('props' in vars(k) for k in obj.__mro__):
+                    try:
+                        names.update(p.name for p in obj.__schema__().props)
+                    except NameError:
+                        # props() refers to an undefined type, so the
+                        # class cannot be instantiated anyway
+                        pass
+    return sorted(names)
+
+def generate():
+    constructors = dict((name, scan_constructors(importlib.import_module(name)))
+                        for name in SERVICE_MODULES)
+    snake = dict((name, to_snake_case(name)) for name in scan_names())
+    camel = dict((name, to_camel_case(name)) for name in snake.values())
+    return HEADER + \
+        'CONSTRUCTORS = %s\n\n'%pprint.pformat(constructors) + \
+        'EXPORTS = %s\n\n'%pprint.pformat(dict(scan_exports())) + \
+        'RESOURCE_TYPES = %s\n\n'%pprint.pformat(dict(scan_resource_types())) + \
+        'SNAKE_CASE = %s\n\n'%pprint.pformat(snake) + \
+        'CAMEL_CASE = %s\n'%pprint.pformat(camel)
+
+def path():
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), '_tables.py')
+
+def main(args=None):
+    args = sys.argv[1:] if args is None else args
+    text = generate()
+    if '--check' in args:
+        with open(path()) as fp:
+            if fp.read() != text:
+                print >>sys.stderr, "%s is stale; run python -m stratiform.tablegen"%path()
+                return 1
+        return 0
+    with open(path(), 'w') as fp:
+        fp.write(text)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
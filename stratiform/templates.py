@@ -15,19 +15,70 @@
 import copy, json
 from collections import OrderedDict as odict
 
-from stratiform.utils import JSONEncoder, Wrapper, class_name, super_copy
-from stratiform.base import AWSObject, prop
+from stratiform.utils import CompactEncoder, JSONEncoder, json_form, Wrapper, class_name, super_copy, write_chunks
+from stratiform.base import AWSObject, Bulk, NameableAWSObject, Ref, prop
+from stratiform.graph import DependencyGraph
+from stratiform.incremental import IncrementalRenderer
+from stratiform.rules import ResourcesView, RuleTable
+from stratiform import changes, rulecheck
 
 from stratiform.parameters import Parameter
 from stratiform.mappings   import Mapping
 from stratiform.conditions import Condition
-from stratiform.resources  import Resource
+from stratiform.resources  import Resource, Tags
 from stratiform.outputs    import Output
 
 class Version(Wrapper):
     pass
 Version.DEFAULT = Version("2010-09-09")
 
+class TemplateSizes(object):
+    """The byte sizes of the compact JSON form of a template: the total,
+    each top-level section, and each entry (e.g., each resource) of
+    the collection sections.
+
+    """
+    def __init__(self, total, sections, entries):
+        self.total    = total
+        self.sections = sections
+        self.entries  = entries
+
+    @property
+    def resources(self):
+        return self.entries.get('Resources', odict())
+
+    def __repr__(self):
+        return "TemplateSizes(%d, %r)"%(self.total, self.sections.items())
+
+class TemplateSizeError(ValueError):
+    """Raised when the compact JSON form of a template exceeds a size
+    limit. Rendering stops as soon as the limit is passed, so the sizes
+    attribute holds the breakdown of the part rendered so far.
+
+    """
+    def __init__(self, limit, sizes, top=10):
+        self.limit = limit
+        self.sizes = sizes
+        lines = ["Template exceeds the limit of %d bytes after %d bytes"%(limit, sizes.total)]
+        for name, size in sizes.sections.iteritems():
+            lines.append("  %-24s %8d"%(name, size))
+        largest = sorted(sizes.resources.iteritems(), key=lambda e: -e[1])[:top]
+        if largest:
+            lines.append("Largest resources:")
+            for name, size in largest:
+                lines.append("  %-24s %8d"%(name, size))
+        super(TemplateSizeError, self).__init__('\n'.join(lines))
+
+def shared_fragment(obj):
+    """Returns True for objects whose compact JSON form may be cached and
+    reused across a render: tag sets and property objects (e.g.,
+    policies) that are commonly shared by many resources.
+
+    """
+    if isinstance(obj, Tags):
+        return True
+    return isinstance(obj, AWSObject) and not isinstance(obj, (NameableAWSObject, Ref))
+
 class Template(AWSObject):
     @staticmethod
     def props():
@@ -39,6 +90,9 @@ class Template(AWSObject):
                 prop('Resources',  odict),
                 prop('Outputs',    odict)]
 
+    # The collections are changed in place as objects are added
+    cache_digest = False
+
     __collections = ['parameters', 'mappings', 'conditions',
                      'resources', 'outputs']
 
@@ -46,14 +100,50 @@ class Template(AWSObject):
         for attr in Template.__collections:
             kwargs.setdefault(attr, odict())
         super(Template, self).__init__(*args, **kwargs)
+        self.__dict__['_graph'] = DependencyGraph()
+        self.__dict__['_rule_tables'] = odict()
 
     def __copy__(self):
         result = super_copy(Template, self)
         for attr in Template.__collections:
             orig = getattr(result, attr)
             setattr(result, attr, copy.copy(orig))
+        result.__dict__['_graph'] = copy.copy(self._graph)
+        result.__dict__['_rule_tables'] = copy.copy(self._rule_tables)
         return result
 
+    @property
+    def graph(self):
+        """The DependencyGraph of the objects added to this template,
+        maintained as they are added.
+
+        """
+        return self._graph
+
+    @property
+    def rule_tables(self):
+        """The RuleTables added to this template, by name. Their rules
+        follow the resources in the Resources section.
+
+        """
+        return self._rule_tables
+
+    def __json__(self):
+        data = super(Template, self).__json__()
+        if self._rule_tables:
+            data['Resources'] = odict(self.__resources().iteritems())
+        return data
+
+    def __cached_json__(self):
+        # The rules of the tables are materialized for each render and
+        # not kept, so the form is only cached without tables
+        if self._rule_tables:
+            return self.__json__()
+        return super(Template, self).__cached_json__()
+
+    def __resources(self):
+        return ResourcesView(self.resources, self._rule_tables)
+
     def __str__(self):
         return self.to_json()
 
@@ -70,8 +160,17 @@ class Template(AWSObject):
 
     def __add(self, *items):
         for item in items:
+            if isinstance(item, Bulk):
+                self.__add(*item.objects)
+                continue
+            if isinstance(item, RuleTable):
+                self._rule_tables[item.object_name] = item
+                self._graph.add(item.object_name, item)
+                self.__dict__.pop('_json', None)
+                continue
             coll = self.__collection_for(item)
             coll[item.object_name] = item
+            self._graph.add(item.object_name, item)
             self.__add(*item.siblings())
 
     def __collection_for(self, item):
@@ -104,8 +203,122 @@ class Template(AWSObject):
         self._ensure_present('outputs')
         self.outputs[name] = output
 
-    def to_json(self, indent=2):
-        return json.dumps(self, cls=JSONEncoder, indent=indent, separators=(',', ': '))
+    def to_json(self, indent=2, separators=(',', ': '), cache=None, check_rules=False):
+        """Returns the JSON form of this template. If a RenderCache is
+        given, the output is looked up by the content hash of the
+        template and serialized only on a miss.
+
+        If check_rules is true, first raises a RuleCheckError if
+        rulecheck.check_rules() reports shadowed, redundant, or
+        duplicate NetworkAcl or SecurityGroup rules.
+
+        """
+        if check_rules:
+            issues = rulecheck.check_rules(self)
+            if issues:
+                raise rulecheck.RuleCheckError(issues)
+        if cache is not None:
+            return cache.render(self, indent=indent, separators=separators)
+        return json.dumps(self, cls=JSONEncoder, indent=indent, separators=separators)
+
+    def diff(self, other):
+        """Returns the ChangeSet from other, e.g., the JSON text of a
+        previous render, to this template. See changes.diff().
+
+        """
+        return changes.diff(other, self)
+
+    def dump(self, fp, indent=2, separators=(',', ': ')):
+        """Writes the JSON form of this template to the file-like object
+        fp. The output is identical to to_json() for the same indent
+        and separators, but is streamed to fp in chunks instead of
+        being built as a single string, and the rules of rule tables
+        are materialized one at a time as they are written. Use
+        indent=None and separators=(',', ':') for compact output.
+
+        """
+        encoder = JSONEncoder(indent=indent, separators=separators)
+        form = self
+        if self._rule_tables:
+            # Stream the rules of the tables, materializing each as it
+            # is written instead of all of them up front
+            form = super(Template, self).__json__()
+            form['Resources'] = self.__resources()
+        write_chunks(encoder.iterencode(form), fp)
+
+    def dump_incremental(self, path, indent=2, separators=(',', ': ')):
+        """Writes the JSON form of this template to the file path, as
+        to_json() would, copying the resources unchanged since the
+        last call for path from the previous output. Returns the
+        IncrementalRenderer, whose stats() count the entries reused.
+
+        """
+        renderer = IncrementalRenderer(path, indent=indent, separators=separators)
+        renderer.render(self)
+        return renderer
+
+    def to_compact_json(self, limit=None):
+        """Returns the minified JSON form of this template, identical to
+        to_json(indent=None, separators=(',', ':')). Subtrees shared by
+        several resources, like tags and policies, are serialized
+        once and reused.
+
+        If limit is given, e.g., Template.MAX_BODY_SIZE, raises a
+        TemplateSizeError with a per-section and per-resource size
+        breakdown as soon as the result would be larger.
+
+        """
+        return self.__compact(limit)[0]
+
+    def sizes(self):
+        """Returns the TemplateSizes of the compact JSON form of this
+        template.
+
+        """
+        return self.__compact()[1]
+
+    def __compact(self, limit=None):
+        # Each entry is serialized exactly once; section and total
+        # sizes are summed from the entry fragments as they are made,
+        # so a limit is checked before the text is built.
+        encoder  = CompactEncoder(share=shared_fragment)
+        key      = json.encoder.encode_basestring_ascii
+        sections = odict()
+        entries  = odict()
+        chunks   = []
+        total    = [2]   # the braces
+
+        def grow(size):
+            total[0] += size
+            if limit is not None and total[0] > limit:
+                raise TemplateSizeError(limit, TemplateSizes(total[0], sections, entries))
+
+        for name, value in json_form(self).iteritems():
+            head = key(name) + ':'
+            grow(len(head) + (1 if chunks else 0))
+            if isinstance(value, dict):
+                sizes = entries[name] = odict()
+                fragments = []
+                sections[name] = 2
+                grow(2)
+                for k, v in value.iteritems():
+                    fragment = key(k) + ':' + encoder.encode(v)
+                    size = len(fragment) + (1 if fragments else 0)
+                    sizes[k] = len(fragment)
+                    sections[name] += size
+                    fragments.append(fragment)
+                    grow(size)
+                body = '{' + ','.join(fragments) + '}'
+            else:
+                body = encoder.encode(value)
+                sections[name] = len(body)
+                grow(len(body))
+            chunks.append(head + body)
+        text = '{' + ','.join(chunks) + '}'
+        return text, TemplateSizes(len(text), sections, entries)
+
+Template.MAX_BODY_SIZE = 51200
+Template.MAX_S3_SIZE   = 460800
 
 #### Public API ####
 template = Template
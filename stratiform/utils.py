@@ -12,7 +12,19 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
-import copy, json, re
+import copy, hashlib, json, re, weakref
+
+from stratiform._tables import CAMEL_CASE, SNAKE_CASE
+
+def json_form(obj):
+    """Returns the serializable form of obj, from its __cached_json__()
+    method if it has one and otherwise from its __json__() method.
+
+    """
+    cached = getattr(obj, '__cached_json__', None)
+    if cached is not None:
+        return cached()
+    return obj.__json__()
 
 class JSONEncoder(json.JSONEncoder):
     """A JSONEncoder that calls the __json__() method, if it exists, to
@@ -21,18 +33,283 @@ class JSONEncoder(json.JSONEncoder):
     """
     def default(self, obj):
         if hasattr(obj, '__json__'):
-            return obj.__json__()
+            return json_form(obj)
         return super(JSONEncoder, self).default(obj)
 
+class CompactEncoder(object):
+    """Encodes objects as whitespace-free JSON, identical to
+    json.dumps(obj, cls=JSONEncoder, separators=(',', ':')).
+
+    Unlike the standard encoder, the fragment produced for an object
+    for which share(obj) is true is cached and reused each time the
+    same object is encountered again, so subtrees shared by many
+    resources are serialized only once per encoder.
+
+    """
+    def __init__(self, share=None):
+        self.share = share or (lambda obj: False)
+        self.memo  = {}
+
+    def encode(self, obj):
+        chunks = []
+        self._encode(obj, chunks.append)
+        return ''.join(chunks)
+
+    def _encode(self, o, emit):
+        if isinstance(o, basestring):
+            emit(json.encoder.encode_basestring_ascii(o))
+        elif o is None:
+            emit('null')
+        elif o is True:
+            emit('true')
+        elif o is False:
+            emit('false')
+        elif isinstance(o, (int, long)):
+            emit(str(o))
+        elif isinstance(o, float):
+            emit(self._float(o))
+        elif isinstance(o, (list, tuple)):
+            emit('[')
+            for i, v in enumerate(o):
+                if i:
+                    emit(',')
+                self._encode(v, emit)
+            emit(']')
+        elif isinstance(o, dict):
+            emit('{')
+            for i, (k, v) in enumerate(o.iteritems()):
+                if i:
+                    emit(',')
+                emit(json.encoder.encode_basestring_ascii(self._key(k)))
+                emit(':')
+                self._encode(v, emit)
+            emit('}')
+        elif hasattr(o, '__json__'):
+            if self.share(o):
+                emit(self._shared(o))
+            else:
+                self._encode(json_form(o), emit)
+        else:
+            raise TypeError(repr(o) + " is not JSON serializable")
+
+    def _shared(self, o):
+        # The memo holds a reference to o so its id cannot be reused
+        entry = self.memo.get(id(o))
+        if entry is None:
+            entry = (o, self.encode(json_form(o)))
+            self.memo[id(o)] = entry
+        return entry[1]
+
+    def _key(self, k):
+        if isinstance(k, basestring):
+            return k
+        elif isinstance(k, float):
+            return self._float(k)
+        elif k is True:
+            return 'true'
+        elif k is False:
+            return 'false'
+        elif k is None:
+            return 'null'
+        elif isinstance(k, (int, long)):
+            return str(k)
+        raise TypeError("key " + repr(k) + " is not a string")
+
+    @staticmethod
+    def _float(o):
+        if o != o:
+            return 'NaN'
+        elif o == float('inf'):
+            return 'Infinity'
+        elif o == -float('inf'):
+            return '-Infinity'
+        return json.encoder.FLOAT_REPR(o)
+
+class Fingerprint(object):
+    """Computes content hashes of the object graph that JSONEncoder would
+    serialize, without encoding it.
+
+    The hash walks the same tree as the encoder, calling __json__()
+    where it exists, and is built bottom-up: the digest of each object
+    with a __json__() method is cached, so an object shared by many
+    parents is hashed only once per Fingerprint. Two graphs with the
+    same digest serialize to the same JSON.
+
+    The digest of an object whose serializable form is cached (see
+    AWSObject.__cached_json__) is also stored in the object, with the
+    objects its form holds and their digests, and is dropped with the
+    form when an attribute is set. A later Fingerprint reuses it while
+    those objects keep their digests, so hashing an unchanged graph
+    again costs about one lookup per object.
+
+    """
+    def __init__(self):
+        self.memo = {}
+
+    def digest(self, obj):
+        """Returns the hex digest of obj.
+        """
+        return self._digest(obj, [])
+
+    def _digest(self, obj, children):
+        h = hashlib.sha1()
+        self._update(h, obj, children)
+        return h.hexdigest()
+
+    def _update(self, h, o, children):
+        if isinstance(o, basestring):
+            if isinstance(o, unicode):
+                o = o.encode('utf-8')
+            h.update('s%d:'%len(o))
+            h.update(o)
+        elif o is None or o is True or o is False:
+            h.update('c%r;'%o)
+        elif isinstance(o, (int, long, float)):
+            h.update('n%r;'%o)
+        elif isinstance(o, (list, tuple)):
+            h.update('l%d:'%len(o))
+            for v in o:
+                self._update(h, v, children)
+        elif isinstance(o, dict):
+            h.update('d%d:'%len(o))
+            for k, v in o.iteritems():
+                self._update(h, k, children)
+                self._update(h, v, children)
+        elif hasattr(o, '__json__'):
+            digest = self._object(o)
+            children.append((o, digest))
+            h.update('o')
+            h.update(digest)
+        else:
+            raise TypeError(repr(o) + " is not JSON serializable")
+
+    def _object(self, o):
+        # The memo holds a reference to o so its id cannot be reused
+        entry = self.memo.get(id(o))
+        if entry is None:
+            entry = (o, self._stored(o))
+            self.memo[id(o)] = entry
+        return entry[1]
+
+    def _stored(self, o):
+        """Returns the digest of o, reusing the one stored in o if the
+        objects its form holds still have the digests it was built
+        from.
+
+        """
+        stored = getattr(o, '__dict__', {}).get('_digest')
+        if stored is not None and all(self._object(c) == d for c, d in stored[1]):
+            return stored[0]
+        form = json_form(o)
+        children = []
+        digest = self._digest(form, children)
+        if getattr(o, 'cache_digest', False) and o.__dict__.get('_json') is form:
+            o.__dict__['_digest'] = (digest, children)
+        return digest
+
+def write_chunks(chunks, fp, buffer_size=64 * 1024):
+    """Writes the string chunks to the file-like object fp, coalescing
+    them into writes of roughly buffer_size characters.
+
+    """
+    buf, size = [], 0
+    for chunk in chunks:
+        buf.append(chunk)
+        size += len(chunk)
+        if size >= buffer_size:
+            fp.write(''.join(buf))
+            buf, size = [], 0
+    if buf:
+        fp.write(''.join(buf))
+
+class ConsList(object):
+    """An immutable, singly-linked list. Appending returns a new list in
+    O(1) that shares all existing cells with the original, so copies
+    of an object holding a ConsList never need to copy it.
+
+    """
+    __slots__ = ('head', 'tail', 'size')
+
+    def __init__(self, head=None, tail=None):
+        self.head = head
+        self.tail = tail
+        self.size = tail.size + 1 if tail is not None else 0
+
+    def append(self, item):
+        """Returns a new list with item appended.
+        """
+        return ConsList(item, self)
+
+    def to_list(self):
+        """Returns the items as a new list, in the order appended.
+        """
+        items = [None] * self.size
+        cell = self
+        for i in xrange(self.size - 1, -1, -1):
+            items[i] = cell.head
+            cell = cell.tail
+        return items
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return iter(self.to_list())
+ConsList.EMPTY = ConsList()
+
+class WrapperType(type):
+    """Metaclass for Wrapper that gives every subclass an empty
+    __slots__, unless it declares its own, so wrapper instances carry
+    no per-instance __dict__.
+
+    """
+    def __new__(mcs, name, bases, dct):
+        dct.setdefault('__slots__', ())
+        return super(WrapperType, mcs).__new__(mcs, name, bases, dct)
+
 class Wrapper(object):
     """Base class for wrapping a single object. This is used to refine
     the type of a wrapped object, while proxying the __str__() and
     __json__() through to the wrapped object.
 
+    Wrappers are immutable values. Instances wrapping the same
+    hashable value are interned, so cidr("10.0.0.0/16") always returns
+    the same object, and wrappers are hashable and compare equal by
+    class and wrapped value.
+
     """
+    __metaclass__ = WrapperType
+    __slots__ = ('wrapped', '__weakref__')
+
+    _interned = weakref.WeakValueDictionary()
+
+    def __new__(cls, *args):
+        if len(args) != 1:
+            return super(Wrapper, cls).__new__(cls)
+        key = (cls, type(args[0]), args[0])
+        try:
+            obj = Wrapper._interned.get(key)
+        except TypeError:
+            return super(Wrapper, cls).__new__(cls)
+        if obj is None:
+            obj = super(Wrapper, cls).__new__(cls)
+            Wrapper._interned[key] = obj
+        return obj
+
     def __init__(self, wrapped):
         self.wrapped = wrapped
 
+    def __eq__(self, other):
+        return type(self) is type(other) and \
+            type(self.wrapped) is type(other.wrapped) and \
+            self.wrapped == other.wrapped
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((type(self), self.wrapped))
+
     def __str__(self):
         return str(self.wrapped)
 
@@ -45,9 +322,12 @@ class ListWrapper(Wrapper):
     __json__() through to the wrapped list.
 
     If multiple arguments are supplied to the constructor, they are
-    merged into a single wrapped list.
+    merged into a single wrapped list. List wrappers are not interned.
 
     """
+    def __new__(cls, *args):
+        return object.__new__(cls)
+
     def __init__(self, *args):
         wrapped = []
         if len(args) == 1 and isinstance(args[0], list):
@@ -56,26 +336,67 @@ class ListWrapper(Wrapper):
             wrapped = args
         super(ListWrapper, self).__init__(wrapped)
 
+    def __hash__(self):
+        return hash((type(self), tuple(self.wrapped)))
+
 def class_name(obj):
     """Returns the class name of the specified object.
 
     """
     return obj.__class__.__name__
 
-def snake_case(string):
+class NameTable(object):
+    """A bounded memo of a name conversion, like snake_case, recording
+    its hits and misses. Conversions are stored until the table holds
+    max_size names; later misses are converted but not stored.
+
+    """
+    def __init__(self, convert, seed=None, max_size=8192):
+        self.convert  = convert
+        self.max_size = max_size
+        self.names    = dict(seed or {})
+        self.hits     = 0
+        self.misses   = 0
+
+    def __call__(self, name):
+        try:
+            result = self.names[name]
+        except KeyError:
+            self.misses += 1
+            result = self.convert(name)
+            if len(self.names) < self.max_size:
+                self.names[name] = result
+            return result
+        self.hits += 1
+        return result
+
+    def stats(self):
+        """Returns the hit and miss counters, the hit rate, and the size.
+        """
+        total = self.hits + self.misses
+        return {'hits'     : self.hits,
+                'misses'   : self.misses,
+                'hit_rate' : float(self.hits) / total if total else 0.0,
+                'size'     : len(self.names)}
+
+def to_snake_case(string):
     """Returns the snake_cased form of the specified string.
 
     """
     s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', string)
     return re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1).lower()
 
-def camel_case(string):
+def to_camel_case(string):
     """Returns the CamelCased form of the specified string.
 
     """
     components = string.split('_')
     return "".join(x.title() for x in components)
 
+# Memoized conversions, seeded with every name known to the package
+snake_case = NameTable(to_snake_case, SNAKE_CASE)
+camel_case = NameTable(to_camel_case, CAMEL_CASE)
+
 def shallow_copy(obj):
     """Returns a standard shallow copy of the object.
     """
@@ -102,6 +423,7 @@ def shallow_copy_attr(instance, attr):
 
 # API
 
-__all__ = ['JSONEncoder, Wrapper, ListWrapper', 'class_name',
-           'snake_case', 'camel_case', 'shallow_copy', 'super_copy',
+__all__ = ['json_form', 'JSONEncoder, Wrapper, ListWrapper', 'CompactEncoder', 'Fingerprint',
+           'ConsList', 'write_chunks', 'class_name', 'NameTable',
+           'snake_case', 'camel_case', 'to_snake_case', 'to_camel_case', 'shallow_copy', 'super_copy',
            'shallow_copy_attr']
@@ -0,0 +1,48 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import os, shutil, tempfile, unittest
+
+from stratiform import batch
+
+SCRIPT = '''\
+import sys
+from stratiform import *
+t = template("Batch " + sys.argv[1])
+'''
+
+class BatchTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.script = os.path.join(self.tmp, 'stack.py')
+        with open(self.script, 'w') as fp:
+            fp.write(SCRIPT)
+        self.exits = os.path.join(self.tmp, 'exits.py')
+        with open(self.exits, 'w') as fp:
+            fp.write('import sys\nsys.exit(3)\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_failures_are_reported_by_job(self):
+        jobs = [batch.Job(self.script, ['dev']), batch.Job(self.script),
+                batch.Job(self.exits)]
+        results = batch.render(jobs, os.path.join(self.tmp, 'out'), processes=2)
+        self.assertEqual([r.job.name for r in results], ['stack-dev', 'stack', 'exits'])
+        self.assertIsNone(results[0].error)
+        self.assertIn('IndexError', batch.summary(results[1].error))
+        self.assertIn('SystemExit', batch.summary(results[2].error))
+
+if __name__ == "__main__":
+    unittest.main()
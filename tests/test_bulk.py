@@ -0,0 +1,46 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import unittest
+
+from stratiform import *
+import stratiform.ec2 as ec2
+import stratiform.elb as elb
+
+class BulkTest(unittest.TestCase):
+    def setUp(self):
+        self.vpc = ec2.vpc("Vpc", cidr("10.0.0.0/16"))
+
+    def test_columns_are_spread(self):
+        zones  = [az('us-west-2a'), az('us-west-2b')]
+        blocks = [cidr("10.0.0.0/24"), cidr("10.0.1.0/24")]
+        subnets = ec2.subnet.bulk(['A', 'B'], vpc_id=self.vpc, availability_zone=column(zones),
+                                  cidr_block=column(blocks))
+        self.assertEqual([s.object_name for s in subnets], ['A', 'B'])
+        self.assertEqual([s.cidr_block for s in subnets], blocks)
+        self.assertEqual([s.availability_zone for s in subnets], zones)
+        self.assertTrue(all(s.vpc_id is self.vpc for s in subnets))
+
+    def test_lists_are_shared(self):
+        groups = [ec2.security_group("G1", self.vpc, "one"),
+                  ec2.security_group("G2", self.vpc, "two")]
+        lbs = elb.LoadBalancer.bulk(['Lb1', 'Lb2'], security_groups=groups)
+        self.assertEqual([lb.security_groups for lb in lbs], [groups, groups])
+
+    def test_column_length_must_match(self):
+        self.assertRaises(ValueError, ec2.subnet.bulk, ['A', 'B'],
+                          cidr_block=column([cidr("10.0.0.0/24")]))
+
+if __name__ == "__main__":
+    unittest.main()
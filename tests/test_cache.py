@@ -0,0 +1,92 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import os, shutil, tempfile, unittest
+
+from stratiform import *
+from stratiform.cache import RenderCache
+import stratiform.ec2 as ec2
+import stratiform.elb as elb
+
+def stack():
+    vpc    = ec2.vpc("Vpc", cidr("10.0.0.0/16"))
+    subnet = ec2.subnet("Subnet", vpc, az('us-west-2a'), cidr("10.0.0.0/24"))
+    sg     = ec2.security_group("Group", vpc, "A security group") \
+                .ingress("Http", tcp, cidr("10.0.0.0/24"), port(80))
+    t = template("Cache")
+    t.add(vpc, subnet, sg)
+    return t, vpc, subnet
+
+class RenderCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_hits_and_misses(self):
+        cache = RenderCache(self.path)
+        t, _, _ = stack()
+        self.assertEqual(t.to_json(cache=cache), t.to_json())
+        self.assertEqual(t.to_json(cache=cache), t.to_json())
+        self.assertEqual(t.to_json(indent=None, cache=cache), t.to_json(indent=None))
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 2, 'evictions': 0})
+
+    def test_key_follows_changes(self):
+        cache = RenderCache(self.path)
+        t, vpc, subnet = stack()
+        key = cache.key(t)
+        self.assertIn('_digest', subnet.__dict__)
+        self.assertEqual(cache.key(t), key)
+        vpc.cidr_block = cidr("10.1.0.0/16")
+        self.assertNotIn('_digest', vpc.__dict__)
+        changed = cache.key(t)
+        self.assertNotEqual(changed, key)
+        # The subnet refers to the vpc by name only
+        vpc.object_name = "Network"
+        self.assertNotEqual(cache.key(t), changed)
+        self.assertEqual(t.to_json(cache=cache), t.to_json())
+
+    def test_nested_change_invalidates_parent(self):
+        cache = RenderCache(self.path)
+        t, _, subnet = stack()
+        listener = elb.Listener(instance_port="80", load_balancer_port="80", protocol="HTTP")
+        t.add(elb.LoadBalancer("Elb", listeners=[listener], subnets=[ref(subnet)]))
+        key = cache.key(t)
+        listener.instance_port = "8080"
+        self.assertNotEqual(cache.key(t), key)
+        self.assertEqual(t.to_json(cache=cache), t.to_json())
+
+    def test_evicts_least_recently_used(self):
+        cache = RenderCache(self.path, max_entries=3)
+        for i, key in enumerate(['a', 'b', 'c']):
+            cache.put(key, key)
+            os.utime(cache._entry(key), (1000 * (i + 1), 1000 * (i + 1)))
+        self.assertEqual(cache.get('a'), 'a')
+        cache.put('d', 'd')
+        self.assertEqual(cache.evictions, 1)
+        self.assertIsNone(cache.get('b'))
+        for key in ['a', 'c', 'd']:
+            self.assertEqual(cache.get(key), key)
+        self.assertEqual(cache.stats(), {'hits': 4, 'misses': 1, 'evictions': 1})
+
+    def test_evicts_over_max_bytes(self):
+        cache = RenderCache(self.path, max_entries=None, max_bytes=10)
+        cache.put('a', 'x' * 6)
+        cache.put('b', 'y' * 6)
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(len(os.listdir(self.path)), 1)
+
+if __name__ == "__main__":
+    unittest.main()
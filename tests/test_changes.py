@@ -0,0 +1,112 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import copy, json, unittest
+
+from cStringIO import StringIO
+
+from stratiform import *
+from stratiform.changes import Change, diff
+from stratiform.parameters import Parameter
+from stratiform.utils import Fingerprint, JSONEncoder
+import stratiform.ec2 as ec2
+import stratiform.elb as elb
+
+def stack():
+    vpc    = ec2.vpc("Vpc", cidr("10.0.0.0/16"))
+    subnet = ec2.subnet("Subnet", vpc, az('us-west-2a'), cidr("10.0.0.0/24"))
+    http   = elb.Listener(instance_port="80", load_balancer_port="80", protocol="HTTP")
+    t = template("Diff")
+    t.add(vpc, subnet, elb.LoadBalancer("Elb", listeners=[http], subnets=[ref(subnet)]))
+    t.add(output("VpcId", value=vpc))
+    return t
+
+def entry_changes(changes, section, name):
+    return [(c.kind, c.path, c.old, c.new) for c in changes.modified[section][name]]
+
+class DiffTest(unittest.TestCase):
+    def check_sides(self, old, new, check):
+        # Template against Template, JSON text, a file and a parsed form
+        for previous in (old, old.to_json(), StringIO(old.to_json()), json.loads(old.to_json())):
+            check(new.diff(previous))
+
+    def test_unchanged(self):
+        t = stack()
+        self.check_sides(t, t, lambda changes: self.assertFalse(changes))
+
+    def test_added_and_removed_ids(self):
+        old = stack()
+        new = copy.copy(old)
+        vpc = new.resources['Vpc']
+        del new.resources['Subnet']
+        new.add(ec2.subnet("Other", vpc, az('us-west-2b'), cidr("10.0.1.0/24")))
+        new.add(parameter("Size", type=Parameter.Type.String))
+        del new.outputs['VpcId']
+        def check(changes):
+            self.assertEqual(changes.added['Resources'], ['Other'])
+            self.assertEqual(changes.removed['Resources'], ['Subnet'])
+            self.assertEqual(changes.added['Parameters'], ['Size'])
+            self.assertEqual(changes.removed['Outputs'], ['VpcId'])
+            self.assertEqual(changes.modified['Resources'], {})
+        self.check_sides(old, new, check)
+
+    def test_nested_paths(self):
+        old = stack()
+        new = copy.copy(old)
+        balancer = new.resources['Elb']
+        http = balancer.listeners[0]
+        https = elb.Listener(instance_port="443", load_balancer_port="443", protocol="TCP")
+        new.resources['Elb'] = balancer(listeners=[http(instance_port="8080"), https])
+        new.description = "Changed"
+        def check(changes):
+            listeners = ('Properties', 'Listeners')
+            self.assertEqual(entry_changes(changes, 'Resources', 'Elb'),
+                             [(Change.MODIFIED, listeners + (0, 'InstancePort'), '80', '8080'),
+                              (Change.ADDED, listeners + (1,), None,
+                               json.loads(json.dumps(https, cls=JSONEncoder)))])
+            self.assertEqual([(c.kind, c.path) for c in changes.other],
+                             [(Change.MODIFIED, ('Description',))])
+            self.assertEqual(list(changes.modified['Resources']), ['Elb'])
+        self.check_sides(old, new, check)
+
+    def test_copy_skips_identical_objects(self):
+        old = stack()
+        new = copy.copy(old)
+        for name, resource in old.resources.iteritems():
+            self.assertIs(new.resources[name], resource)
+        new.resources['Subnet'] = new.resources['Subnet'](cidr_block=cidr("10.0.9.0/24"))
+        hashed = []
+        digest = Fingerprint.digest
+        def counting(fingerprint, obj):
+            hashed.append(obj)
+            return digest(fingerprint, obj)
+        Fingerprint.digest = counting
+        try:
+            changes = new.diff(old)
+        finally:
+            Fingerprint.digest = digest
+        self.assertEqual(list(changes.modified['Resources']), ['Subnet'])
+        self.assertEqual(hashed, [old.resources['Subnet'], new.resources['Subnet']])
+
+    def test_bool_and_int_differ(self):
+        old = {'Resources' : {'Vpc' : {'Type' : 'AWS::EC2::VPC',
+                                       'Properties' : {'EnableDnsSupport' : 1}}}}
+        new = {'Resources' : {'Vpc' : {'Type' : 'AWS::EC2::VPC',
+                                       'Properties' : {'EnableDnsSupport' : True}}}}
+        for changes in (diff(json.dumps(old), json.dumps(new)), diff(old, new)):
+            self.assertEqual(entry_changes(changes, 'Resources', 'Vpc'),
+                             [(Change.MODIFIED, ('Properties', 'EnableDnsSupport'), 1, True)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import unittest
+
+from stratiform import *
+from stratiform.cidrs import Allocator, AllocationError
+
+class AllocatorTest(unittest.TestCase):
+    def test_allocates_lowest_free_block(self):
+        a = Allocator(cidr("10.20.0.0/16"))
+        a.reserve(cidr("10.20.128.0/24"))
+        self.assertEqual(str(a.allocate(24)), "10.20.0.0/24")
+        self.assertEqual([str(b) for b in a.allocate_many(23, 2)], ["10.20.2.0/23", "10.20.4.0/23"])
+        self.assertEqual(str(a.allocate(24)), "10.20.1.0/24")
+
+    def test_reserve_and_exhaustion(self):
+        a = Allocator(cidr("10.0.0.0/24"))
+        a.reserve(cidr("10.0.0.64/26"))
+        self.assertRaises(AllocationError, a.reserve, cidr("10.0.0.96/27"))
+        self.assertEqual([str(b) for b in a.allocate_many(26, 3)],
+                         ["10.0.0.0/26", "10.0.0.128/26", "10.0.0.192/26"])
+        self.assertEqual(a.available(), 0)
+        self.assertRaises(AllocationError, a.allocate, 32)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import unittest
+
+from stratiform import *
+import stratiform.ec2 as ec2
+
+class CompactTest(unittest.TestCase):
+    def group(self):
+        vpc = ec2.vpc("Vpc", cidr("10.0.0.0/16"))
+        sg  = ec2.security_group("Group", vpc, "A security group") \
+                 .ingress("Low",  tcp, cidr("10.0.0.0/25"),   port(80)) \
+                 .ingress("High", tcp, cidr("10.0.0.128/25"), port(80))
+        return vpc, sg
+
+    def test_adjacent_blocks_merge(self):
+        _, sg = self.group()
+        rules = sg.compact().siblings()
+        self.assertEqual(len(rules), 1)
+        self.assertEqual(rules[0].cidr_ip, cidr("10.0.0.0/24"))
+
+    def test_compact_after_render(self):
+        vpc, sg = self.group()
+        t = template("Compact after render")
+        t.add(vpc, sg)
+        t.to_json()
+        self.assertEqual(len(sg.compact().siblings()), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import json, unittest
+
+from collections import OrderedDict as odict
+
+from stratiform import *
+from stratiform.templates import Template, TemplateSizeError
+import stratiform.ec2 as ec2
+
+from tests.test_dump import example_templates
+
+def subnets(n):
+    vpc = ec2.vpc("Vpc", cidr("10.0.0.0/16"))
+    t = template("Sizes")
+    t.add(vpc)
+    for i in xrange(n):
+        t.add(ec2.subnet("Subnet%d"%i, vpc, az('us-west-2a'), cidr("10.0.%d.0/24"%i)))
+    return t
+
+class CompactJsonTest(unittest.TestCase):
+    def test_matches_to_json_for_examples(self):
+        for name, t in example_templates():
+            text = t.to_compact_json()
+            self.assertEqual(text, t.to_json(indent=None, separators=(',', ':')), name)
+            sizes = t.sizes()
+            self.assertEqual(sizes.total, len(text), name)
+            data = json.loads(text, object_pairs_hook=odict)
+            for section, size in sizes.sections.iteritems():
+                self.assertEqual(size, len(json.dumps(data[section], separators=(',', ':'))), name)
+            for section, entries in sizes.entries.iteritems():
+                self.assertEqual(list(entries), list(data[section]), name)
+
+    def test_limit(self):
+        t = subnets(20)
+        size = len(t.to_compact_json())
+        self.assertEqual(t.to_compact_json(limit=size), t.to_compact_json())
+        self.assertRaises(TemplateSizeError, t.to_compact_json, limit=size - 1)
+        self.assertEqual(t.to_compact_json(limit=Template.MAX_BODY_SIZE), t.to_compact_json())
+
+    def test_limit_fails_fast(self):
+        t = subnets(200)
+        with self.assertRaises(TemplateSizeError) as raised:
+            t.to_compact_json(limit=1000)
+        sizes = raised.exception.sizes
+        self.assertGreater(sizes.total, 1000)
+        # Only the resources rendered before the limit was passed
+        self.assertLess(len(sizes.resources), 20)
+        last = sizes.resources.values()[-1]
+        self.assertLessEqual(sizes.total - last - 1, 1000)
+        self.assertIn("Largest resources:", str(raised.exception))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import glob, os, runpy, sys, unittest
+
+from cStringIO import StringIO
+
+EXAMPLES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'example')
+
+# (indent, separators) pairs checked for each example
+OPTIONS = [(2, (',', ': ')), (None, (',', ':')), (4, (', ', ': '))]
+
+def example_templates():
+    """Yields the (script name, template) of each script in example/,
+    run as 'script dev'.
+
+    """
+    argv, path = sys.argv, list(sys.path)
+    sys.path.insert(0, EXAMPLES)
+    try:
+        for script in sorted(glob.glob(os.path.join(EXAMPLES, '*.py'))):
+            name = os.path.basename(script)
+            if name == 'common.py':
+                continue
+            sys.argv = [script, 'dev']
+            yield name, runpy.run_path(script, run_name='example')['t']
+    finally:
+        sys.argv, sys.path[:] = argv, path
+
+class DumpTest(unittest.TestCase):
+    def test_dump_matches_to_json_for_examples(self):
+        count = 0
+        for name, t in example_templates():
+            for indent, separators in OPTIONS:
+                fp = StringIO()
+                t.dump(fp, indent=indent, separators=separators)
+                self.assertEqual(fp.getvalue(), t.to_json(indent=indent, separators=separators),
+                                 "%s with indent=%r"%(name, indent))
+            count += 1
+        self.assertEqual(count, len(glob.glob(os.path.join(EXAMPLES, '*.py'))) - 1)
+
+if __name__ == "__main__":
+    unittest.main()
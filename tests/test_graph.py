@@ -0,0 +1,54 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import unittest
+
+from stratiform import *
+from stratiform.graph import references
+import stratiform.ec2 as ec2
+import stratiform.functions as fn
+
+class ReferencesTest(unittest.TestCase):
+    def test_references_inside_unnamed_objects(self):
+        vpc    = ec2.vpc("Vpc", cidr("10.0.0.0/16"))
+        source = ec2.security_group("Source", vpc, "Source group")
+        subnet = ec2.subnet("Subnet", vpc, az('us-west-2a'), cidr("10.0.0.0/24"))
+        inline = ec2.SecurityGroupIngress(ip_protocol=tcp, port_range=port(80),
+                                          source_security_group_id=source,
+                                          cidr_ip=fn.get_att(subnet, 'CidrBlock'))
+        group  = ec2.security_group("Group", vpc, "A group", security_group_ingress=[inline])
+        found  = set(references(group))
+        self.assertIn(('Ref', 'Vpc'), found)
+        self.assertIn(('Ref', 'Source'), found)
+        self.assertIn(('GetAtt', 'Subnet'), found)
+
+        t = template("Graph")
+        t.add(group, subnet, source, vpc)
+        order = t.graph.topological_order()
+        self.assertLess(order.index('Source'), order.index('Group'))
+        self.assertLess(order.index('Subnet'), order.index('Group'))
+
+    def test_output_named_like_its_resource(self):
+        vpc    = ec2.vpc("Vpc", cidr("10.0.0.0/16"))
+        subnet = ec2.subnet("Subnet", vpc, az('us-west-2a'), cidr("10.0.0.0/24"))
+        t = template("Graph")
+        t.add(vpc, subnet)
+        t.add(output("Vpc", value=vpc), output("Subnet", value=subnet))
+        self.assertIs(t.graph.nodes['Vpc'], vpc)
+        self.assertEqual(t.graph.dependents('Vpc'), set(['Subnet']))
+        self.assertEqual(t.graph.dependencies(t.outputs['Vpc']), set(['Vpc']))
+        self.assertEqual(t.graph.topological_order(), ['Vpc', 'Subnet'])
+
+if __name__ == "__main__":
+    unittest.main()
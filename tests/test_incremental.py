@@ -0,0 +1,110 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import os, shutil, tempfile, unittest
+
+from stratiform import *
+import stratiform.ec2 as ec2
+
+from tests.test_dump import OPTIONS
+
+def stack(n=5):
+    vpc = ec2.vpc("Vpc", cidr("10.0.0.0/16"))
+    t = template("Incremental")
+    t.add(vpc)
+    for i in xrange(n):
+        t.add(ec2.subnet("Subnet%d"%i, vpc, az('us-west-2a'), cidr("10.0.%d.0/24"%i)))
+    t.add(output("VpcId", value=vpc))
+    return t, vpc
+
+class IncrementalTest(unittest.TestCase):
+    def setUp(self):
+        self.dir  = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'stack.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def render(self, t, reused, indent=2, separators=(',', ': ')):
+        stats = t.dump_incremental(self.path, indent=indent, separators=separators).stats()
+        with open(self.path) as fp:
+            self.assertEqual(fp.read(), t.to_json(indent=indent, separators=separators))
+        self.assertEqual(stats['reused'], reused)
+        return stats
+
+    def test_first_render(self):
+        t, _ = stack()
+        self.assertEqual(self.render(t, 0)['rendered'], 7)
+        self.render(t, 7)
+
+    def test_changed_property(self):
+        t, _ = stack()
+        self.render(t, 0)
+        t.resources['Subnet2'].cidr_block = cidr("10.0.99.0/24")
+        self.assertEqual(self.render(t, 6)['rendered'], 1)
+
+    def test_added_and_removed_resources(self):
+        t, vpc = stack()
+        self.render(t, 0)
+        t.add(ec2.subnet("Subnet9", vpc, az('us-west-2b'), cidr("10.0.9.0/24")))
+        self.assertEqual(self.render(t, 7)['rendered'], 1)
+        del t.resources['Subnet0']
+        del t.resources['Subnet1']
+        self.assertEqual(self.render(t, 6)['rendered'], 0)
+
+    def test_changed_description(self):
+        t, _ = stack()
+        self.render(t, 0)
+        t.description = "Changed"
+        self.render(t, 7)
+
+    def test_rule_tables(self):
+        t, vpc = stack()
+        sg = ec2.security_group("Group", vpc, "A security group")
+        rules = sg.rules()
+        for i in xrange(3):
+            rules.ingress("Rule%d"%i, tcp, cidr("10.1.%d.0/24"%i), port(1024 + i))
+        t.add(sg, rules)
+        self.render(t, 0)
+        self.render(t, 11)
+        rules.ingress("Rule3", tcp, cidr("10.1.3.0/24"), port(1027))
+        self.render(t, 11)
+
+    def test_indent_and_separators(self):
+        for indent, separators in OPTIONS:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            t, _ = stack()
+            self.render(t, 0, indent, separators)
+            t.resources['Subnet0'].cidr_block = cidr("10.0.99.0/24")
+            self.render(t, 6, indent, separators)
+            # Changed options invalidate the index
+            other = [o for o in OPTIONS if o != (indent, separators)][0]
+            self.render(t, 0, *other)
+
+    def test_stale_index_is_ignored(self):
+        t, _ = stack()
+        self.render(t, 0)
+        st = os.stat(self.path)
+        os.utime(self.path, (st.st_atime, st.st_mtime - 10))
+        self.render(t, 0)
+        with open(self.path, 'a') as fp:
+            fp.write('\n')
+        self.render(t, 0)
+        os.remove(self.path)
+        self.render(t, 0)
+        self.render(t, 7)
+
+if __name__ == "__main__":
+    unittest.main()
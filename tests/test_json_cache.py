@@ -0,0 +1,70 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import json, os, subprocess, sys, unittest
+
+from stratiform import *
+from stratiform.base import AWSObject
+import stratiform.ec2 as ec2
+import stratiform.elb as elb
+
+def stack():
+    vpc    = ec2.vpc("Vpc", cidr("10.0.0.0/16"))
+    subnet = ec2.subnet("Subnet", vpc, az('us-west-2a'), cidr("10.0.0.0/24"))
+    t = template("Cache")
+    t.add(vpc, subnet)
+    return t, vpc, subnet
+
+class JsonCacheTest(unittest.TestCase):
+    def test_setattr_invalidates(self):
+        t, vpc, subnet = stack()
+        t.to_json()
+        self.assertIn('_json', subnet.__dict__)
+        subnet.cidr_block = cidr("10.0.1.0/24")
+        self.assertNotIn('_json', subnet.__dict__)
+        resources = json.loads(t.to_json())['Resources']
+        self.assertEqual(resources['Subnet']['Properties']['CidrBlock'], "10.0.1.0/24")
+        # References follow a renamed object
+        vpc.object_name = "Network"
+        resources = json.loads(t.to_json())['Resources']
+        self.assertEqual(resources['Subnet']['Properties']['VpcId'], {'Ref': "Network"})
+
+    def test_nested_objects_render_their_own_changes(self):
+        t, _, subnet = stack()
+        listener = elb.Listener(instance_port="80", load_balancer_port="80", protocol="HTTP")
+        t.add(elb.LoadBalancer("Elb", listeners=[listener], subnets=[ref(subnet)]))
+        t.to_json()
+        listener.instance_port = "8080"
+        resources = json.loads(t.to_json())['Resources']
+        self.assertEqual(resources['Elb']['Properties']['Listeners'][0]['InstancePort'], "8080")
+
+    def test_disabled(self):
+        enabled, AWSObject.cache_json = AWSObject.cache_json, False
+        try:
+            t, vpc, subnet = stack()
+            text = t.to_json()
+            for obj in (t, vpc, subnet):
+                self.assertNotIn('_json', obj.__dict__)
+        finally:
+            AWSObject.cache_json = enabled
+        self.assertEqual(t.to_json(), text)
+
+    def test_environment_switch(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, STRATIFORM_NO_JSON_CACHE='1')
+        script = "from stratiform.base import AWSObject; assert not AWSObject.cache_json"
+        self.assertEqual(subprocess.call([sys.executable, '-c', script], cwd=root, env=env), 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import json, unittest
+
+from cStringIO import StringIO
+
+from stratiform import *
+from stratiform.loader import Loader, RawResource, loads
+from stratiform.utils import JSONEncoder
+import stratiform.ec2 as ec2
+import stratiform.functions as fn
+
+from tests.test_dump import example_templates
+
+def raw_template(resources):
+    return json.dumps({'AWSTemplateFormatVersion' : '2010-09-09',
+                       'Resources' : resources})
+
+class LoaderTest(unittest.TestCase):
+    def test_examples_round_trip(self):
+        for name, t in example_templates():
+            text = t.to_json()
+            self.assertEqual(loads(text).to_json(), text, name)
+
+    def test_small_chunks(self):
+        for name, t in example_templates():
+            text = t.to_json()
+            loaded = Loader(StringIO(text), chunk_size=7).load()
+            self.assertEqual(loaded.to_json(), text, name)
+
+    def test_non_ascii_split_across_chunks(self):
+        description = u'Caf\xe9 \u2615 stack'
+        data = {'Description' : description,
+                'Resources'   : {'Vpc' : {'Type'       : 'AWS::EC2::VPC',
+                                          'Properties' : {'CidrBlock' : '10.0.0.0/16'}}}}
+        escaped = json.dumps(data)
+        raw     = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        for text in (escaped, raw):
+            for chunk_size in xrange(1, 12):
+                t = Loader(StringIO(text), chunk_size=chunk_size).load()
+                self.assertEqual(t.description, description)
+                self.assertEqual(json.loads(t.to_json())['Resources'], data['Resources'])
+
+    def test_raw_fallbacks(self):
+        resources = {
+            'Vpc'    : {'Type'       : 'AWS::EC2::VPC',
+                        'Properties' : {'CidrBlock' : '10.0.0.0/16'}},
+            'Subnet' : {'Type'       : 'AWS::EC2::Subnet',
+                        'DependsOn'  : 'Vpc',
+                        'Properties' : {'VpcId'     : {'Ref' : 'Vpc'},
+                                        'CidrBlock' : '10.0.0.0/24'}},
+            'Ingress': {'Type'       : 'AWS::EC2::SecurityGroupIngress',
+                        'Properties' : {'GroupId'    : 'sg-12345678',
+                                        'IpProtocol' : 'tcp',
+                                        'CidrIp'     : '10.0.0.0/24',
+                                        'FromPort'   : 80,
+                                        'ToPort'     : 80}},
+            'Thing'  : {'Type'       : 'Custom::Thing',
+                        'Properties' : {'Target' : {'Ref' : 'Subnet'}}}}
+        text = raw_template(resources)
+        t = loads(text)
+        self.assertIsInstance(t.resources['Vpc'], ec2.VPC)
+        for name in ['Subnet', 'Ingress', 'Thing']:
+            self.assertIsInstance(t.resources[name], RawResource, name)
+        self.assertEqual(t.resources['Thing'].resource_type, 'Custom::Thing')
+        self.assertEqual(json.loads(t.to_json())['Resources'], json.loads(text)['Resources'])
+        # References to raw resources still resolve to them
+        self.assertEqual(t.graph.dependencies('Thing'), set(['Subnet']))
+
+    def test_select(self):
+        select = fn.select("1", ["a", "b"])
+        self.assertEqual(json.loads(json.dumps(select, cls=JSONEncoder)),
+                         {'Fn::Select' : ['1', ['a', 'b']]})
+        text = raw_template({'Vpc' : {'Type'       : 'AWS::EC2::VPC',
+                                      'Properties' : {'CidrBlock' :
+                                          {'Fn::Select' : ['0', ['10.0.0.0/16', '10.1.0.0/16']]}}}})
+        t = loads(text)
+        self.assertIsInstance(t.resources['Vpc'].cidr_block, fn.Select)
+        self.assertEqual(json.loads(t.to_json())['Resources'], json.loads(text)['Resources'])
+
+if __name__ == "__main__":
+    unittest.main()
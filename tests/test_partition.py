@@ -0,0 +1,54 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import json, unittest
+
+from stratiform import *
+from stratiform.partition import partition
+import stratiform.ec2 as ec2
+
+class PartitionTest(unittest.TestCase):
+    def test_exports_do_not_clobber_outputs(self):
+        t = template("Partition")
+        vpc = ec2.vpc("Vpc", cidr("10.0.0.0/16"))
+        t.add(vpc, ec2.subnet("Subnet", vpc, az('us-west-2a'), cidr("10.0.0.0/24")))
+        t.add(output("VpcRef", value=vpc, description="Mine"))
+        p = partition(t, max_resources=1)
+        self.assertEqual(len(p.children), 2)
+        producer, consumer = [json.loads(c.to_json()) for c in p.children.values()]
+        if 'Vpc' not in producer['Resources']:
+            producer, consumer = consumer, producer
+        self.assertEqual(producer['Outputs']['VpcRef']['Description'], "Mine")
+        self.assertEqual(producer['Outputs']['VpcRef2']['Value'], {'Ref': 'Vpc'})
+        self.assertIn('Vpc', consumer['Parameters'])
+        stacks = json.loads(p.parent.to_json())['Resources']
+        imported = [s['Properties']['Parameters']['Vpc'] for s in stacks.values()
+                    if 'Vpc' in s['Properties'].get('Parameters', {})]
+        self.assertEqual(len(imported), 1)
+        self.assertEqual(imported[0]['Fn::GetAtt'][1], 'Outputs.VpcRef2')
+
+    def test_output_named_like_its_resource(self):
+        t = template("Partition")
+        vpc = ec2.vpc("Vpc", cidr("10.0.0.0/16"))
+        t.add(vpc, ec2.subnet("Subnet", vpc, az('us-west-2a'), cidr("10.0.0.0/24")))
+        t.add(output("Vpc", value=vpc))
+        p = partition(t, max_resources=1)
+        owners = [n for n, c in p.children.iteritems() if 'Vpc' in c.resources]
+        self.assertEqual(len(owners), 1)
+        self.assertIn('Vpc', p.children[owners[0]].outputs)
+        value = json.loads(p.parent.to_json())['Outputs']['Vpc']['Value']
+        self.assertEqual(value, {'Fn::GetAtt': [owners[0], 'Outputs.Vpc']})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import os, subprocess, sys, unittest
+
+from stratiform import registry
+from stratiform.loader import RawResource
+from stratiform.resources import Resource
+
+class RegistryTest(unittest.TestCase):
+    def test_lookup_imports_tabled_module(self):
+        # In a fresh interpreter, as other tests import the modules
+        script = "\n".join([
+            "import sys",
+            "from stratiform import registry",
+            "assert 'stratiform.rds' not in sys.modules",
+            "cls = registry.lookup('AWS::RDS::DBInstance')",
+            "assert 'stratiform.rds' in sys.modules",
+            "assert cls is sys.modules['stratiform.rds'].DBInstance"])
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.assertEqual(subprocess.call([sys.executable, '-c', script], cwd=root), 0)
+
+    def test_lookup_name(self):
+        import stratiform.ec2 as ec2
+        self.assertIs(registry.lookup_name('security_group_ingress'), ec2.SecurityGroupIngress)
+        self.assertIs(registry.lookup('AWS::EC2::Subnet'), ec2.Subnet)
+        self.assertIsNone(registry.lookup_name('no_such_resource'))
+        self.assertIs(registry.lookup('AWS::No::Such', RawResource), RawResource)
+        self.assertIn('AWS::EC2::Subnet', registry.resource_types())
+
+    def test_user_defined_resource_is_registered(self):
+        class CustomWidget(Resource):
+            resource_type = 'Custom::Widget'
+        self.assertIs(registry.lookup('Custom::Widget'), CustomWidget)
+        self.assertIs(registry.lookup_name('custom_widget'), CustomWidget)
+        self.assertIn('Custom::Widget', registry.resource_types())
+
+    def test_property_resource_type_is_not_registered(self):
+        self.assertFalse(any(cls is RawResource for cls in registry.resource_classes().values()))
+        self.assertIsNone(registry.lookup_name('raw_resource'))
+
+if __name__ == "__main__":
+    unittest.main()
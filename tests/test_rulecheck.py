@@ -0,0 +1,123 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import random, unittest
+
+from stratiform import *
+from stratiform.common import CIDR
+from stratiform.rulecheck import ALL_PROTOCOLS, MAX_PORT, Rule, RuleCheckError, RuleIssue, \
+                                 check_network_acl, check_rules, check_security_group
+import stratiform.ec2 as ec2
+
+PORTS = [(0, MAX_PORT), (80, 80), (0, 1023), (1024, MAX_PORT), (80, 90), (443, 443)]
+
+def covers(a, b):
+    """Whether rule a matches every packet rule b does."""
+    return (a.protocol == b.protocol or a.protocol == ALL_PROTOCOLS) and \
+           a.prefix <= b.prefix and b.network & CIDR.mask(a.prefix) == a.network and \
+           a.lo <= b.lo and b.hi <= a.hi
+
+def random_rules(rng, n, numbered):
+    rules = []
+    for i in xrange(n):
+        prefix   = rng.randint(16, 20)
+        network  = 10 << 24 | rng.randint(0, 15) << 12
+        protocol = rng.choice([6, 17, ALL_PROTOCOLS])
+        lo, hi   = rng.choice(PORTS) if protocol != ALL_PROTOCOLS else (0, MAX_PORT)
+        rules.append(Rule("Rule%d"%i, rng.randint(1, n) if numbered else None, protocol, lo, hi,
+                          CIDR.from_int(network & CIDR.mask(prefix), prefix),
+                          rng.choice(['allow', 'deny']) if numbered else 'allow'))
+    return rules
+
+class RuleCheckTest(unittest.TestCase):
+    def assertMatches(self, issues, expected, rules):
+        by_name = dict((r.name, r) for r in rules)
+        self.assertEqual(sorted((i.kind, i.name) for i in issues), sorted(expected))
+        for issue in issues:
+            rule, other = by_name[issue.name], by_name[issue.other]
+            if issue.kind == RuleIssue.DUPLICATE_NUMBER:
+                self.assertEqual(rule.number, other.number)
+            elif issue.kind == RuleIssue.DUPLICATE:
+                self.assertEqual(rule.key(), other.key())
+            else:
+                self.assertTrue(covers(other, rule))
+
+    def test_network_acl_against_pairwise(self):
+        rng = random.Random(1)
+        for _ in xrange(20):
+            rules = random_rules(rng, 60, True)
+            ordered = sorted(rules, key=lambda r: r.number)
+            expected = []
+            for k, rule in enumerate(ordered):
+                earlier = ordered[:k]
+                if any(e.number == rule.number for e in earlier):
+                    expected.append((RuleIssue.DUPLICATE_NUMBER, rule.name))
+                covering = [e for e in earlier if covers(e, rule)]
+                if any(e.action != rule.action for e in covering):
+                    expected.append((RuleIssue.SHADOWED, rule.name))
+                elif covering:
+                    expected.append((RuleIssue.REDUNDANT, rule.name))
+            self.assertMatches(check_network_acl("Acl", rules), expected, rules)
+
+    def test_security_group_against_pairwise(self):
+        rng = random.Random(2)
+        for _ in xrange(20):
+            rules = random_rules(rng, 60, False)
+            expected = []
+            for j, rule in enumerate(rules):
+                if any(r.key() == rule.key() for r in rules[:j]):
+                    expected.append((RuleIssue.DUPLICATE, rule.name))
+                elif any(r.key() != rule.key() and covers(r, rule) for r in rules):
+                    expected.append((RuleIssue.REDUNDANT, rule.name))
+            self.assertMatches(check_security_group("Group", rules), expected, rules)
+
+    def test_security_group_all_protocols_covers_full_range(self):
+        block = cidr("10.0.0.0/24")
+        tcp_rule = Rule("Tcp", None, 6, 0, MAX_PORT, block, 'allow')
+        all_rule = Rule("All", None, ALL_PROTOCOLS, 0, MAX_PORT, block, 'allow')
+        for rules in ([tcp_rule, all_rule], [all_rule, tcp_rule]):
+            issues = check_security_group("Group", rules)
+            self.assertEqual([(i.kind, i.name, i.other) for i in issues],
+                             [(RuleIssue.REDUNDANT, "Tcp", "All")])
+
+    def test_to_json_raises_on_issues(self):
+        vpc = ec2.vpc("Vpc", cidr("10.0.0.0/16"))
+        acl = ec2.network_acl("Acl", vpc) \
+                 .allow_ingress("Web",    1, tcp, cidr("10.0.0.0/16"), port(80)) \
+                 .deny_ingress("Web",     2, tcp, cidr("10.0.1.0/24"), port(80)) \
+                 .allow_ingress("Ssh",    2, tcp, cidr("10.0.0.0/16"), port(22))
+        sg  = ec2.security_group("Group", vpc, "A security group") \
+                 .ingress("Wide",   tcp, cidr("10.0.0.0/16"), port("0-1023")) \
+                 .ingress("Narrow", tcp, cidr("10.0.1.0/24"), port(80))
+        t = template("Rule check")
+        t.add(vpc, acl, sg)
+        with self.assertRaises(RuleCheckError) as raised:
+            t.to_json(check_rules=True)
+        kinds = sorted((i.kind, i.other) for i in raised.exception.issues)
+        self.assertEqual(kinds, [(RuleIssue.DUPLICATE_NUMBER, "AclDenyIngressWeb"),
+                                 (RuleIssue.REDUNDANT, "GroupInboundWide"),
+                                 (RuleIssue.SHADOWED, "AclAllowIngressWeb")])
+        self.assertEqual(len(check_rules(t)), 3)
+
+    def test_to_json_passes_without_issues(self):
+        vpc = ec2.vpc("Vpc", cidr("10.0.0.0/16"))
+        acl = ec2.network_acl("Acl", vpc) \
+                 .allow_ingress("Web", 1, tcp, cidr("10.0.0.0/24"), port(80)) \
+                 .allow_ingress("Ssh", 2, tcp, cidr("10.0.0.0/24"), port(22))
+        t = template("Rule check")
+        t.add(vpc, acl)
+        self.assertEqual(t.to_json(check_rules=True), t.to_json())
+
+if __name__ == "__main__":
+    unittest.main()
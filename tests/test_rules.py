@@ -0,0 +1,95 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import json, unittest
+
+from collections import OrderedDict as odict
+from cStringIO import StringIO
+
+from stratiform import *
+from stratiform.utils import JSONEncoder, json_form
+import stratiform.ec2 as ec2
+
+RULES = 50
+
+def chained():
+    vpc = ec2.vpc("Vpc", cidr("10.0.0.0/16"))
+    acl = ec2.network_acl("Acl", vpc)
+    sg  = ec2.security_group("Group", vpc, "A security group")
+    for i in xrange(RULES):
+        acl = acl.allow_ingress("Rule%d"%i, i + 1, tcp, cidr("10.0.%d.0/24"%i), port(1024 + i))
+        sg  = sg.ingress("Rule%d"%i, tcp, cidr("10.1.%d.0/24"%i), port(1024 + i))
+    t = template("Rules")
+    t.add(vpc, acl, sg)
+    return t
+
+def tabled(names=str):
+    vpc = ec2.vpc("Vpc", cidr("10.0.0.0/16"))
+    acl = ec2.network_acl("Acl", vpc)
+    sg  = ec2.security_group("Group", vpc, "A security group")
+    acl_rules, sg_rules = acl.rules(), sg.rules()
+    for i in xrange(RULES):
+        acl_rules.allow_ingress(names("Rule%d"%i), i + 1, tcp, cidr("10.0.%d.0/24"%i), port(1024 + i))
+        sg_rules.ingress(names("Rule%d"%i), tcp, cidr("10.1.%d.0/24"%i), port(1024 + i))
+    t = template("Rules")
+    t.add(vpc, acl, sg, acl_rules, sg_rules)
+    return t
+
+def renders(t):
+    return [t.to_json(),
+            t.to_json(indent=None, separators=(',', ':')),
+            t.to_compact_json(),
+            json.dumps(t, cls=JSONEncoder),
+            json.dumps(json.loads(t.to_json()))]
+
+class RuleTableTest(unittest.TestCase):
+    def test_table_renders_as_chained_rules(self):
+        expected = chained()
+        self.assertEqual(len(json.loads(expected.to_json())['Resources']), 3 + 2 * RULES)
+        # Chained rules follow their owner and table rules follow every
+        # resource, so only the order of the resources differs
+        for table, chain in zip(renders(tabled()), renders(expected)):
+            self.assertEqual(json.loads(table), json.loads(chain))
+
+    def test_unicode_rule_names(self):
+        self.assertEqual(tabled(unicode).to_json(), tabled().to_json())
+
+    def test_table_name_does_not_clash(self):
+        t = tabled()
+        named = ec2.vpc("AclRules", cidr("10.2.0.0/16"))
+        t.add(named)
+        self.assertIs(t.resources['AclRules'], named)
+        self.assertEqual(len(t.rule_tables), 2)
+        self.assertIs(t.graph.nodes['AclRules'], named)
+        for name, table in t.rule_tables.iteritems():
+            self.assertIs(t.graph.nodes[name], table)
+        self.assertIn('AclRules', json.loads(t.to_json())['Resources'])
+
+    def test_serializable_form_is_a_real_dict(self):
+        t = tabled()
+        resources = json_form(t)['Resources']
+        self.assertEqual(type(resources), odict)
+        self.assertEqual(len(dict(resources)), 3 + 2 * RULES)
+        self.assertEqual(json.loads(json.dumps(resources, cls=JSONEncoder)),
+                         json.loads(t.to_json())['Resources'])
+
+    def test_dump_streams_rules(self):
+        t = tabled()
+        for indent, separators in [(2, (',', ': ')), (None, (',', ':'))]:
+            fp = StringIO()
+            t.dump(fp, indent=indent, separators=separators)
+            self.assertEqual(fp.getvalue(), t.to_json(indent=indent, separators=separators))
+
+if __name__ == "__main__":
+    unittest.main()
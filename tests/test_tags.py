@@ -0,0 +1,43 @@
+# Copyright 2015 David R. Bild
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import json, unittest
+
+from stratiform import *
+import stratiform.ec2 as ec2
+from stratiform.resources import Tags
+
+class TagsTest(unittest.TestCase):
+    def test_interning_keeps_value_types(self):
+        self.assertIsNot(tags(X=True), tags(X=1))
+        self.assertIsNot(tag(X=1.0), tag(X=1))
+        t = template("Tag types")
+        keep = tags(X=True)
+        t.add(ec2.vpc("Vpc", cidr("10.0.0.0/16"), tags(X=1)))
+        data = json.loads(t.to_json())
+        self.assertIs(type(data['Resources']['Vpc']['Properties']['Tags'][0]['Value']), int)
+
+    def test_merge_with_unhashable_value(self):
+        merged = tags(A='a') + tag(B=['x', 'y'])
+        self.assertEqual([t.key for t in merged.tags], ['A', 'B'])
+
+    def test_merge_memo_is_bounded(self):
+        base = tags(Bounded='yes')
+        for i in xrange(Tags.DERIVED_LIMIT * 2):
+            base + tags(N=i)
+        self.assertEqual(len(base._derived), Tags.DERIVED_LIMIT)
+        self.assertIs(base + tags(N=0), base + tags(N=0))
+
+if __name__ == "__main__":
+    unittest.main()